@@ -0,0 +1,363 @@
+"""
+External Merge Sort
+
+Sorts files of fixed-size binary records that are too large to fit in memory.
+
+1. Run formation: the input is read in chunks that fit the memory budget,
+   each chunk is sorted in memory with merge_sort_bottom_up (reusing one
+   scratch buffer) and spilled to a temporary run file.
+2. Merge passes: up to fan_in runs at a time are k-way merged, until a
+   single sorted output remains. Each run is streamed in blocks through a
+   fixed-size read buffer. A heap keyed by the last record of every
+   current block picks the block that runs out first; everything up to
+   that record can be written, and is combined with merge from
+   merge_sort.py.
+
+Records are described by a `struct` format string, e.g. "<q" for
+little-endian 64-bit integers or "<qd8s" for (int, float, 8 bytes) records.
+Records are ordered by their unpacked fields, first field first.
+"""
+
+import heapq
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from bisect import bisect_left, bisect_right
+from itertools import chain, starmap
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Make merge_sort importable when this file is loaded from another directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from merge_sort import merge, merge_sort_bottom_up  # noqa: E402
+
+DEFAULT_MEMORY_BUDGET = 64 * 2**20
+DEFAULT_FAN_IN = 16
+DEFAULT_IO_BUFFER = 2**20
+
+def _is_scalar(record: struct.Struct) -> bool:
+    """Return True if the record format has a single field."""
+    return len(record.unpack(bytes(record.size))) == 1
+
+def _in_memory_record_size(record: struct.Struct) -> int:
+    """
+    Estimate the bytes one unpacked record occupies in memory.
+
+    Counts the Python objects for the fields plus two list slots, one in
+    the chunk and one in the merge sort scratch buffer.
+    """
+    fields = record.unpack(bytes(record.size))
+    size = 2 * 8 + sum(sys.getsizeof(field) for field in fields)
+    if len(fields) > 1:
+        size += sys.getsizeof(fields)
+    return size
+
+def read_blocks(path: str, record_format: str = "<q",
+                buffer_size: int = DEFAULT_IO_BUFFER) -> Iterator[List]:
+    """
+    Stream the records of a binary file one read buffer at a time.
+
+    Args:
+        path (str): File of fixed-size records
+        record_format (str): struct format of one record
+        buffer_size (int): Bytes read from the file at a time
+
+    Yields:
+        List: The records of one buffer, never empty. Each record is its
+            field for single-field formats, otherwise a tuple
+
+    Raises:
+        ValueError: If the file does not hold a whole number of records
+    """
+    record = struct.Struct(record_format)
+    block_size = max(1, buffer_size // record.size) * record.size
+    scalar = _is_scalar(record)
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            if len(block) % record.size:
+                raise ValueError(f"{path} is not a whole number of {record.size}-byte records")
+
+            if scalar:
+                yield [value for (value,) in record.iter_unpack(block)]
+            else:
+                yield list(record.iter_unpack(block))
+
+def read_records(path: str, record_format: str = "<q",
+                 buffer_size: int = DEFAULT_IO_BUFFER) -> Iterator:
+    """
+    Stream the records of a binary file.
+
+    Args:
+        path (str): File of fixed-size records
+        record_format (str): struct format of one record
+        buffer_size (int): Bytes read from the file at a time
+
+    Yields:
+        The field of each record for single-field formats, otherwise a tuple
+
+    Raises:
+        ValueError: If the file does not hold a whole number of records
+    """
+    for block in read_blocks(path, record_format, buffer_size):
+        yield from block
+
+def write_records(path: str, records: Iterable, record_format: str = "<q",
+                  buffer_size: int = DEFAULT_IO_BUFFER) -> int:
+    """
+    Write records to a binary file in batches.
+
+    Args:
+        path (str): Output file
+        records (Iterable): Values (single-field formats) or tuples to write
+        record_format (str): struct format of one record
+        buffer_size (int): Bytes packed in memory before each write
+
+    Returns:
+        int: Number of records written
+    """
+    record = struct.Struct(record_format)
+    batch_len = max(1, buffer_size // record.size)
+    pack_batch = map if _is_scalar(record) else starmap
+    count = 0
+
+    with open(path, "wb") as f:
+        batch = []
+        for item in records:
+            batch.append(item)
+            if len(batch) == batch_len:
+                f.write(b"".join(pack_batch(record.pack, batch)))
+                count += len(batch)
+                batch.clear()
+
+        if batch:
+            f.write(b"".join(pack_batch(record.pack, batch)))
+            count += len(batch)
+
+    return count
+
+def _merge_pieces(pieces: List[List]) -> List:
+    """
+    Merge sorted lists pairwise with merge, in rounds, so every record
+    takes part in O(log k) merges. Ties go to the earlier list.
+    """
+    while len(pieces) > 1:
+        merged = []
+        for i in range(0, len(pieces) - 1, 2):
+            left, right = pieces[i], pieces[i + 1]
+            out = [None] * (len(left) + len(right))
+            merge(out, left, right)
+            merged.append(out)
+        if len(pieces) % 2:
+            merged.append(pieces[-1])
+        pieces = merged
+    return pieces[0]
+
+def kway_merge(block_streams: List[Iterator[List]]) -> Iterator[List]:
+    """
+    Merge streams of sorted blocks into one sorted stream of blocks.
+
+    Every stream is a sorted sequence cut into non-empty lists. The heap
+    holds one (last record, stream index) entry per stream for its current
+    block. The block with the smallest last record is the first to run
+    out, and no record still to come is smaller than that last record.
+    So that block, together with the records up to the same bound from
+    the other current blocks, is merged with merge and yielded, and only
+    the exhausted block is refilled.
+
+    Ties are broken by stream index, so equal records keep the order of
+    the streams they came from.
+
+    Args:
+        block_streams (List[Iterator[List]]): Streams of sorted blocks
+
+    Yields:
+        List: Consecutive pieces of the merged output, each at least as
+            long as one input block
+
+    Time Complexity: O(n log k) for n records in k streams
+    Space Complexity: O(k) blocks
+    """
+    streams = [iter(stream) for stream in block_streams]
+    blocks: List[Optional[List]] = [None] * len(streams)
+    heap = []
+    for index, stream in enumerate(streams):
+        block = next(stream, None)
+        if block:
+            blocks[index] = block
+            heap.append((block[-1], index))
+    heapq.heapify(heap)
+
+    while heap:
+        bound, index = heapq.heappop(heap)
+        pieces = []
+        for other, block in enumerate(blocks):
+            if other == index:
+                pieces.append(block)
+            elif block is not None:
+                # Records equal to the bound from earlier streams go out
+                # now, from later streams after it. Neither cut empties
+                # the block, as its last record would have come off the
+                # heap first.
+                cut = bisect_right(block, bound) if other < index else bisect_left(block, bound)
+                if cut:
+                    pieces.append(block[:cut])
+                    del block[:cut]
+        yield _merge_pieces(pieces)
+
+        block = next(streams[index], None)
+        if block:
+            blocks[index] = block
+            heapq.heappush(heap, (block[-1], index))
+        else:
+            blocks[index] = None
+
+def external_sort(input_path: str, output_path: str, record_format: str = "<q",
+                  memory_budget: int = DEFAULT_MEMORY_BUDGET, fan_in: int = DEFAULT_FAN_IN,
+                  temp_dir: Optional[str] = None) -> Dict[str, float]:
+    """
+    Sort a file of fixed-size binary records using bounded memory.
+
+    Args:
+        input_path (str): File of records to sort
+        output_path (str): Destination of the sorted records
+        record_format (str): struct format of one record
+        memory_budget (int): Approximate bytes of memory to use, counting
+            the unpacked Python objects of the chunk being sorted or of the
+            blocks being merged, and the read and write buffers
+        fan_in (int): Maximum number of runs merged at once (at least 2)
+        temp_dir (str, optional): Directory for run files, defaults to the
+            system temporary directory
+
+    Returns:
+        Dict[str, float]: Statistics with keys records, bytes, runs,
+            merge_passes, seconds and mb_per_s
+
+    Raises:
+        ValueError: If fan_in is below 2
+
+    Time Complexity: O(n log n) comparisons, O(n log_k(n / m)) I/O for
+        k = fan_in and m records per chunk
+    Space Complexity: O(memory_budget)
+    """
+    if fan_in < 2:
+        raise ValueError(f"fan_in must be at least 2, got {fan_in}")
+
+    start = time.perf_counter()
+    record = struct.Struct(record_format)
+    unpacked_size = _in_memory_record_size(record)
+
+    # Run formation: a sixteenth of the budget for each of the read and
+    # write buffers, the rest for the chunk
+    run_buffer = max(record.size, memory_budget // 16)
+    chunk_len = max(1, (memory_budget - 2 * run_buffer) // unpacked_size)
+
+    # Merging: one unpacked block per input run, plus as much again for
+    # the merged output and the write buffer
+    merge_buffer = record.size * max(1, memory_budget // ((fan_in + 2) * unpacked_size))
+
+    work_dir = tempfile.mkdtemp(prefix="external-sort-", dir=temp_dir)
+    try:
+        # Phase 1: sort memory-sized chunks and spill them as runs
+        runs: List[str] = []
+        records = 0
+        scratch = [None] * chunk_len
+        chunk = []
+
+        def spill() -> None:
+            merge_sort_bottom_up(chunk, scratch)
+            path = os.path.join(work_dir, f"run-{len(runs)}.bin")
+            write_records(path, chunk, record_format, run_buffer)
+            runs.append(path)
+            chunk.clear()
+
+        for item in read_records(input_path, record_format, run_buffer):
+            chunk.append(item)
+            if len(chunk) == chunk_len:
+                records += len(chunk)
+                spill()
+        if chunk:
+            records += len(chunk)
+            spill()
+        del scratch
+        initial_runs = len(runs)
+
+        # Phase 2: merge fan_in runs at a time until one pass can finish
+        merge_passes = 0
+        while len(runs) > fan_in:
+            merged = []
+            for group_start in range(0, len(runs), fan_in):
+                group = runs[group_start:group_start + fan_in]
+                path = os.path.join(work_dir, f"pass-{merge_passes}-{len(merged)}.bin")
+                streams = [read_blocks(run, record_format, merge_buffer) for run in group]
+                merged_records = chain.from_iterable(kway_merge(streams))
+                write_records(path, merged_records, record_format, merge_buffer)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+            merge_passes += 1
+
+        if len(runs) == 1:
+            shutil.move(runs[0], output_path)
+        else:
+            streams = [read_blocks(run, record_format, merge_buffer) for run in runs]
+            merged_records = chain.from_iterable(kway_merge(streams))
+            write_records(output_path, merged_records, record_format, merge_buffer)
+            if runs:
+                merge_passes += 1
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    seconds = time.perf_counter() - start
+    size = records * record.size
+    return {
+        "records": records,
+        "bytes": size,
+        "runs": initial_runs,
+        "merge_passes": merge_passes,
+        "seconds": seconds,
+        "mb_per_s": size / 2**20 / seconds if seconds else 0.0,
+    }
+
+def benchmark_external_sort(n: int = 1_000_000, memory_budget: int = 2 * 2**20,
+                            fan_in: int = 4) -> None:
+    """
+    Sort a file of n random 64-bit integers and report throughput.
+
+    Args:
+        n (int): Number of records
+        memory_budget (int): Memory budget passed to external_sort
+        fan_in (int): Fan-in passed to external_sort
+    """
+    work_dir = tempfile.mkdtemp(prefix="external-sort-bench-")
+    try:
+        input_path = os.path.join(work_dir, "input.bin")
+        output_path = os.path.join(work_dir, "output.bin")
+        write_records(input_path, (random.randint(-2**63, 2**63 - 1) for _ in range(n)))
+
+        stats = external_sort(input_path, output_path, "<q", memory_budget, fan_in)
+
+        previous = None
+        for value in read_records(output_path):
+            assert previous is None or previous <= value, "Output is not sorted"
+            previous = value
+
+        print(f"Sorted {stats['records']} records ({stats['bytes'] / 2**20:.1f} MiB) "
+              f"with a {memory_budget / 2**20:.1f} MiB budget and fan-in {fan_in}:")
+        print(f"  initial runs: {stats['runs']}")
+        print(f"  merge passes: {stats['merge_passes']}")
+        print(f"  time:         {stats['seconds']:.2f}s")
+        print(f"  throughput:   {stats['mb_per_s']:.2f} MB/s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_external_sort(n)
@@ -0,0 +1,261 @@
+# Stable merge sort that merges by rotating blocks instead of copying into a buffer.
+
+import math
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from merge_sort import _binary_insertion_sort, merge_sort_bottom_up
+
+# Runs of this length are sorted with insertion sort before merging
+INSERTION_BLOCK = 20
+
+def merge_sort_in_place(arr: List[int]) -> None:
+    """
+    Sorts a list in-place with a stable merge sort using O(sqrt(n)) extra memory.
+
+    Blocks of INSERTION_BLOCK elements are sorted with binary insertion
+    sort, then merged bottom-up with SymMerge (Kim and Kutzner, the merge
+    behind Go's sort.Stable). SymMerge splits two adjacent sorted runs at
+    a symmetric binary search, rotates the middle part into place and
+    recurses on both halves, so it needs no buffer at all. Rotations are
+    done with slice copies of at most sqrt(n) elements at a time, which
+    keeps the element moves in C without an O(n) temporary.
+
+    Unlike merge_sort, this has no key= or reverse= arguments: those build
+    a record per element, which is exactly the O(n) memory this avoids.
+
+    Args:
+    arr (List[int]): The list to be sorted.
+
+    Returns:
+    None: The list is sorted in-place.
+
+    Stability: stable, SymMerge never moves an element past an equal one.
+
+    Time complexity: O(n log^2 n)
+    Space complexity: O(sqrt(n)) for rotations, O(log n) recursion depth
+    """
+    n = len(arr)
+    if n < 2:
+        return
+
+    for lo in range(0, n, INSERTION_BLOCK):
+        _binary_insertion_sort(arr, lo, min(lo + INSERTION_BLOCK, n), lo + 1)
+
+    max_buffer = max(INSERTION_BLOCK, math.isqrt(n))
+    width = INSERTION_BLOCK
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            _sym_merge(arr, lo, lo + width, min(lo + 2 * width, n), max_buffer)
+        width *= 2
+
+def _reverse(arr: List[int], lo: int, hi: int, max_buffer: int) -> None:
+    """
+    Reverses arr[lo:hi] in place, exchanging chunks of at most max_buffer
+    elements from both ends.
+    """
+    while hi - lo >= 2 * max_buffer:
+        front, back = arr[lo:lo + max_buffer], arr[hi - max_buffer:hi]
+        front.reverse()
+        back.reverse()
+        arr[lo:lo + max_buffer] = back
+        arr[hi - max_buffer:hi] = front
+        lo += max_buffer
+        hi -= max_buffer
+    middle = arr[lo:hi]
+    middle.reverse()
+    arr[lo:hi] = middle
+
+def _rotate(arr: List[int], lo: int, mid: int, hi: int, max_buffer: int) -> None:
+    """
+    Swaps the adjacent blocks arr[lo:mid] and arr[mid:hi].
+
+    When one side holds at most max_buffer elements it is lifted out, the
+    other side is shifted over in chunks of max_buffer and the lifted side
+    is written back. Otherwise the three-reversal rotation is used. Only
+    arr[lo:hi] is touched, and no temporary list exceeds max_buffer.
+    """
+    left, right = mid - lo, hi - mid
+    if left <= right and left <= max_buffer:
+        saved = arr[lo:mid]
+        # Shift the right side down, front chunk first
+        for k in range(mid, hi, max_buffer):
+            chunk = arr[k:min(k + max_buffer, hi)]
+            arr[k - left:k - left + len(chunk)] = chunk
+        arr[hi - left:hi] = saved
+    elif right <= max_buffer:
+        saved = arr[mid:hi]
+        # Shift the left side up, back chunk first
+        for k in range(mid, lo, -max_buffer):
+            chunk = arr[max(k - max_buffer, lo):k]
+            arr[k + right - len(chunk):k + right] = chunk
+        arr[lo:lo + right] = saved
+    else:
+        _reverse(arr, lo, mid, max_buffer)
+        _reverse(arr, mid, hi, max_buffer)
+        _reverse(arr, lo, hi, max_buffer)
+
+def _sym_merge(arr: List[int], a: int, m: int, b: int, max_buffer: int) -> None:
+    """
+    Merges the sorted runs arr[a:m] and arr[m:b] in place.
+    """
+    if m - a == 1:
+        # Insert arr[a] after every element of the right run smaller than it
+        i, j = m, b
+        while i < j:
+            h = (i + j) // 2
+            if arr[h] < arr[a]:
+                i = h + 1
+            else:
+                j = h
+        _rotate(arr, a, a + 1, i, max_buffer)
+        return
+
+    if b - m == 1:
+        # Insert arr[m] before every element of the left run greater than it
+        i, j = a, m
+        while i < j:
+            h = (i + j) // 2
+            if not arr[m] < arr[h]:
+                i = h + 1
+            else:
+                j = h
+        _rotate(arr, i, m, m + 1, max_buffer)
+        return
+
+    mid = (a + b) // 2
+    n = mid + m
+    if m > mid:
+        start, r = n - b, mid
+    else:
+        start, r = a, m
+    p = n - 1
+
+    # Find the split point that is symmetric around mid
+    while start < r:
+        c = (start + r) // 2
+        if not arr[p - c] < arr[c]:
+            start = c + 1
+        else:
+            r = c
+
+    end = n - start
+    if start < m < end:
+        _rotate(arr, start, m, end, max_buffer)
+    if a < start < mid:
+        _sym_merge(arr, a, start, mid, max_buffer)
+    if mid < end < b:
+        _sym_merge(arr, mid, end, b, max_buffer)
+
+def _status_kib(field: str) -> int:
+    """
+    Reads a memory field such as VmRSS or VmHWM from /proc/self/status, in KiB.
+    """
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise OSError(f"{field} not in /proc/self/status")
+
+def _peak_rss_growth(sort_name: str, n: int, seed: int, results) -> None:
+    """
+    Child process: builds the input, sorts it and reports how far the peak
+    RSS rose above the RSS before the sort, in KiB, or None where Linux
+    /proc is not available.
+
+    The peak is reset first by writing 5 to /proc/self/clear_refs, since
+    interpreter startup leaves a high-water mark above anything the sort
+    itself reaches.
+    """
+    sorts = {"merge_sort_bottom_up": merge_sort_bottom_up, "merge_sort_in_place": merge_sort_in_place}
+    rng = random.Random(seed)
+    arr = [rng.randint(0, n) for _ in range(n)]
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        before = _status_kib("VmRSS")
+        sorts[sort_name](arr)
+        results.put((sort_name, _status_kib("VmHWM") - before))
+    except OSError:
+        results.put((sort_name, None))
+
+def benchmark_in_place_merge_sort(n: int = 200_000) -> None:
+    """
+    Compares time, peak traced memory and peak RSS growth of the in-place
+    merge against the buffered bottom-up merge.
+
+    Peak RSS is measured in a freshly spawned child process (not forked,
+    which would inherit this process's freed heap) that builds its own
+    copy of the input.
+
+    Args:
+    n (int): Number of elements to sort.
+    """
+    data = [random.randint(0, n) for _ in range(n)]
+    expected = sorted(data)
+    spawn = multiprocessing.get_context("spawn")
+
+    print(f"Stable sorts of {n} random integers:")
+    for name, sort in [("merge_sort_bottom_up", merge_sort_bottom_up),
+                       ("merge_sort_in_place", merge_sort_in_place)]:
+        arr = data.copy()
+        start = time.perf_counter()
+        sort(arr)
+        elapsed = time.perf_counter() - start
+        assert arr == expected
+
+        # Trace a separate run, tracemalloc would distort the timing
+        arr = data.copy()
+        tracemalloc.start()
+        sort(arr)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results = spawn.Queue()
+        child = spawn.Process(target=_peak_rss_growth, args=(name, n, 1, results))
+        child.start()
+        _, rss_growth = results.get()
+        child.join()
+
+        rss = "n/a" if rss_growth is None else f"{rss_growth / 1024:.2f} MiB"
+        print(f"  {name:<22} {elapsed:7.3f}s  traced peak {peak / 2**20:7.3f} MiB  peak RSS growth {rss}")
+
+def test_merge_sort_in_place() -> None:
+    """
+    Checks order and stability on random, sorted, reversed and tiny inputs.
+    """
+    cases = [
+        [random.randint(0, 50) for _ in range(1000)],
+        list(range(500)),
+        list(range(500, 0, -1)),
+        [random.random() for _ in range(4097)],
+        [],
+        [1],
+        [2, 1],
+    ]
+    for case in cases:
+        arr = case.copy()
+        merge_sort_in_place(arr)
+        assert arr == sorted(case)
+
+    # Pairs compare by their first item only, so ties must keep input order
+    class Pair:
+        def __init__(self, key, index):
+            self.key, self.index = key, index
+
+        def __lt__(self, other):
+            return self.key < other.key
+
+    pairs = [Pair(random.randint(0, 20), i) for i in range(3000)]
+    merge_sort_in_place(pairs)
+    assert [(p.key, p.index) for p in pairs] == sorted((p.key, p.index) for p in pairs)
+    print("All in-place merge sort tests passed")
+
+if __name__ == "__main__":
+    test_merge_sort_in_place()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    benchmark_in_place_merge_sort(n)
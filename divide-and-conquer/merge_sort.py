@@ -1,20 +1,43 @@
 # Merge sort recursively splits the array in half until it can't be divided further, then merges the sorted halves back together.
 
-from typing import List
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
 
+# typed_buffer lives in the sibling sorting-algorithms directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sorting-algorithms"))
+from sort_keys import key_and_reverse  # noqa: E402
+from typed_buffer import typed_buffer_sort  # noqa: E402
+
+@typed_buffer_sort(kind="stable", returns="none")
+@key_and_reverse(returns="none")
 def merge_sort(arr: List[int]) -> None:
     """
     Sorts an array in-place using the merge sort algorithm.
     
     Args:
     arr (List[int]): The input array to be sorted.
+    key (Callable, optional): Extracts the sort key, called once per element.
+    reverse (bool): Sort in descending order.
     
     Returns:
     None: The array is sorted in-place.
     
+    Stability: stable, ties are taken from the left half first.
+    
     Time complexity: O(n log n)
     Space complexity: O(n)
     """
+    _merge_sort(arr)
+
+def _merge_sort(arr: List[int]) -> None:
+    """
+    Recursive body of merge_sort, kept free of the decorators so each
+    level costs one stack frame.
+    """
     if len(arr) <= 1:
         return
 
@@ -22,8 +45,8 @@ def merge_sort(arr: List[int]) -> None:
     left_half = arr[:mid]
     right_half = arr[mid:]
 
-    merge_sort(left_half)
-    merge_sort(right_half)
+    _merge_sort(left_half)
+    _merge_sort(right_half)
     merge(arr, left_half, right_half)
 
 def merge(arr: List[int], left: List[int], right: List[int]) -> None:
@@ -59,6 +82,541 @@ def merge(arr: List[int], left: List[int], right: List[int]) -> None:
         j += 1
         k += 1
 
+@key_and_reverse(returns="none")
+def merge_sort_bottom_up(arr: List[int], buffer: Optional[List[int]] = None) -> None:
+    """
+    Sorts an array in-place using iterative bottom-up merge sort.
+
+    Merges runs of width 1, 2, 4, ... alternating between the input and a
+    single auxiliary buffer, so no sub-lists are sliced off at any level.
+
+    Args:
+    arr (List[int]): The input array to be sorted.
+    buffer (Optional[List[int]]): Scratch space of at least len(arr) slots.
+        Pass the same buffer to repeated calls to avoid reallocating it.
+    key (Callable, optional): Extracts the sort key, called once per element.
+    reverse (bool): Sort in descending order.
+
+    Returns:
+    None: The array is sorted in-place.
+
+    Raises:
+    ValueError: If the supplied buffer is shorter than the array.
+
+    Stability: stable, like merge_sort.
+
+    Time complexity: O(n log n)
+    Space complexity: O(n) for the one buffer, or O(1) if it is supplied
+    """
+    n = len(arr)
+    if n <= 1:
+        return
+
+    if buffer is None:
+        buffer = [None] * n
+    elif len(buffer) < n:
+        raise ValueError(f"buffer must hold at least {n} elements, got {len(buffer)}")
+
+    src, dst = arr, buffer
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            merge_runs(src, dst, lo, mid, hi)
+
+        # The merged output becomes the input of the next pass
+        src, dst = dst, src
+        width *= 2
+
+    # After an odd number of passes the sorted data sits in the buffer
+    if src is not arr:
+        for k in range(n):
+            arr[k] = src[k]
+
+def merge_runs(src: List[int], dst: List[int], lo: int, mid: int, hi: int) -> None:
+    """
+    Merges the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi].
+
+    Args:
+    src (List[int]): Array holding the two adjacent sorted runs.
+    dst (List[int]): Array receiving the merged run.
+    lo (int): Start of the left run.
+    mid (int): End of the left run and start of the right run.
+    hi (int): End of the right run.
+
+    Returns:
+    None: The merge is written into dst.
+    """
+    i, j, k = lo, mid, lo
+
+    while i < mid and j < hi:
+        # Taking from the left on ties keeps the sort stable
+        if src[i] <= src[j]:
+            dst[k] = src[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            j += 1
+        k += 1
+
+    while i < mid:
+        dst[k] = src[i]
+        i += 1
+        k += 1
+
+    while j < hi:
+        dst[k] = src[j]
+        j += 1
+        k += 1
+
+# Adaptive merge sort, in the style of Timsort
+
+# Consecutive wins by one run before the merge switches to galloping
+MIN_GALLOP = 7
+
+@key_and_reverse(returns="none")
+def merge_sort_adaptive(arr: List[int]) -> None:
+    """
+    Sorts an array in-place using natural-run adaptive merge sort.
+
+    The array is scanned for runs that are already ascending or strictly
+    descending (descending runs are reversed in place). Short runs are
+    extended to a minimum length with binary insertion sort. Runs are
+    pushed on a stack and merged while keeping the stack lengths roughly
+    Fibonacci-shaped, and a merge switches to galloping (exponential
+    search) when one side keeps winning. Only `<` is used to compare
+    elements.
+
+    Args:
+    arr (List[int]): The input array to be sorted.
+    key (Callable, optional): Extracts the sort key, called once per element.
+    reverse (bool): Sort in descending order.
+
+    Returns:
+    None: The array is sorted in-place.
+
+    Stability: stable, descending runs must be strict and merges take ties
+    from the left run.
+
+    Time complexity: O(n) on sorted or reversed input, O(n log n) worst case
+    Space complexity: O(n)
+    """
+    n = len(arr)
+    if n < 2:
+        return
+
+    min_run = _min_run_length(n)
+    runs: List[List[int]] = []
+    min_gallop = MIN_GALLOP
+
+    lo = 0
+    while lo < n:
+        run_len = _count_run_and_make_ascending(arr, lo, n)
+
+        # Extend short runs so the merge tree stays balanced
+        if run_len < min_run:
+            forced = min(min_run, n - lo)
+            _binary_insertion_sort(arr, lo, lo + forced, lo + run_len)
+            run_len = forced
+
+        runs.append([lo, run_len])
+        min_gallop = _merge_collapse(arr, runs, min_gallop)
+        lo += run_len
+
+    _merge_force_collapse(arr, runs, min_gallop)
+
+def _min_run_length(n: int) -> int:
+    """
+    Returns the minimum run length for an array of size n.
+
+    The result lies in [32, 64] and makes n / min_run a power of two or
+    slightly less, so the final merges are between runs of similar size.
+    """
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _count_run_and_make_ascending(arr: List[int], lo: int, hi: int) -> int:
+    """
+    Returns the length of the run starting at arr[lo].
+
+    A strictly descending run is reversed in place; requiring strictness
+    means reversing it cannot reorder equal elements.
+    """
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+
+    if arr[run_hi] < arr[lo]:
+        run_hi += 1
+        while run_hi < hi and arr[run_hi] < arr[run_hi - 1]:
+            run_hi += 1
+        arr[lo:run_hi] = reversed(arr[lo:run_hi])
+    else:
+        run_hi += 1
+        while run_hi < hi and not arr[run_hi] < arr[run_hi - 1]:
+            run_hi += 1
+
+    return run_hi - lo
+
+def _binary_insertion_sort(arr: List[int], lo: int, hi: int, start: int) -> None:
+    """
+    Sorts arr[lo:hi] given that arr[lo:start] is already sorted.
+    """
+    for i in range(start, hi):
+        pivot = arr[i]
+
+        # Find the rightmost insertion point, which keeps the sort stable
+        left, right = lo, i
+        while left < right:
+            mid = (left + right) // 2
+            if pivot < arr[mid]:
+                right = mid
+            else:
+                left = mid + 1
+
+        arr[left + 1:i + 1] = arr[left:i]
+        arr[left] = pivot
+
+def _gallop_left(key, a: List[int], base: int, length: int, hint: int) -> int:
+    """
+    Returns k such that a[base:base+k] < key <= a[base+k:base+length].
+
+    Probes outward from a[base+hint] in steps of 1, 3, 7, 15, ... and then
+    binary searches the bracketed range, so finding a position d slots
+    from the hint costs O(log d) comparisons.
+    """
+    last_ofs, ofs = 0, 1
+
+    if a[base + hint] < key:
+        # Gallop right until a[base+hint+last_ofs] < key <= a[base+hint+ofs]
+        max_ofs = length - hint
+        while ofs < max_ofs and a[base + hint + ofs] < key:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+    else:
+        # Gallop left until a[base+hint-ofs] < key <= a[base+hint-last_ofs]
+        max_ofs = hint + 1
+        while ofs < max_ofs and not a[base + hint - ofs] < key:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+
+    # Binary search for the answer in (last_ofs, ofs]
+    last_ofs += 1
+    while last_ofs < ofs:
+        mid = last_ofs + ((ofs - last_ofs) >> 1)
+        if a[base + mid] < key:
+            last_ofs = mid + 1
+        else:
+            ofs = mid
+    return ofs
+
+def _gallop_right(key, a: List[int], base: int, length: int, hint: int) -> int:
+    """
+    Returns k such that a[base:base+k] <= key < a[base+k:base+length].
+
+    Like _gallop_left, but equal elements end up on the left of k.
+    """
+    last_ofs, ofs = 0, 1
+
+    if key < a[base + hint]:
+        # Gallop left until a[base+hint-ofs] <= key < a[base+hint-last_ofs]
+        max_ofs = hint + 1
+        while ofs < max_ofs and key < a[base + hint - ofs]:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    else:
+        # Gallop right until a[base+hint+last_ofs] <= key < a[base+hint+ofs]
+        max_ofs = length - hint
+        while ofs < max_ofs and not key < a[base + hint + ofs]:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        ofs = min(ofs, max_ofs)
+        last_ofs, ofs = last_ofs + hint, ofs + hint
+
+    # Binary search for the answer in (last_ofs, ofs]
+    last_ofs += 1
+    while last_ofs < ofs:
+        mid = last_ofs + ((ofs - last_ofs) >> 1)
+        if key < a[base + mid]:
+            ofs = mid
+        else:
+            last_ofs = mid + 1
+    return ofs
+
+def _merge_collapse(arr: List[int], runs: List[List[int]], min_gallop: int) -> int:
+    """
+    Merges runs on the stack until its invariants hold again.
+
+    For the top three run lengths A, B, C (C on top) the invariants are
+    A > B + C and B > C. Returns the updated galloping threshold.
+    """
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if ((n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1])
+                or (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1])):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        min_gallop = _merge_at(arr, runs, n, min_gallop)
+    return min_gallop
+
+def _merge_force_collapse(arr: List[int], runs: List[List[int]], min_gallop: int) -> None:
+    """
+    Merges all remaining runs on the stack into one.
+    """
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+            n -= 1
+        min_gallop = _merge_at(arr, runs, n, min_gallop)
+
+def _merge_at(arr: List[int], runs: List[List[int]], i: int, min_gallop: int) -> int:
+    """
+    Merges the adjacent stack runs i and i + 1.
+
+    Returns the updated galloping threshold.
+    """
+    base1, len1 = runs[i]
+    base2, len2 = runs[i + 1]
+    runs[i][1] = len1 + len2
+    del runs[i + 1]
+
+    # Elements of the left run that are <= the right run's first element
+    # are already in place
+    k = _gallop_right(arr[base2], arr, base1, len1, 0)
+    base1 += k
+    len1 -= k
+    if len1 == 0:
+        return min_gallop
+
+    # Elements of the right run that are >= the left run's last element
+    # are already in place as well
+    len2 = _gallop_left(arr[base1 + len1 - 1], arr, base2, len2, len2 - 1)
+    if len2 == 0:
+        return min_gallop
+
+    # Copy the shorter run out, so the temporary is at most n / 2 long
+    if len1 <= len2:
+        return _merge_lo(arr, base1, len1, base2, len2, min_gallop)
+    return _merge_hi(arr, base1, len1, base2, len2, min_gallop)
+
+def _merge_lo(arr: List[int], base1: int, len1: int, base2: int, len2: int, min_gallop: int) -> int:
+    """
+    Merges two adjacent runs left to right, copying the left run out.
+    """
+    tmp = arr[base1:base1 + len1]
+    i, j, dest = 0, base2, base1
+    end2 = base2 + len2
+
+    while i < len1 and j < end2:
+        # One element at a time until one run wins min_gallop times in a row
+        count1 = count2 = 0
+        while i < len1 and j < end2 and count1 < min_gallop and count2 < min_gallop:
+            if arr[j] < tmp[i]:
+                arr[dest] = arr[j]
+                j += 1
+                count2 += 1
+                count1 = 0
+            else:
+                arr[dest] = tmp[i]
+                i += 1
+                count1 += 1
+                count2 = 0
+            dest += 1
+
+        # Galloping mode: move whole blocks found by exponential search
+        while i < len1 and j < end2:
+            count1 = _gallop_right(arr[j], tmp, i, len1 - i, 0)
+            if count1:
+                arr[dest:dest + count1] = tmp[i:i + count1]
+                dest += count1
+                i += count1
+                if i == len1:
+                    break
+
+            count2 = _gallop_left(tmp[i], arr, j, end2 - j, 0)
+            if count2:
+                arr[dest:dest + count2] = arr[j:j + count2]
+                dest += count2
+                j += count2
+
+            # Leave galloping when it stops paying off, and make it
+            # harder to re-enter
+            if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+                min_gallop += 1
+                break
+            min_gallop = max(1, min_gallop - 1)
+
+    # Whatever is left of the right run is already in place
+    if i < len1:
+        arr[dest:dest + len1 - i] = tmp[i:]
+    return min_gallop
+
+def _merge_hi(arr: List[int], base1: int, len1: int, base2: int, len2: int, min_gallop: int) -> int:
+    """
+    Merges two adjacent runs right to left, copying the right run out.
+    """
+    tmp = arr[base2:base2 + len2]
+    i, j = base1 + len1 - 1, len2 - 1
+    dest = base2 + len2 - 1
+
+    while i >= base1 and j >= 0:
+        # One element at a time until one run wins min_gallop times in a row
+        count1 = count2 = 0
+        while i >= base1 and j >= 0 and count1 < min_gallop and count2 < min_gallop:
+            if tmp[j] < arr[i]:
+                arr[dest] = arr[i]
+                i -= 1
+                count1 += 1
+                count2 = 0
+            else:
+                arr[dest] = tmp[j]
+                j -= 1
+                count2 += 1
+                count1 = 0
+            dest -= 1
+
+        # Galloping mode: move whole blocks found by exponential search
+        while i >= base1 and j >= 0:
+            remaining = i - base1 + 1
+            count1 = remaining - _gallop_right(tmp[j], arr, base1, remaining, remaining - 1)
+            if count1:
+                arr[dest - count1 + 1:dest + 1] = arr[i - count1 + 1:i + 1]
+                dest -= count1
+                i -= count1
+                if i < base1:
+                    break
+
+            count2 = (j + 1) - _gallop_left(arr[i], tmp, 0, j + 1, j)
+            if count2:
+                arr[dest - count2 + 1:dest + 1] = tmp[j - count2 + 1:j + 1]
+                dest -= count2
+                j -= count2
+
+            # Leave galloping when it stops paying off, and make it
+            # harder to re-enter
+            if count1 < MIN_GALLOP and count2 < MIN_GALLOP:
+                min_gallop += 1
+                break
+            min_gallop = max(1, min_gallop - 1)
+
+    # Whatever is left of the left run is already in place
+    if j >= 0:
+        arr[base1:base1 + j + 1] = tmp[:j + 1]
+    return min_gallop
+
+class CountingItem:
+    """
+    Wraps a value and counts every comparison made against it.
+
+    Attributes:
+    comparisons (int): Class-wide number of comparisons since the last reset.
+    """
+    comparisons = 0
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: "CountingItem") -> bool:
+        CountingItem.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other: "CountingItem") -> bool:
+        CountingItem.comparisons += 1
+        return self.value <= other.value
+
+def benchmark_adaptive_merge_sort(n: int = 100_000) -> None:
+    """
+    Reports comparison counts and time of the merge sorts on presorted data.
+
+    Args:
+    n (int): Number of elements to sort.
+    """
+    nearly_sorted = list(range(n))
+    for _ in range(n // 100):
+        a, b = random.randrange(n), random.randrange(n)
+        nearly_sorted[a], nearly_sorted[b] = nearly_sorted[b], nearly_sorted[a]
+
+    inputs = {
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "appended batch": list(range(n - n // 20)) + [random.randrange(n) for _ in range(n // 20)],
+        "1% swapped": nearly_sorted,
+        "random": [random.randrange(n) for _ in range(n)],
+    }
+    sorts = [("merge_sort", merge_sort),
+             ("merge_sort_bottom_up", merge_sort_bottom_up),
+             ("merge_sort_adaptive", merge_sort_adaptive)]
+
+    print(f"Comparisons and time on {n} elements:")
+    for name, data in inputs.items():
+        print(f"  {name}:")
+        expected = sorted(data)
+        for sort_name, sort in sorts:
+            items = [CountingItem(x) for x in data]
+            CountingItem.comparisons = 0
+            sort(items)
+            assert [item.value for item in items] == expected
+
+            arr = data.copy()
+            start = time.perf_counter()
+            sort(arr)
+            elapsed = time.perf_counter() - start
+
+            print(f"    {sort_name:<22} {CountingItem.comparisons:>10} comparisons  {elapsed:7.3f}s")
+
+def benchmark_merge_sort(n: int = 100_000, repeats: int = 3) -> None:
+    """
+    Compares time and peak traced memory of merge_sort and merge_sort_bottom_up.
+
+    Timing and memory tracing are separate runs, since tracemalloc slows
+    every allocation down. The copy of the input is made before tracing
+    starts, so the reported peak is the sort's own extra memory.
+
+    Args:
+    n (int): Number of elements to sort.
+    repeats (int): Number of sorts sharing one reused scratch buffer.
+    """
+    data = [random.randint(0, n) for _ in range(n)]
+    expected = sorted(data)
+    buffer = [None] * n
+
+    candidates = [
+        ("merge_sort", merge_sort),
+        ("merge_sort_bottom_up", merge_sort_bottom_up),
+        ("merge_sort_bottom_up, reused buffer", lambda arr: merge_sort_bottom_up(arr, buffer)),
+    ]
+
+    print(f"Sorting {n} random integers ({repeats} runs each):")
+    for name, sort in candidates:
+        elapsed = 0.0
+        for _ in range(repeats):
+            arr = data.copy()
+            start = time.perf_counter()
+            sort(arr)
+            elapsed += time.perf_counter() - start
+            assert arr == expected
+
+        arr = data.copy()
+        tracemalloc.start()
+        sort(arr)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"  {name:<36} {elapsed / repeats:7.3f}s  peak {peak / 2**20:7.2f} MiB")
+
 def main():
     """
     Example usage of the merge sort algorithm.
@@ -68,5 +626,18 @@ def main():
     merge_sort(arr)
     print("Sorted array:", arr)
 
+    arr = [38, 27, 43, 3, 9, 82, 10]
+    merge_sort_bottom_up(arr)
+    print("Bottom-up sorted array:", arr)
+
+    arr = [38, 27, 43, 3, 9, 82, 10]
+    merge_sort_adaptive(arr)
+    print("Adaptive sorted array:", arr)
+    print()
+
+    benchmark_merge_sort()
+    print()
+    benchmark_adaptive_merge_sort()
+
 if __name__ == "__main__":
     main()
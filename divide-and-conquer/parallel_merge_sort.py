@@ -0,0 +1,233 @@
+"""
+Parallel Merge Sort over Shared Memory
+
+Sorts large numeric arrays on several cores using a process pool.
+
+1. The input is copied once into a `multiprocessing.shared_memory` block,
+   viewed as a typed `memoryview`; a second block serves as scratch space.
+   Workers attach to both by name, so no array data is pickled.
+2. Each worker sorts one contiguous chunk in place with merge_sort_bottom_up,
+   using the matching slice of the scratch block as its buffer.
+3. Splitters are picked by regular sampling of the sorted chunks. They cut
+   every chunk into one piece per output partition, and each worker k-way
+   merges the pieces of its partition straight into the scratch block.
+"""
+
+import array
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple, Union
+
+from external_merge_sort import kway_merge
+from merge_sort import merge_sort_bottom_up
+
+NumericArray = Union[List[int], List[float], array.array]
+
+# Items each merge input is read in at a time
+MERGE_BLOCK = 1 << 14
+
+def _attach(name: str, typecode: str, n: int) -> Tuple[shared_memory.SharedMemory, memoryview]:
+    """Attach to a shared memory block and view its first n items."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, block.buf.cast(typecode)[:n]
+
+def _release(block: shared_memory.SharedMemory, *views: memoryview) -> None:
+    """Release views into a shared memory block, then close it."""
+    for view in views:
+        view.release()
+    block.close()
+
+def _sort_chunk(data_name: str, scratch_name: str, typecode: str, n: int, lo: int, hi: int) -> None:
+    """Worker: sort data[lo:hi] in place using scratch[lo:hi] as the buffer."""
+    data_block, data = _attach(data_name, typecode, n)
+    scratch_block, scratch = _attach(scratch_name, typecode, n)
+    chunk, buffer = data[lo:hi], scratch[lo:hi]
+    try:
+        merge_sort_bottom_up(chunk, buffer)
+    finally:
+        _release(scratch_block, buffer, scratch)
+        _release(data_block, chunk, data)
+
+def _view_blocks(view: memoryview, size: int = MERGE_BLOCK) -> Iterator[List]:
+    """Yield the items of a view as lists of at most size items."""
+    for lo in range(0, len(view), size):
+        yield view[lo:lo + size].tolist()
+
+def _merge_partition(data_name: str, scratch_name: str, typecode: str, n: int,
+                     pieces: List[Tuple[int, int]], out_lo: int) -> None:
+    """Worker: k-way merge the sorted pieces of data into scratch from out_lo."""
+    data_block, data = _attach(data_name, typecode, n)
+    scratch_block, scratch = _attach(scratch_name, typecode, n)
+    views = [data[lo:hi] for lo, hi in pieces]
+    try:
+        k = out_lo
+        for block in kway_merge([_view_blocks(view) for view in views]):
+            scratch[k:k + len(block)] = array.array(typecode, block)
+            k += len(block)
+    finally:
+        _release(scratch_block, scratch)
+        _release(data_block, *views, data)
+
+def _list_typecode(values: List) -> Optional[str]:
+    """
+    Return the array typecode that holds every value of a list exactly:
+    "q", or "Q" for non-negative ints beyond it, for ints and "d" for
+    floats. None if there is none, as for mixed ints and floats, which
+    "d" would turn into floats, or ints outside 64 bits.
+    """
+    kinds = set(map(type, values))
+    if kinds == {float}:
+        return "d"
+    if kinds == {int}:
+        low, high = min(values), max(values)
+        if -2**63 <= low and high < 2**63:
+            return "q"
+        if low >= 0 and high < 2**64:
+            return "Q"
+    return None
+
+def _choose_splitters(data: memoryview, bounds: List[Tuple[int, int]], parts: int) -> List:
+    """
+    Pick parts - 1 splitter values by regular sampling of the sorted chunks.
+
+    Each chunk contributes `parts` evenly spaced samples, and every
+    `parts`-th sample of the sorted sample set becomes a splitter.
+    """
+    samples = []
+    for lo, hi in bounds:
+        step = max(1, (hi - lo) // parts)
+        samples.extend(data[i] for i in range(lo, hi, step))
+    samples.sort()
+
+    step = len(samples) / parts
+    return [samples[int(step * i)] for i in range(1, parts)]
+
+def parallel_merge_sort(arr: NumericArray, workers: Optional[int] = None,
+                        typecode: Optional[str] = None) -> NumericArray:
+    """
+    Sort a numeric list or array.array in place using a process pool.
+
+    Args:
+        arr (list or array.array): Numbers to sort
+        workers (int, optional): Number of worker processes, defaults to
+            os.cpu_count()
+        typecode (str, optional): array typecode used for the shared buffer.
+            Defaults to arr.typecode for arrays. For lists it is picked
+            from the values, and a list no typecode holds exactly (mixed
+            ints and floats, ints beyond 64 bits, other types) is sorted
+            serially with merge_sort_bottom_up instead
+
+    Returns:
+        The same object, sorted
+
+    Time Complexity: O((n / p) log n) per worker for p workers
+    Space Complexity: O(n) shared memory for the data and scratch blocks
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    workers = max(1, min(workers or os.cpu_count() or 1, n))
+    if typecode is None:
+        if isinstance(arr, array.array):
+            typecode = arr.typecode
+        else:
+            typecode = _list_typecode(arr)
+            if typecode is None:
+                merge_sort_bottom_up(arr)
+                return arr
+    size = n * array.array(typecode).itemsize
+
+    data_block = shared_memory.SharedMemory(create=True, size=size)
+    scratch_block = shared_memory.SharedMemory(create=True, size=size)
+    data = data_block.buf.cast(typecode)[:n]
+    scratch = scratch_block.buf.cast(typecode)[:n]
+    try:
+        # Copy the input in once; array.array goes buffer to buffer
+        if isinstance(arr, array.array) and arr.typecode == typecode:
+            data[:] = memoryview(arr)
+        else:
+            data[:] = array.array(typecode, arr)
+
+        step = -(-n // workers)
+        bounds = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Phase 1: sort one chunk per worker
+            futures = [pool.submit(_sort_chunk, data_block.name, scratch_block.name,
+                                   typecode, n, lo, hi) for lo, hi in bounds]
+            for future in futures:
+                future.result()
+
+            if len(bounds) == 1:
+                result = data
+            else:
+                # Phase 2: cut every chunk at the splitters, merge each
+                # partition in its own worker
+                splitters = _choose_splitters(data, bounds, len(bounds))
+                cuts = [[lo] + [bisect_left(data, s, lo, hi) for s in splitters] + [hi]
+                        for lo, hi in bounds]
+
+                futures = []
+                out_lo = 0
+                for part in range(len(bounds)):
+                    pieces = [(chunk_cuts[part], chunk_cuts[part + 1]) for chunk_cuts in cuts]
+                    futures.append(pool.submit(_merge_partition, data_block.name,
+                                               scratch_block.name, typecode, n, pieces, out_lo))
+                    out_lo += sum(hi - lo for lo, hi in pieces)
+                for future in futures:
+                    future.result()
+                result = scratch
+
+        # Copy the result out once
+        if isinstance(arr, array.array) and arr.typecode == typecode:
+            memoryview(arr)[:] = result
+        else:
+            arr[:] = result.tolist()
+    finally:
+        _release(scratch_block, scratch)
+        _release(data_block, data)
+        scratch_block.unlink()
+        data_block.unlink()
+
+    return arr
+
+def benchmark_parallel_merge_sort(n: int = 1_000_000, worker_counts=(1, 2, 4, 8)) -> None:
+    """
+    Sweep worker counts and report the speedup over a single worker.
+
+    Args:
+        n (int): Number of random 64-bit integers to sort
+        worker_counts: Worker counts to try
+    """
+    data = array.array("q", (random.randint(-2**63, 2**63 - 1) for _ in range(n)))
+    expected = sorted(data)
+
+    # Lists that no single typecode holds exactly still sort correctly
+    for values in ([2**64 + i for i in range(100, 0, -1)] + [2**63, 1],
+                   [3, 2.5, 2**63 + 1, 1, 0.5] * 20,
+                   [2**63 + i for i in range(100, 0, -1)]):
+        expected_list = sorted(values)
+        assert parallel_merge_sort(values, 2) == expected_list
+        assert [type(v) for v in values] == [type(v) for v in expected_list]
+
+    print(f"parallel_merge_sort on {n} int64 values, {os.cpu_count()} CPUs available:")
+    baseline = None
+    for workers in worker_counts:
+        arr = array.array("q", data)
+        start = time.perf_counter()
+        parallel_merge_sort(arr, workers)
+        elapsed = time.perf_counter() - start
+        assert arr.tolist() == expected, f"Sort failed with {workers} workers"
+
+        baseline = baseline or elapsed
+        print(f"  {workers} workers: {elapsed:7.3f}s  speedup {baseline / elapsed:5.2f}x")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_parallel_merge_sort(n)
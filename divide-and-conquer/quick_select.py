@@ -0,0 +1,263 @@
+"""
+Quickselect and Order Statistics
+
+Finds the k-th smallest element, medians and percentiles in expected O(n)
+time, without sorting the whole array.
+
+Every function partitions with partition_three_way from quick_sort.py
+around a random pivot and only keeps working on the side that still holds
+a requested rank. Several ranks are selected together: each partitioning
+pass splits the set of pending ranks between its two sides, so the work
+near the top of the recursion is shared. Like introsort, a depth budget of
+2 * log2(n) rounds bounds the damage of unlucky pivots; once it is spent,
+pivots are chosen by median of medians, which guarantees O(n) worst case.
+
+All functions work on a copy by default. With in_place=True they reorder
+the given list instead, leaving every requested rank at its sorted
+position with smaller elements before it and larger ones after it.
+"""
+
+import math
+import random
+import statistics
+import sys
+import time
+from bisect import bisect_left, bisect_right
+
+from quick_sort import INSERTION_SORT_CUTOFF, _insertion_sort_range, partition_three_way
+
+def _median_of_medians(arr, low, high):
+    """
+    Returns a pivot value for arr[low..high] guaranteed to lie between the
+    30th and 70th percentile: the median of the medians of groups of five
+    """
+    medians = []
+    for start in range(low, high + 1, 5):
+        group = sorted(arr[start:min(start + 5, high + 1)])
+        medians.append(group[(len(group) - 1) // 2])
+    return select(medians, (len(medians) - 1) // 2, in_place=True)
+
+def _select_ranks(arr, ranks, depth_limit):
+    """
+    Moves every index in ranks to its sorted position in place
+
+    Parameters:
+    arr (list): The list to reorder
+    ranks (list): Sorted, distinct indices into arr
+    depth_limit (int): Random-pivot rounds allowed before switching to
+        median-of-medians pivots
+    """
+    # Each entry is a range of arr and the slice of ranks that falls in it
+    stack = [(0, len(arr) - 1, 0, len(ranks), depth_limit)]
+    while stack:
+        low, high, first, last, depth = stack.pop()
+        if high - low + 1 <= INSERTION_SORT_CUTOFF:
+            _insertion_sort_range(arr, low, high)
+            continue
+
+        if depth > 0:
+            pivot = arr[random.randint(low, high)]
+            depth -= 1
+        else:
+            pivot = _median_of_medians(arr, low, high)
+        lt, gt = partition_three_way(arr, low, high, pivot)
+
+        # Ranks inside [lt, gt] hold the pivot value and are final
+        split_left = bisect_left(ranks, lt, first, last)
+        split_right = bisect_right(ranks, gt, first, last)
+        if first < split_left:
+            stack.append((low, lt - 1, first, split_left, depth))
+        if split_right < last:
+            stack.append((gt + 1, high, split_right, last, depth))
+
+def select_many(arr, ks, in_place=False):
+    """
+    Returns the k-th smallest element for each k in ks
+
+    Parameters:
+    arr (list): The input list
+    ks (list): 0-based ranks, in any order, duplicates allowed
+    in_place (bool): Reorder arr itself instead of a copy
+
+    Returns:
+    list: The selected elements, in the order of ks
+
+    Raises:
+    IndexError: If a rank is outside 0..len(arr) - 1
+
+    Time Complexity: O(n log m) expected for m ranks, O(n) for a fixed m
+    Space Complexity: O(n) for the copy, O(log n) in place
+    """
+    if not in_place:
+        arr = list(arr)
+    n = len(arr)
+    for k in ks:
+        if not 0 <= k < n:
+            raise IndexError(f"rank {k} out of range for {n} elements")
+
+    if ks:
+        ranks = sorted(set(ks))
+        _select_ranks(arr, ranks, 2 * int(math.log2(n)) if n > 1 else 0)
+    return [arr[k] for k in ks]
+
+def select(arr, k, in_place=False):
+    """
+    Returns the k-th smallest element (0-based) of arr
+
+    Parameters:
+    arr (list): The input list
+    k (int): The rank to select
+    in_place (bool): Reorder arr itself, leaving arr[k] in its sorted
+        position with smaller elements before it and larger ones after
+
+    Returns:
+    The k-th smallest element
+
+    Time Complexity: O(n) expected and worst case
+    Space Complexity: O(n) for the copy, O(log n) in place
+
+    Example:
+    >>> select([7, 2, 9, 4, 1], 1)
+    2
+    """
+    return select_many(arr, [k], in_place)[0]
+
+def median(arr, in_place=False):
+    """
+    Returns the median of arr, the mean of the two middle elements when the
+    length is even, as statistics.median does
+
+    Parameters:
+    arr (list): The input list
+    in_place (bool): Reorder arr itself instead of a copy
+
+    Raises:
+    ValueError: If arr is empty
+
+    Time Complexity: O(n)
+    """
+    n = len(arr)
+    if n == 0:
+        raise ValueError("median of an empty list")
+    if n % 2:
+        return select(arr, n // 2, in_place)
+    lower, upper = select_many(arr, [n // 2 - 1, n // 2], in_place)
+    return (lower + upper) / 2
+
+def percentiles(arr, ps, in_place=False):
+    """
+    Returns the p-th percentile of arr for each p in ps
+
+    Uses linear interpolation between the two nearest ranks, the default
+    method of numpy.percentile: rank p / 100 * (n - 1). All ranks are
+    selected in one shared pass.
+
+    Parameters:
+    arr (list): The input list of numbers
+    ps (list): Percentiles between 0 and 100, such as [50, 95, 99]
+    in_place (bool): Reorder arr itself instead of a copy
+
+    Returns:
+    list: One value per percentile, in the order of ps
+
+    Raises:
+    ValueError: If arr is empty or a percentile is outside 0..100
+
+    Time Complexity: O(n log m) expected for m percentiles
+
+    Example:
+    >>> percentiles(list(range(101)), [50, 95, 99])
+    [50.0, 95.0, 99.0]
+    """
+    n = len(arr)
+    if n == 0:
+        raise ValueError("percentiles of an empty list")
+    for p in ps:
+        if not 0 <= p <= 100:
+            raise ValueError(f"percentile {p} outside 0..100")
+
+    positions = [p / 100 * (n - 1) for p in ps]
+    ranks = set()
+    for position in positions:
+        ranks.add(math.floor(position))
+        ranks.add(math.ceil(position))
+    ranks = sorted(ranks)
+    values = dict(zip(ranks, select_many(arr, ranks, in_place)))
+
+    result = []
+    for position in positions:
+        lower, upper = values[math.floor(position)], values[math.ceil(position)]
+        result.append(lower + (upper - lower) * (position - math.floor(position)))
+    return result
+
+def test_select():
+    """
+    Checks the selection functions against sorted(), including inputs with
+    many duplicates and the median-of-medians fallback
+    """
+    for n in (1, 2, 17, 100, 1000):
+        for distinct in (2, n):
+            data = [random.randrange(distinct) for _ in range(n)]
+            expected = sorted(data)
+            k = random.randrange(n)
+            assert select(data, k) == expected[k]
+            ks = [random.randrange(n) for _ in range(5)]
+            assert select_many(data, ks) == [expected[k] for k in ks]
+            assert median(data) == statistics.median(data)
+
+            arr = data.copy()
+            select(arr, k, in_place=True)
+            assert arr[k] == expected[k]
+            assert all(x <= arr[k] for x in arr[:k]) and all(arr[k] <= x for x in arr[k + 1:])
+
+    # A depth budget of 0 uses median-of-medians pivots from the start
+    data = [random.random() for _ in range(5000)]
+    ranks = [0, 1234, 2500, 4999]
+    arr = data.copy()
+    _select_ranks(arr, ranks, 0)
+    assert [arr[k] for k in ranks] == [sorted(data)[k] for k in ranks]
+
+    assert percentiles(list(range(101)), [0, 50, 95, 99, 100]) == [0, 50, 95, 99, 100]
+    assert percentiles([1, 2, 3, 4], [50]) == [2.5]
+    print("All selection tests passed")
+
+def benchmark_select(n=1_000_000):
+    """
+    Compares median and percentiles against sorting the whole list
+    """
+    from heap_sort import heap_sort
+
+    data = [random.randint(0, 10**9) for _ in range(n)]
+    print(f"Order statistics of {n} random integers:")
+
+    start = time.perf_counter()
+    expected = heap_sort(data)
+    print(f"  heap_sort (pure Python full sort)  {time.perf_counter() - start:7.3f}s")
+
+    start = time.perf_counter()
+    sorted(data)
+    print(f"  sorted() (C full sort)             {time.perf_counter() - start:7.3f}s")
+
+    start = time.perf_counter()
+    result = median(data)
+    print(f"  median                             {time.perf_counter() - start:7.3f}s")
+    assert result == statistics.median(expected)
+
+    start = time.perf_counter()
+    result = percentiles(data, [50, 95, 99])
+    print(f"  percentiles [50, 95, 99]           {time.perf_counter() - start:7.3f}s")
+
+    start = time.perf_counter()
+    separate = [percentiles(data, [p])[0] for p in (50, 95, 99)]
+    print(f"  the same, one call per percentile  {time.perf_counter() - start:7.3f}s")
+    assert result == separate
+
+    arr = data.copy()
+    start = time.perf_counter()
+    median(arr, in_place=True)
+    print(f"  median, in place                   {time.perf_counter() - start:7.3f}s")
+
+if __name__ == "__main__":
+    test_select()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_select(n)
@@ -1,16 +1,48 @@
+import math
+import os
+import random
+import sys
+import time
+
+# heap_sort lives in the sibling sorting-algorithms directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sorting-algorithms"))
+from heap_sort import heap_sort  # noqa: E402
+from sort_keys import key_and_reverse  # noqa: E402
+from typed_buffer import typed_buffer_sort  # noqa: E402
+
+# Partitions at or below this size are finished with insertion sort
+INSERTION_SORT_CUTOFF = 16
+
+# Partitions larger than this pick the pivot with Tukey's ninther
+NINTHER_THRESHOLD = 128
+
+@typed_buffer_sort(kind="quicksort", returns="copy")
+@key_and_reverse(returns="copy")
 def quick_sort(arr):
     """
     Implements the Quick Sort algorithm to sort an array in ascending order
 
     Parameters:
     arr (list): The input list is to be sorted
+    key (callable, optional): Extracts the sort key, called once per element
+    reverse (bool): Sort in descending order
 
     Returns:
     list: A new sorted list
 
+    Stability: stable, both partitions keep their input order and elements
+    equal to the (last) pivot all come from before it
+
     Time Complexity: O(n log n) average case, O(n^2) worst case
     Space Complexity: O(log n) due to recursion
     """
+    return _quick_sort(arr)
+
+def _quick_sort(arr):
+    """
+    Recursive body of quick_sort, kept free of the decorators so each
+    level costs one stack frame
+    """
     # Base case: if the list has 1 or 0 elements, its already sorted
     if len(arr) <= 1:
         return arr
@@ -23,49 +55,300 @@ def quick_sort(arr):
     right = [x for x in arr[:-1] if x > pivot]
 
     # Recursively sort left and right partitions and combine
-    return quick_sort(left) + [pivot] + quick_sort(right)
+    return _quick_sort(left) + [pivot] + _quick_sort(right)
+
+def partition(arr, low, high):
+    """
+    Partitions arr[low..high] around the pivot stored at arr[high]
+
+    Parameters:
+    arr (list): The list being sorted
+    low (int): Starting index of the partition
+    high (int): Ending index of the partition (holds the pivot)
+
+    Returns:
+    int: Final index of the pivot; everything left of it is <= pivot
+    """
+    pivot = arr[high]
+    i = low - 1
+
+    for j in range(low, high):
+        if arr[j] <= pivot:
+            i += 1
+            arr[i], arr[j] = arr[j], arr[i]
+
+    arr[i + 1], arr[high] = arr[high], arr[i + 1]
+    return i + 1
+
+def _median_of_three(arr, a, b, c):
+    """
+    Returns whichever of the indices a, b, c holds the median value
+    """
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+def _choose_pivot(arr, low, high):
+    """
+    Picks a pivot index for arr[low..high]
+
+    Small partitions use the median of the first, middle and last elements.
+    Large partitions use Tukey's ninther (median of three medians of three),
+    which keeps sorted, reversed and organ-pipe inputs well balanced.
+    """
+    size = high - low + 1
+    mid = low + size // 2
+
+    if size > NINTHER_THRESHOLD:
+        step = size // 8
+        first = _median_of_three(arr, low, low + step, low + 2 * step)
+        middle = _median_of_three(arr, mid - step, mid, mid + step)
+        last = _median_of_three(arr, high - 2 * step, high - step, high)
+        return _median_of_three(arr, first, middle, last)
+
+    return _median_of_three(arr, low, mid, high)
+
+def _insertion_sort_range(arr, low, high):
+    """
+    Sorts arr[low..high] in place with insertion sort
+    """
+    for i in range(low + 1, high + 1):
+        current = arr[i]
+        j = i - 1
+        while j >= low and arr[j] > current:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = current
+
+def _intro_sort(arr, low, high, depth_limit):
+    """
+    Introsort loop over arr[low..high]
+
+    Recurses only into the smaller partition and loops on the larger one,
+    so the call stack never grows beyond O(log n). Once depth_limit
+    partitioning rounds have been spent the remaining range is handed
+    to heap sort, which bounds the worst case at O(n log n).
+    """
+    while high - low + 1 > INSERTION_SORT_CUTOFF:
+        if depth_limit == 0:
+            arr[low:high + 1] = heap_sort(arr[low:high + 1])
+            return
+        depth_limit -= 1
+
+        # Move the chosen pivot to the end where partition expects it
+        pivot_index = _choose_pivot(arr, low, high)
+        arr[pivot_index], arr[high] = arr[high], arr[pivot_index]
+        pivot_index = partition(arr, low, high)
+
+        # Recurse into the smaller side, continue the loop on the larger
+        if pivot_index - low < high - pivot_index:
+            _intro_sort(arr, low, pivot_index - 1, depth_limit)
+            low = pivot_index + 1
+        else:
+            _intro_sort(arr, pivot_index + 1, high, depth_limit)
+            high = pivot_index - 1
 
+    _insertion_sort_range(arr, low, high)
+
+@typed_buffer_sort(kind="quicksort", returns="self")
+@key_and_reverse(returns="self", bounds=True)
 def quick_sort_in_place(arr, low=0, high=None):
     """
     Implements an in-place quick sort algorithm
 
+    Uses introsort: median-of-three / ninther pivots, an insertion sort
+    cutoff for small partitions and a heap sort fallback once the
+    recursion depth budget of 2 * log2(n) is exhausted.
+
     Parameters:
     arr (list): The input list to be sorted
     low (int): Starting index of the partition
     high (int): Ending index of the partition
+    key (callable, optional): Extracts the sort key, called once per element
+    reverse (bool): Sort in descending order
+
+    Returns:
+    list: The same list, sorted
+
+    Stability: not stable, partitioning swaps elements across equal ones
+
+    Time Complexity: O(n log n) worst case
+    Space Complexity: O(log n) recursion depth
     """
     if high is None:
         high = len(arr) - 1
-    
-    def partition(arr, low, high):
-        """
-        Partitions the array and returns the pivot index
-
-        Uses the last element as the pivot
-        """
-        pivot = arr[high]
-        i = low - 1
-
-        for j in range(low, high):
-            if arr[j] <= pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        return i + 1
-    
-    def _quick_sort(arr, low, high):
-        """
-        Recursive helper function to perform quick sort
-        """
-        if low < high:
-            # Find pivot index
-            pivot_index = partition(arr, low, high)
-
-            # Recursively sort left and right partitions
-            _quick_sort(arr, low, pivot_index - 1)
-            _quick_sort(arr, pivot_index + 1, high)
-
-    # Call internal recursive function
-    _quick_sort(arr, low, high)
-    return arr
\ No newline at end of file
+
+    if low < high:
+        depth_limit = 2 * int(math.log2(high - low + 1))
+        _intro_sort(arr, low, high, depth_limit)
+    return arr
+
+def partition_three_way(arr, low, high, pivot):
+    """
+    Partitions arr[low..high] into three bands around a pivot value
+
+    Dijkstra's Dutch national flag scheme: a single left-to-right pass
+    keeps elements < pivot before lt, elements > pivot after gt, and
+    elements equal to the pivot in between. Only `<` is used to compare.
+
+    Parameters:
+    arr (list): The list being sorted
+    low (int): Starting index of the partition
+    high (int): Ending index of the partition
+    pivot: The value to partition around
+
+    Returns:
+    tuple: (lt, gt), the first and last index of the band equal to pivot
+    """
+    lt, i, gt = low, low, high
+    while i <= gt:
+        x = arr[i]
+        if x < pivot:
+            arr[i] = arr[lt]
+            arr[lt] = x
+            lt += 1
+            i += 1
+        elif pivot < x:
+            arr[i] = arr[gt]
+            arr[gt] = x
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+def _three_way_sort(arr, low, high, depth_limit):
+    """
+    Three-way quicksort loop over arr[low..high]
+
+    Elements equal to the pivot are final after one pass, so a range with
+    d distinct keys needs at most d partitioning rounds. Like _intro_sort
+    it recurses into the smaller side, loops on the larger one and falls
+    back to heap sort when depth_limit runs out.
+    """
+    while high - low + 1 > INSERTION_SORT_CUTOFF:
+        if depth_limit == 0:
+            arr[low:high + 1] = heap_sort(arr[low:high + 1])
+            return
+        depth_limit -= 1
+
+        pivot = arr[random.randint(low, high)]
+        lt, gt = partition_three_way(arr, low, high, pivot)
+
+        if lt - low < high - gt:
+            _three_way_sort(arr, low, lt - 1, depth_limit)
+            low = gt + 1
+        else:
+            _three_way_sort(arr, gt + 1, high, depth_limit)
+            high = lt - 1
+
+    _insertion_sort_range(arr, low, high)
+
+@typed_buffer_sort(kind="quicksort", returns="self")
+@key_and_reverse(returns="self", bounds=True)
+def quick_sort_3way(arr, low=0, high=None):
+    """
+    Implements an in-place three-way partitioning quick sort
+
+    Uses random pivots and Dutch national flag partitioning, so runs of
+    equal keys are set aside after one pass instead of being partitioned
+    again and again. Works on index bounds only: no list is allocated per
+    partitioning level. Small partitions are finished with insertion sort,
+    and a depth budget of 2 * log2(n) falls back to heap sort.
+
+    Parameters:
+    arr (list): The input list to be sorted
+    low (int): Starting index of the partition
+    high (int): Ending index of the partition
+    key (callable, optional): Extracts the sort key, called once per element
+    reverse (bool): Sort in descending order
+
+    Returns:
+    list: The same list, sorted
+
+    Stability: not stable, partitioning swaps elements across equal ones
+
+    Time Complexity: O(n log d) expected for d distinct keys, O(n log n) worst case
+    Space Complexity: O(log n) recursion depth
+    """
+    if high is None:
+        high = len(arr) - 1
+
+    if low < high:
+        depth_limit = 2 * int(math.log2(high - low + 1))
+        _three_way_sort(arr, low, high, depth_limit)
+    return arr
+
+def _organ_pipe(n):
+    """
+    Builds an ascending-then-descending list of n integers
+    """
+    half = n // 2
+    return list(range(half)) + list(range(n - half - 1, -1, -1))
+
+def benchmark_quick_sort_in_place(n=10**6):
+    """
+    Times quick_sort_in_place on adversarial and random inputs of size n
+    """
+    inputs = {
+        "sorted": list(range(n)),
+        "reversed": list(range(n - 1, -1, -1)),
+        "organ-pipe": _organ_pipe(n),
+        "random": [random.randint(0, n) for _ in range(n)],
+    }
+
+    print(f"quick_sort_in_place on {n} elements:")
+    for name, data in inputs.items():
+        arr = data.copy()
+        start = time.perf_counter()
+        quick_sort_in_place(arr)
+        elapsed = time.perf_counter() - start
+
+        assert arr == sorted(data), f"Sort failed for {name} input"
+        print(f"  {name:<10} {elapsed:8.3f}s")
+
+def benchmark_quick_sort_3way(n=100_000):
+    """
+    Compares the three quick sorts on inputs with few distinct keys
+    """
+    print(f"Quick sorts on {n} elements with few distinct keys:")
+    for distinct in (2, 16, 1000):
+        data = [random.randrange(distinct) for _ in range(n)]
+        expected = sorted(data)
+
+        timings = []
+        for sort in (quick_sort, quick_sort_in_place, quick_sort_3way):
+            arr = data.copy()
+            start = time.perf_counter()
+            try:
+                result = sort(arr)
+            except RecursionError:
+                timings.append(f"{sort.__name__} recursion limit")
+                continue
+            elapsed = time.perf_counter() - start
+            assert result == expected, f"{sort.__name__} failed with {distinct} keys"
+            timings.append(f"{sort.__name__} {elapsed:7.3f}s")
+
+        print(f"  {distinct:>4} keys: {'  '.join(timings)}")
+
+def main():
+    """
+    Example usage of the quick sort algorithms.
+    """
+    arr = [38, 27, 43, 3, 9, 82, 10]
+    print("Original array:", arr)
+    print("quick_sort:", quick_sort(arr))
+    print("quick_sort_in_place:", quick_sort_in_place(arr.copy()))
+    print("quick_sort_3way:", quick_sort_3way(arr.copy()))
+    print()
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    benchmark_quick_sort_in_place(n)
+    print()
+    benchmark_quick_sort_3way(min(n, 100_000))
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
-from typing import List, Dict, Tuple, Optional
+import os
+import sys
+from typing import List, Dict, Tuple, Optional, Union
 from math import inf
 
+# CSRGraph lives in the sibling graph-algorithm directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "graph-algorithm"))
+from csr_graph import CSRGraph  # noqa: E402
+
 class Graph:
     """
     A class to represent a weighted directed graph for Bellman-Ford algorithm.
@@ -30,7 +36,7 @@ class Graph:
         """
         self.edges.append((source, dest, weight))
 
-def bellman_ford(graph: Graph, source: int) -> Tuple[Optional[Dict[int, float]], Optional[Dict[int, int]]]:
+def bellman_ford(graph: Union[Graph, CSRGraph], source: int) -> Tuple[Optional[Dict[int, float]], Optional[Dict[int, int]]]:
     """
     Implement Bellman-Ford algorithm using dynamic programming approach.
     
@@ -50,7 +56,7 @@ def bellman_ford(graph: Graph, source: int) -> Tuple[Optional[Dict[int, float]],
         O(V) for storing distances and predecessors
         
     Args:
-        graph (Graph): Input graph with weighted edges
+        graph (Graph or CSRGraph): Input graph with weighted edges
         source (int): Source vertex
         
     Returns:
@@ -59,6 +65,9 @@ def bellman_ford(graph: Graph, source: int) -> Tuple[Optional[Dict[int, float]],
             - None, None if negative cycle exists
             
     """
+    if isinstance(graph, CSRGraph):
+        return _bellman_ford_csr(graph, source)
+
     # Initialize distances and predecessors (dp table)
     distances: Dict[int, float] = {i: inf for i in range(graph.vertices)}
     distances[source] = 0
@@ -80,6 +89,43 @@ def bellman_ford(graph: Graph, source: int) -> Tuple[Optional[Dict[int, float]],
             return None, None
     
     return distances, predecessors
+
+def _bellman_ford_csr(graph: CSRGraph, source: int) -> Tuple[Optional[Dict[int, float]], Optional[Dict[int, int]]]:
+    """
+    bellman_ford over a CSRGraph, relaxing the arcs straight from its
+    arrays, returning dicts keyed by label.
+    """
+    if graph.weights is None:
+        raise ValueError("bellman_ford needs a weighted graph")
+    n = graph.num_vertices
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    # Arcs of u are targets[start:end], walking consecutive offsets
+    arc_ranges = list(zip(offsets, offsets[1:]))
+
+    distances = [inf] * n
+    distances[graph.vertex(source)] = 0
+    predecessors = [-1] * n
+
+    for _ in range(n - 1):
+        for u, (start, end) in enumerate(arc_ranges):
+            if distances[u] == inf:
+                continue
+            for v, weight in zip(targets[start:end], weights[start:end]):
+                if distances[u] + weight < distances[v]:
+                    distances[v] = distances[u] + weight
+                    predecessors[v] = u
+
+    for u, (start, end) in enumerate(arc_ranges):
+        if distances[u] == inf:
+            continue
+        for v, weight in zip(targets[start:end], weights[start:end]):
+            if distances[u] + weight < distances[v]:
+                print("Graph contains negative weight cycle")
+                return None, None
+
+    label = graph.label
+    return ({label(v): distances[v] for v in range(n)},
+            {label(v): None if predecessors[v] < 0 else label(predecessors[v]) for v in range(n)})
     
 def visualize_solution(graph: Graph, source: int) -> None:
     """
@@ -1,5 +1,20 @@
+import array
+import random
+import sys
+import time
 from collections import deque
-from typing import Dict, List, Set
+from itertools import accumulate
+from typing import Dict, List, Optional, Set, Union
+
+from csr_graph import CSRGraph
+
+# Direction-optimizing BFS switches to bottom-up once the frontier's arcs
+# exceed 1/ALPHA of the arcs left unexplored, and back to top-down once
+# the frontier shrinks below 1/BETA of the vertices (Beamer et al., 2012)
+ALPHA = 14
+BETA = 24
+# Start vertices per ms_bfs batch, one bit each in a 64-bit mask
+BATCH_WIDTH = 64
 
 class Graph:
     """
@@ -27,15 +42,16 @@ class Graph:
             self.graph[v] = []
         self.graph[v].append(u)
 
-def bfs(graph: Graph, start_vertex: int) -> Dict[int, int]:
+def bfs(graph: Union[Graph, CSRGraph], start_vertex: int) -> Dict[int, int]:
     """
     Performs Breadth First Search traversal of the graph.
     
     BFS explores all vertices at the current depth before moving to vertices
     at the next depth level. It uses a queue to keep track of vertices to visit.
+    On a CSRGraph the visited set is a distance array indexed by vertex id.
     
     Args:
-        graph (Graph): The graph to traverse
+        graph (Graph or CSRGraph): The graph to traverse
         start_vertex (int): The starting vertex for BFS
         
     Returns:
@@ -57,15 +73,50 @@ def bfs(graph: Graph, start_vertex: int) -> Dict[int, int]:
         >>> print(distances)
         {0: 0, 1: 1, 2: 1, 3: 2}
     """
+    return multi_source_bfs(graph, [start_vertex])
+
+def multi_source_bfs(graph: Union[Graph, CSRGraph], start_vertices: List[int]) -> Dict[int, int]:
+    """
+    Performs Breadth First Search from several start vertices at once.
+
+    All start vertices enter the queue at distance 0, so a single traversal
+    finds, for every reachable vertex, the distance to the nearest start
+    vertex. This is one BFS, not one per start vertex.
+
+    Args:
+        graph (Graph or CSRGraph): The graph to traverse
+        start_vertices (List[int]): The vertices to start from
+
+    Returns:
+        Dict[int, int]: Distance from each reachable vertex to its nearest start vertex
+
+    Time Complexity:
+        - O(V + E), independent of the number of start vertices
+
+    Space Complexity:
+        - O(V) for the queue and visited set
+
+    Example:
+        >>> g = Graph()
+        >>> for u in range(5):
+        ...     g.add_edge(u, u + 1)
+        >>> multi_source_bfs(g, [0, 5])
+        {0: 0, 5: 0, 1: 1, 4: 1, 2: 2, 3: 2}
+    """
+    if isinstance(graph, CSRGraph):
+        return _bfs_csr(graph, start_vertices)
+
     # Initialize visited set and queue
     visited: Set[int] = set()
     queue = deque()
     distances: Dict[int, int] = {}
     
-    # Start from the initial vertex
-    queue.append(start_vertex)
-    visited.add(start_vertex)
-    distances[start_vertex] = 0
+    # Start from every initial vertex
+    for start_vertex in start_vertices:
+        if start_vertex not in visited:
+            queue.append(start_vertex)
+            visited.add(start_vertex)
+            distances[start_vertex] = 0
     
     # Process vertices in queue
     while queue:
@@ -81,6 +132,343 @@ def bfs(graph: Graph, start_vertex: int) -> Dict[int, int]:
     
     return distances
 
+def _bfs_csr(graph: CSRGraph, start_vertices: List[int]) -> Dict[int, int]:
+    """
+    multi_source_bfs over a CSRGraph, returning the same distance dict keyed by label.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    distance = [-1] * graph.num_vertices
+
+    # The queue is a list that is only appended to; iterating over it
+    # visits vertices in discovery order
+    queue = []
+    for start_vertex in start_vertices:
+        source = graph.vertex(start_vertex)
+        if distance[source] < 0:
+            distance[source] = 0
+            queue.append(source)
+
+    for current in queue:
+        next_distance = distance[current] + 1
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if distance[neighbor] < 0:
+                distance[neighbor] = next_distance
+                queue.append(neighbor)
+
+    label = graph.label
+    return {label(v): distance[v] for v in queue}
+
+def ms_bfs(graph: Union[Graph, CSRGraph], start_vertices: List[int],
+           reachability_only: bool = False) -> Union[List[Dict[int, int]], List[array.array]]:
+    """
+    Runs a separate BFS from each start vertex, up to BATCH_WIDTH of them
+    in one shared traversal (MS-BFS, Then et al., 2014).
+
+    Every vertex carries a bit mask with one bit per start vertex of the
+    batch: seen[v] holds the BFSs that have reached v, and the frontier
+    maps each vertex to the BFSs that reached it in the last level. One
+    pass over a frontier vertex's arcs advances all of those BFSs at once
+    with a single AND NOT and OR per arc, so a vertex shared by many
+    traversals is expanded once per level instead of once per traversal.
+    More start vertices are run in batches of BATCH_WIDTH.
+
+    Args:
+        graph (Graph or CSRGraph): The graph to traverse (converted to a CSRGraph)
+        start_vertices (List[int]): The vertices to start from
+        reachability_only (bool): Skip recording distances and return the
+            seen masks instead
+
+    Returns:
+        List[Dict[int, int]]: For each start vertex the distances bfs would
+        return; or, if reachability_only, one array.array('Q') per batch,
+        where bit i of masks[b][v] is set if vertex id v is reachable from
+        start_vertices[b * BATCH_WIDTH + i]
+
+    Time Complexity:
+        - O(V + E) arc visits per level shared by the batch, plus O(1)
+          per (start vertex, reached vertex) pair to record distances
+
+    Space Complexity:
+        - O(V) masks per batch, plus the distances returned
+    """
+    csr = CSRGraph.from_graph(graph)
+    results = []
+    for begin in range(0, len(start_vertices), BATCH_WIDTH):
+        batch = [csr.vertex(v) for v in start_vertices[begin:begin + BATCH_WIDTH]]
+        seen, distances = _ms_bfs_batch(csr, batch, not reachability_only)
+        if reachability_only:
+            results.append(array.array("Q", seen))
+        else:
+            results.extend(distances)
+    return results
+
+def _ms_bfs_batch(csr: CSRGraph, sources: List[int], record_distances: bool):
+    """
+    Runs one MS-BFS batch over vertex ids. Returns the seen masks and,
+    if record_distances, one distance dict per source.
+    """
+    offsets, targets, label = csr.offsets, csr.targets, csr.label
+    seen = [0] * csr.num_vertices
+    frontier: Dict[int, int] = {}
+    distances = [{label(source): 0} for source in sources] if record_distances else None
+    for i, source in enumerate(sources):
+        seen[source] |= 1 << i
+        frontier[source] = frontier.get(source, 0) | 1 << i
+
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier: Dict[int, int] = {}
+        for v, mask in frontier.items():
+            for w in targets[offsets[v]:offsets[v + 1]]:
+                new = mask & ~seen[w]
+                if new:
+                    seen[w] |= new
+                    next_frontier[w] = next_frontier.get(w, 0) | new
+
+        if record_distances:
+            for w, new in next_frontier.items():
+                w_label = label(w)
+                while new:
+                    lowest = new & -new
+                    distances[lowest.bit_length() - 1][w_label] = level
+                    new ^= lowest
+        frontier = next_frontier
+    return seen, distances
+
+def bfs_direction_optimizing(graph: Union[Graph, CSRGraph], start_vertex: int, directed: Optional[bool] = None,
+                             as_array: bool = False) -> Union[Dict[int, int], array.array]:
+    """
+    Performs Breadth First Search, switching between top-down and bottom-up
+    steps based on the frontier size (Beamer's direction-optimizing BFS).
+
+    A top-down step scans the arcs of every frontier vertex, as bfs does.
+    Once the frontier holds a large share of the graph most of those arcs
+    lead to vertices that are already visited, so a bottom-up step instead
+    scans the unvisited vertices and stops at the first neighbor found in
+    the frontier. That neighbor is usually among the first few checked,
+    which skips most of the arcs in the middle levels of low-diameter
+    graphs. Steps switch to bottom-up when the frontier's arcs exceed
+    1/ALPHA of the unexplored arcs, and back to top-down when the frontier
+    drops below 1/BETA of the vertices and is shrinking.
+
+    Visited and frontier sets are bytearrays with one byte per vertex.
+    Bottom-up steps find the next unvisited vertex with bytearray.find in
+    C rather than testing every vertex in Python.
+
+    Args:
+        graph (Graph or CSRGraph): The graph to traverse (converted to a CSRGraph)
+        start_vertex (int): The starting vertex for BFS
+        directed (bool, optional): Whether arcs are one-way. Bottom-up
+            steps follow arcs backwards, which needs the reversed graph;
+            undirected graphs store every edge both ways and are their own
+            reverse. By default this is taken from CSRGraph.undirected, so
+            only graphs known to be undirected skip building the reverse.
+            Pass False only for graphs that store every edge both ways.
+        as_array (bool): Return an array of distances by vertex id, -1
+            for unreachable vertices, instead of a dict
+
+    Returns:
+        Dict[int, int] or array.array: The same distances as bfs
+
+    Time Complexity:
+        - O(V + E) per traversal, typically with far fewer arc checks
+
+    Space Complexity:
+        - O(V) for the distances, visited and frontier sets
+    """
+    csr = CSRGraph.from_graph(graph)
+    if directed is None:
+        directed = not csr.undirected
+    incoming = csr.reverse() if directed else csr
+    n = csr.num_vertices
+    offsets, targets = csr.offsets, csr.targets
+    in_offsets, in_targets = incoming.offsets, incoming.targets
+
+    source = csr.vertex(start_vertex)
+    distance = [-1] * n
+    distance[source] = 0
+    visited = bytearray(n)
+    visited[source] = 1
+    reached = [source]
+
+    frontier = [source]
+    unexplored_arcs = len(targets) - (offsets[source + 1] - offsets[source])
+    top_down = True
+    level = 0
+    previous_size = 1
+    while frontier:
+        level += 1
+        frontier_arcs = sum(offsets[u + 1] - offsets[u] for u in frontier)
+        if top_down and frontier_arcs > unexplored_arcs / ALPHA:
+            top_down = False
+        elif not top_down and len(frontier) < n / BETA and len(frontier) < previous_size:
+            top_down = True
+        previous_size = len(frontier)
+
+        next_frontier = []
+        if top_down:
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if not visited[v]:
+                        visited[v] = 1
+                        distance[v] = level
+                        next_frontier.append(v)
+        else:
+            in_frontier = bytearray(n)
+            for u in frontier:
+                in_frontier[u] = 1
+            v = visited.find(0)
+            while v != -1:
+                for u in in_targets[in_offsets[v]:in_offsets[v + 1]]:
+                    if in_frontier[u]:
+                        visited[v] = 1
+                        distance[v] = level
+                        next_frontier.append(v)
+                        break
+                v = visited.find(0, v + 1)
+
+        unexplored_arcs -= sum(offsets[v + 1] - offsets[v] for v in next_frontier)
+        reached.extend(next_frontier)
+        frontier = next_frontier
+
+    if as_array:
+        return array.array("q", distance)
+    label = csr.label
+    return {label(v): distance[v] for v in reached}
+
+def power_law_graph(n: int, average_degree: float = 16, exponent: float = 2.1, seed: int = 0) -> CSRGraph:
+    """
+    Generates an undirected Chung-Lu random graph whose degrees follow a
+    power law with the given exponent, like a social network: a few hubs
+    and a small diameter.
+
+    Args:
+        n (int): Number of vertices
+        average_degree (float): Expected average degree
+        exponent (float): Power-law exponent of the degree distribution
+        seed (int): Random seed
+
+    Returns:
+        CSRGraph: The graph, without self-loops
+    """
+    rng = random.Random(seed)
+    weights = [(i + 1) ** (-1 / (exponent - 1)) for i in range(n)]
+    cumulative = list(accumulate(weights))
+    m = int(n * average_degree / 2)
+    ends = rng.choices(range(n), cum_weights=cumulative, k=2 * m)
+    edges = [(u, v) for u, v in zip(ends[::2], ends[1::2]) if u != v]
+    return CSRGraph.from_edges(edges, n, undirected=True)
+
+def test_bfs_direction_optimizing() -> None:
+    """
+    Checks bfs_direction_optimizing against bfs on power-law, path,
+    disconnected and directed graphs.
+    """
+    csr = power_law_graph(3000, seed=3)
+    for start in (0, 1, 2999):
+        expected = bfs(csr, start)
+        assert bfs_direction_optimizing(csr, start) == expected
+        distances = bfs_direction_optimizing(csr, start, as_array=True)
+        assert {v: d for v, d in enumerate(distances) if d >= 0} == expected
+
+    g = Graph()
+    for v in range(50):
+        g.add_edge(v, v + 1)
+    g.add_edge(100, 101)
+    assert bfs_direction_optimizing(g, 0) == bfs(g, 0)
+
+    directed = CSRGraph.from_edges([(0, 1), (1, 2), (2, 0), (2, 3), (4, 3)])
+    assert bfs_direction_optimizing(directed, 0, directed=True) == {0: 0, 1: 1, 2: 2, 3: 3}
+
+    # Without directed=, a directed graph must still be traversed backwards
+    # in bottom-up steps
+    rng = random.Random(5)
+    directed = CSRGraph.from_edges([(rng.randrange(2000), rng.randrange(2000)) for _ in range(20_000)], 2000)
+    for start in (0, 1, 1999):
+        assert bfs_direction_optimizing(directed, start) == bfs(directed, start)
+    print("All direction-optimizing BFS tests passed")
+
+def test_multi_source_bfs() -> None:
+    """
+    Checks multi_source_bfs against the minimum over single-source bfs
+    runs, and ms_bfs against one bfs per start vertex, across batches.
+    """
+    csr = power_law_graph(2000, average_degree=3, seed=5)
+    g = Graph()
+    for u in range(csr.num_vertices):
+        g.graph[u] = csr.neighbors(u).tolist()
+    starts = random.Random(5).sample(range(csr.num_vertices), 150)
+
+    singles = [bfs(csr, s) for s in starts]
+    nearest: Dict[int, int] = {}
+    for distances in singles:
+        for v, d in distances.items():
+            nearest[v] = min(d, nearest.get(v, d))
+    assert multi_source_bfs(csr, starts) == nearest == multi_source_bfs(g, starts)
+
+    assert ms_bfs(csr, starts) == singles
+    assert ms_bfs(g, starts + starts[:1])[-1] == singles[0]
+    masks = ms_bfs(csr, starts, reachability_only=True)
+    assert len(masks) == 3
+    for i, distances in enumerate(singles):
+        batch, bit = divmod(i, BATCH_WIDTH)
+        reached = {v for v in range(csr.num_vertices) if masks[batch][v] >> bit & 1}
+        assert reached == set(distances)
+    print("All multi-source BFS tests passed")
+
+def benchmark_ms_bfs(n: int = 20_000, sources: int = 256) -> None:
+    """
+    Reports sources per second of one bfs call per source against ms_bfs,
+    with and without recording distances, on a power-law graph.
+    """
+    csr = power_law_graph(n, average_degree=8)
+    starts = random.Random(1).sample(range(n), sources)
+    print(f"BFS from {sources} sources on a power-law graph with {n} vertices and {csr.num_edges} arcs:")
+
+    begin = time.perf_counter()
+    expected = [bfs(csr, s) for s in starts]
+    elapsed = time.perf_counter() - begin
+    print(f"  one bfs per source               {sources / elapsed:8.1f} sources/s")
+
+    begin = time.perf_counter()
+    assert ms_bfs(csr, starts) == expected
+    elapsed = time.perf_counter() - begin
+    print(f"  ms_bfs                           {sources / elapsed:8.1f} sources/s")
+
+    begin = time.perf_counter()
+    ms_bfs(csr, starts, reachability_only=True)
+    elapsed = time.perf_counter() - begin
+    print(f"  ms_bfs, reachability only        {sources / elapsed:8.1f} sources/s")
+
+    begin = time.perf_counter()
+    multi_source_bfs(csr, starts)
+    elapsed = time.perf_counter() - begin
+    print(f"  multi_source_bfs (nearest seed)  {elapsed:8.3f}s for all sources")
+
+def benchmark_bfs(n: int = 200_000, average_degree: float = 16) -> None:
+    """
+    Compares bfs on the dict Graph and on a CSRGraph with
+    bfs_direction_optimizing, on a synthetic power-law graph.
+    """
+    csr = power_law_graph(n, average_degree)
+    g = Graph()
+    for u in range(n):
+        g.graph[u] = csr.neighbors(u).tolist()
+    start = max(range(n), key=csr.degree)
+    print(f"BFS on a power-law graph with {n} vertices and {csr.num_edges} arcs:")
+
+    expected = None
+    for name, run in [("bfs on Graph (dict of lists)", lambda: bfs(g, start)),
+                      ("bfs on CSRGraph", lambda: bfs(csr, start)),
+                      ("bfs_direction_optimizing", lambda: bfs_direction_optimizing(csr, start))]:
+        begin = time.perf_counter()
+        distances = run()
+        elapsed = time.perf_counter() - begin
+        expected = expected or distances
+        assert distances == expected
+        print(f"  {name:<30} {elapsed:7.3f}s  {csr.num_edges / elapsed / 1e6:6.2f}M arcs/s")
+
 def visualize_bfs(graph: Graph, start_vertex: int) -> None:
     """
     Demonstrates BFS traversal with step-by-step visualization.
@@ -89,14 +477,34 @@ def visualize_bfs(graph: Graph, start_vertex: int) -> None:
         graph (Graph): The graph to traverse
         start_vertex (int): The starting vertex for BFS
     """
+    print(f"\nStarting BFS from vertex {start_vertex}")
+    _visualize_levels(graph, [start_vertex])
+
+def visualize_multi_source_bfs(graph: Graph, start_vertices: List[int]) -> None:
+    """
+    Demonstrates multi-source BFS with step-by-step visualization: every
+    start vertex is on level 0, and each vertex is discovered from the
+    nearest one.
+    
+    Args:
+        graph (Graph): The graph to traverse
+        start_vertices (List[int]): The vertices to start from
+    """
+    print(f"\nStarting BFS from vertices {start_vertices}")
+    _visualize_levels(graph, start_vertices)
+
+def _visualize_levels(graph: Graph, start_vertices: List[int]) -> None:
+    """
+    Prints the queue, processed vertices and discoveries level by level.
+    """
     visited: Set[int] = set()
     queue = deque()
     level = 0
     
-    queue.append(start_vertex)
-    visited.add(start_vertex)
-    
-    print(f"\nStarting BFS from vertex {start_vertex}")
+    for start_vertex in start_vertices:
+        if start_vertex not in visited:
+            queue.append(start_vertex)
+            visited.add(start_vertex)
     
     while queue:
         vertices_at_level = len(queue)
@@ -135,5 +543,15 @@ if __name__ == "__main__":
     print("\nVisualizing BFS traversal:")
     visualize_bfs(g, 0)
 
+    # Visualize BFS from several sources
+    print("\nVisualizing multi-source BFS traversal:")
+    visualize_multi_source_bfs(g, [0, 5])
+
+    test_bfs_direction_optimizing()
+    test_multi_source_bfs()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    benchmark_bfs(n)
+    benchmark_ms_bfs()
+
 
 
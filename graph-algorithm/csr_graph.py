@@ -0,0 +1,509 @@
+"""
+Compressed Sparse Row Graph
+
+An immutable graph stored as three flat arrays instead of a dict per
+vertex:
+
+- offsets: num_vertices + 1 integers; the arcs leaving vertex u are the
+  positions offsets[u] to offsets[u + 1] - 1 of the arrays below
+- targets: the head of every arc, grouped by tail
+- weights: the weight of every arc, or None for an unweighted graph
+
+Vertices are the ids 0 to num_vertices - 1. Graphs built from a dict with
+other keys (strings, or integers that are not 0..n-1) keep the original
+keys as labels, and the algorithms that accept a CSRGraph take and return
+labels, so they answer in the same form as for the dict.
+
+An arc costs 4 bytes in targets (8 above 2^31 vertices) plus 8 in weights,
+against roughly 40-140 bytes for a list slot, dict entry or tuple holding
+a boxed int.
+
+CSRGraph.from_graph converts every graph form in this repository:
+
+- Graph in graph-algorithm/breadth_first_search.py, graph-algorithm/
+  depth_first_search.py and search-algorithms/breadth_first_search.py
+  (adjacency lists in a .graph dict); the depth_first_search Graph can
+  also wrap a CSRGraph without copying it, with Graph.from_csr
+- Graph in dynamic-programming/bellman_ford_algorithm.py (an edge list)
+- the dict of dicts of weights taken by dijkstra and prims_algorithm
+
+Code written against a .graph dict of lists or get_neighbors() also runs
+unchanged on a CSRGraph through its read-only .graph view.
+"""
+
+import array
+import random
+import sys
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Mapping
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class CSRGraph:
+    """
+    Immutable directed graph in compressed sparse row form.
+
+    Undirected graphs are stored with one arc in each direction, as the
+    dict-based Graph classes store them.
+
+    Attributes:
+        offsets (array.array): Start of every vertex's arcs, plus the total
+        targets (array.array): Head of every arc
+        weights (array.array): Weight of every arc, or None
+        labels (list): Original vertex keys by id, or None if they are the ids
+        undirected (bool): Every arc is known to have a reverse twin, as in
+            graphs built with from_edges(undirected=True); False when unknown
+    """
+
+    def __init__(self, offsets, targets, weights=None, labels=None, undirected=False):
+        """
+        Wraps prebuilt arrays. Use the from_* builders to convert a graph.
+
+        Raises:
+            ValueError: If the arrays do not describe a graph
+        """
+        if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(targets):
+            raise ValueError("offsets must start at 0 and end at len(targets)")
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError("weights and targets must have the same length")
+        if labels is not None and len(labels) != len(offsets) - 1:
+            raise ValueError("there must be one label per vertex")
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.labels = labels
+        self.undirected = undirected
+        self._index = None if labels is None else {label: i for i, label in enumerate(labels)}
+
+    @classmethod
+    def from_edges(cls, edges, num_vertices=None, undirected=False, labels=None):
+        """
+        Builds a graph from (u, v) or (u, v, weight) tuples over vertex ids.
+
+        Args:
+            edges: Iterable of edges
+            num_vertices (int, optional): Defaults to the largest id plus one
+            undirected (bool): Store every edge in both directions
+            labels (list, optional): Vertex keys by id
+
+        Returns:
+            CSRGraph: The graph, with the arcs of each vertex in input order
+        """
+        sources, heads = array.array("q"), array.array("q")
+        weights = None
+        for edge in edges:
+            sources.append(edge[0])
+            heads.append(edge[1])
+            if len(edge) > 2:
+                if weights is None:
+                    weights = array.array("q")
+                try:
+                    weights.append(edge[2])
+                except TypeError:
+                    # The first non-integer weight switches to float64
+                    weights = array.array("d", weights)
+                    weights.append(edge[2])
+        if weights is not None and len(weights) != len(sources):
+            raise ValueError("either every edge or no edge must have a weight")
+        if undirected:
+            sources, heads = sources + heads, heads + sources
+            weights = None if weights is None else weights + weights
+
+        if num_vertices is None:
+            num_vertices = max(max(sources, default=-1), max(heads, default=-1)) + 1
+        return cls._from_arcs(num_vertices, sources, heads, weights, labels, undirected)
+
+    @classmethod
+    def _from_arcs(cls, n, sources, heads, weights, labels, undirected=False):
+        """
+        Groups arcs by tail with a stable counting sort.
+        """
+        m = len(sources)
+        weights = _weight_array(weights)
+        if np is not None and m:
+            tails = np.frombuffer(sources, dtype=np.int64)
+            order = np.argsort(tails, kind="stable")
+            counts = np.bincount(tails, minlength=n)
+            offsets = array.array("q", [0])
+            offsets.frombytes(np.cumsum(counts, dtype=np.int64).tobytes())
+            targets = array.array(_id_typecode(n))
+            targets.frombytes(np.frombuffer(heads, dtype=np.int64)[order].astype(targets.typecode).tobytes())
+            if weights is not None:
+                weights = array.array(weights.typecode,
+                                      np.frombuffer(weights, dtype=weights.typecode)[order].tobytes())
+            return cls(offsets, targets, weights, labels, undirected)
+
+        offsets = array.array("q", bytes(8 * (n + 1)))
+        for u in sources:
+            offsets[u + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+
+        position = offsets[:-1]
+        targets = array.array(_id_typecode(n), bytes(array.array(_id_typecode(n)).itemsize * m))
+        sorted_weights = None if weights is None else array.array(weights.typecode, bytes(weights.itemsize * m))
+        for arc, (u, v) in enumerate(zip(sources, heads)):
+            p = position[u]
+            position[u] = p + 1
+            targets[p] = v
+            if sorted_weights is not None:
+                sorted_weights[p] = weights[arc]
+        return cls(offsets, targets, sorted_weights, labels, undirected)
+
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        """
+        Builds a graph from a dict mapping every vertex to a list of
+        neighbors, or to a dict of neighbor -> weight.
+
+        Vertices that only appear as neighbors are added after the keys.
+        If the vertices are exactly the integers 0..n-1 they become the
+        ids; otherwise they are kept as labels, numbered in dict order.
+
+        Args:
+            adjacency (Mapping): The adjacency dict
+
+        Returns:
+            CSRGraph: The graph, with the arcs of each vertex in dict order
+
+        Raises:
+            ValueError: If some vertices map to lists and others to dicts
+        """
+        labels = list(adjacency)
+        index = {label: i for i, label in enumerate(labels)}
+        # Empty neighbor collections fit either form
+        kinds = {isinstance(neighbors, Mapping) for neighbors in adjacency.values() if neighbors}
+        if len(kinds) > 1:
+            raise ValueError("neighbors must be all lists or all dicts of weights, not a mix")
+        weighted = True in kinds
+        for neighbors in adjacency.values():
+            for v in neighbors:
+                if v not in index:
+                    index[v] = len(labels)
+                    labels.append(v)
+
+        n = len(labels)
+        if all(type(label) is int and 0 <= label < n for label in labels):
+            labels = None
+            order = range(n)
+        else:
+            order = labels
+
+        offsets = array.array("q", [0])
+        targets = array.array(_id_typecode(n))
+        weights = [] if weighted else None
+        for label in order:
+            neighbors = adjacency.get(label, ())
+            if labels is None:
+                targets.extend(neighbors)
+            else:
+                targets.extend(index[v] for v in neighbors)
+            if weighted and neighbors:
+                weights.extend(neighbors.values())
+            offsets.append(len(targets))
+        return cls(offsets, targets, _weight_array(weights), labels)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Converts any graph form used in this repository.
+
+        Args:
+            graph: A CSRGraph; an object with a .graph adjacency dict,
+                whose vertex ids stay 0..vertices-1 when it also has an
+                int .vertices, isolated vertices included; an object with
+                .vertices and an .edges list of (u, v, weight); or an
+                adjacency dict of lists or of dicts
+
+        Returns:
+            CSRGraph: The converted graph (graph itself if already a CSRGraph)
+
+        Raises:
+            TypeError: If the graph form is not recognized
+        """
+        if isinstance(graph, CSRGraph):
+            return graph
+        if isinstance(getattr(graph, "csr", None), CSRGraph):
+            return graph.csr
+        adjacency = getattr(graph, "graph", None)
+        if isinstance(adjacency, Mapping):
+            vertices = getattr(graph, "vertices", None)
+            if isinstance(vertices, int):
+                # Vertices that never got an edge are missing from a
+                # defaultdict, but must keep their numbers as ids
+                numbered = {v: adjacency.get(v, ()) for v in range(vertices)}
+                numbered.update((u, neighbors) for u, neighbors in adjacency.items() if u not in numbered)
+                adjacency = numbered
+            return cls.from_adjacency(adjacency)
+        if isinstance(getattr(graph, "edges", None), list) and isinstance(getattr(graph, "vertices", None), int):
+            return cls.from_edges(graph.edges, graph.vertices)
+        if isinstance(graph, Mapping):
+            return cls.from_adjacency(graph)
+        raise TypeError(f"cannot convert {type(graph).__name__} to a CSRGraph")
+
+    @property
+    def num_vertices(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        """Number of arcs; an undirected edge counts twice."""
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        """Bytes used by the offsets, targets and weights arrays."""
+        arrays = [self.offsets, self.targets] + ([self.weights] if self.weights is not None else [])
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def vertex(self, label):
+        """Returns the id of a vertex given by its label (or id, if unlabeled)."""
+        if self._index is None:
+            if not 0 <= label < self.num_vertices:
+                raise KeyError(label)
+            return label
+        return self._index[label]
+
+    def label(self, v):
+        """Returns the label of vertex id v."""
+        return v if self.labels is None else self.labels[v]
+
+    def neighbors(self, v):
+        """Returns the ids of the heads of v's arcs, as an array slice."""
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def arc_weights(self, v):
+        """Returns the weights of v's arcs, in the order of neighbors(v)."""
+        return self.weights[self.offsets[v]:self.offsets[v + 1]]
+
+    def degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def reverse(self):
+        """
+        Returns the graph with every arc reversed, in O(V + E).
+        """
+        n = self.num_vertices
+        offsets = self.offsets
+        tails = array.array("q")
+        for u, (start, end) in enumerate(zip(offsets, offsets[1:])):
+            tails.extend(repeat(u, end - start))
+        return self._from_arcs(n, array.array("q", self.targets), tails,
+                               None if self.weights is None else self.weights, self.labels, self.undirected)
+
+    def to_numpy(self):
+        """
+        Returns (offsets, targets, weights) as NumPy arrays sharing this
+        graph's memory; weights is None for an unweighted graph.
+        """
+        if np is None:
+            raise ImportError("to_numpy requires NumPy")
+        arrays = [self.offsets, self.targets, self.weights]
+        return tuple(None if a is None else np.frombuffer(a, dtype=a.typecode) for a in arrays)
+
+    @property
+    def graph(self):
+        """
+        Read-only adjacency view mapping each vertex label to its neighbors,
+        so code written against a Graph's .graph dict of lists runs on a
+        CSRGraph.
+        """
+        return _AdjacencyView(self)
+
+    def get_neighbors(self, vertex):
+        """Returns the neighbors of a vertex label, like Graph.get_neighbors."""
+        return self.graph.get(vertex, [])
+
+    def __repr__(self):
+        weighted = "weighted" if self.weights is not None else "unweighted"
+        return f"CSRGraph({self.num_vertices} vertices, {self.num_edges} arcs, {weighted})"
+
+class _AdjacencyView(Mapping):
+    """Maps vertex labels to neighbor labels (an array slice for unlabeled graphs)."""
+
+    def __init__(self, csr):
+        self._csr = csr
+
+    def __getitem__(self, label):
+        csr = self._csr
+        neighbors = csr.neighbors(csr.vertex(label))
+        if csr.labels is None:
+            return neighbors
+        return [csr.labels[v] for v in neighbors]
+
+    def __contains__(self, label):
+        try:
+            self._csr.vertex(label)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self):
+        csr = self._csr
+        return iter(range(csr.num_vertices) if csr.labels is None else csr.labels)
+
+    def __len__(self):
+        return self._csr.num_vertices
+
+def _id_typecode(n):
+    """Smallest array typecode holding vertex ids below n."""
+    return "i" if n < 2 ** 31 else "q"
+
+def _weight_array(weights):
+    """Stores a list of weights as int64 if they are all ints, float64 otherwise."""
+    if weights is None or isinstance(weights, array.array):
+        return weights
+    typecode = "q" if all(type(w) is int for w in weights) else "d"
+    return array.array(typecode, weights)
+
+def test_csr_graph():
+    """
+    Converts every graph form in the repository and checks that BFS, DFS,
+    Dijkstra, Prim and Bellman-Ford give the same answers on the CSRGraph.
+    """
+    import os
+    here = os.path.dirname(os.path.abspath(__file__))
+    for directory in ("dynamic-programming", "greedy"):
+        sys.path.append(os.path.join(here, "..", directory))
+    import breadth_first_search as bfs_module
+    import depth_first_search as dfs_module
+    from bellman_ford_algorithm import Graph as EdgeListGraph, bellman_ford
+    from dijkstras_algo import dijkstra
+    from prims_algo import prims_algorithm, total_mst_weight
+    # The algorithms check isinstance against the imported module's class,
+    # which is a different class from this one when run as a script
+    from csr_graph import CSRGraph
+
+    rng = random.Random(7)
+    pairs = [(rng.randrange(60), rng.randrange(60)) for _ in range(200)]
+
+    g = bfs_module.Graph()
+    for u, v in pairs:
+        g.add_edge(u, v)
+    csr = CSRGraph.from_graph(g)
+    assert csr.num_edges == 2 * len(pairs)
+    for start in list(g.graph)[:10]:
+        assert bfs_module.bfs(csr, start) == bfs_module.bfs(g, start)
+
+    d = dfs_module.Graph(60)
+    for u, v in pairs:
+        d.add_edge(u, v)
+    csr = CSRGraph.from_graph(d)
+    assert csr.labels is None and csr.num_vertices == 60
+
+    # Isolated vertices keep their numbers, here vertex 0 and the last two
+    sparse = dfs_module.Graph(6)
+    sparse.add_edge(1, 2)
+    sparse.add_edge(3, 1)
+    converted = CSRGraph.from_graph(sparse)
+    assert converted.labels is None and converted.num_vertices == 6
+    assert list(converted.neighbors(3)) == [1] and converted.degree(0) == 0
+    assert CSRGraph.from_graph(dfs_module.Graph.from_csr(converted)) is converted
+    wrapped = dfs_module.Graph.from_csr(csr)
+    assert wrapped.dfs_recursive(pairs[0][0]) == d.dfs_recursive(pairs[0][0])
+    assert wrapped.dfs_iterative(pairs[0][0]) == d.dfs_iterative(pairs[0][0])
+    assert wrapped.dfs_find_path(pairs[0][0], pairs[-1][1]) == d.dfs_find_path(pairs[0][0], pairs[-1][1])
+
+    weighted = {}
+    for u, v in pairs:
+        if u != v:
+            w = rng.randint(1, 20)
+            weighted.setdefault(f"v{u}", {})[f"v{v}"] = w
+            weighted.setdefault(f"v{v}", {})[f"v{u}"] = w
+    csr = CSRGraph.from_graph(weighted)
+    assert csr.labels is not None and csr.weights.typecode == "q"
+    start = next(iter(weighted))
+    # Ties may pick different predecessors and tree edges, so compare
+    # distances and total weights
+    assert dijkstra(csr, start)[0] == dijkstra(weighted, start)[0]
+    mst = prims_algorithm(csr)
+    assert len(mst) == len(prims_algorithm(weighted))
+    assert total_mst_weight(mst) == total_mst_weight(prims_algorithm(weighted))
+
+    # Negative weights only on arcs from lower to higher ids, so no negative cycles
+    e = EdgeListGraph(30)
+    for u, v in pairs:
+        if u % 30 < v % 30:
+            e.add_edge(u % 30, v % 30, rng.uniform(-5, 20))
+    csr = CSRGraph.from_graph(e)
+    assert csr.weights.typecode == "d"
+    assert bellman_ford(csr, 0)[0] == bellman_ford(e, 0)[0]
+
+    try:
+        CSRGraph.from_adjacency({"a": ["b"], "b": {"a": 1}})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("mixed list and dict neighbors were accepted")
+    sink = CSRGraph.from_adjacency({"a": {"b": 2}, "b": {}, "c": {"d": 3}})
+    assert list(sink.weights) == [2, 3] and sink.num_vertices == 4
+
+    reverse = CSRGraph.from_edges([(0, 1, 5), (0, 2, 6), (2, 1, 7)]).reverse()
+    assert list(reverse.neighbors(1)) == [0, 2] and list(reverse.arc_weights(1)) == [5, 7]
+    assert CSRGraph.from_edges([(0, 1)], undirected=True).graph == {0: array.array("i", [1]), 1: array.array("i", [0])}
+    print("All CSRGraph tests passed")
+
+def _traced_bytes(build):
+    """
+    Returns (result, bytes still allocated, peak bytes) for calling build().
+    """
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+def benchmark_csr_memory(n=100_000, m=1_000_000):
+    """
+    Reports memory per edge of every graph form for the same random
+    weighted directed graph with n vertices and m edges. Each form is
+    built from a fresh generator, so every form pays for its own vertex
+    id and weight objects.
+    """
+    def edges():
+        rng = random.Random(1)
+        for _ in range(m):
+            yield rng.randrange(n), rng.randrange(n), rng.randrange(1, 1000)
+
+    def dict_of_lists():
+        graph = {}
+        for u, v, _ in edges():
+            graph.setdefault(u, []).append(v)
+        return graph
+
+    def default_dict():
+        graph = defaultdict(list)
+        for u, v, _ in edges():
+            graph[u].append(v)
+        return graph
+
+    def dict_of_dicts():
+        graph = {}
+        for u, v, w in edges():
+            graph.setdefault(u, {})[v] = w
+        return graph
+
+    forms = [
+        ("dict of lists (BFS Graph)", dict_of_lists),
+        ("defaultdict (DFS Graph)", default_dict),
+        ("dict of dicts (dijkstra, prim)", dict_of_dicts),
+        ("edge list (Bellman-Ford Graph)", lambda: list(edges())),
+        ("CSRGraph, unweighted", lambda: CSRGraph.from_edges((u, v) for u, v, _ in edges())),
+        ("CSRGraph, weighted", lambda: CSRGraph.from_edges(edges())),
+    ]
+    print(f"Memory of a graph with {n} vertices and {m} edges, NumPy "
+          f"{'available' if np is not None else 'not installed'}:")
+    for name, build in forms:
+        graph, current, peak = _traced_bytes(build)
+        print(f"  {name:<32} {current / m:7.1f} bytes/edge  (peak while building {peak / m:6.1f})")
+        del graph
+
+if __name__ == "__main__":
+    test_csr_graph()
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_csr_memory(max(1, m // 10), m)
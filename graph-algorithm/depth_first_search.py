@@ -8,6 +8,7 @@ class Graph:
     Attributes:
         vertices (int): Number of vertices in the graph
         graph (Dict[int, List[int]]): Adjacency list representation of the graph
+        csr (CSRGraph): The wrapped CSRGraph for graphs made by from_csr, else None
     """
     
     def __init__(self, vertices: int):
@@ -19,6 +20,27 @@ class Graph:
         """
         self.vertices = vertices
         self.graph = defaultdict(list)
+        self.csr = None
+
+    @classmethod
+    def from_csr(cls, csr) -> "Graph":
+        """
+        Wrap a CSRGraph (graph-algorithm/csr_graph.py) without copying it.
+        
+        The DFS methods read the arcs through the CSRGraph's read-only
+        adjacency view, so they take and return its vertex labels. The
+        wrapped graph is immutable: add_edge raises TypeError.
+        
+        Args:
+            csr (CSRGraph): The graph to wrap
+        
+        Returns:
+            Graph: A graph over the same vertices and arcs
+        """
+        g = cls(csr.num_vertices)
+        g.graph = csr.graph
+        g.csr = csr
+        return g
 
     def add_edge(self, u: int, v: int) -> None:
         """
@@ -27,12 +49,23 @@ class Graph:
         Args:
             u (int): Source vertex
             v (int): Destination vertex
+        
+        Raises:
+            TypeError: If the graph wraps a CSRGraph
         """
+        if self.csr is not None:
+            raise TypeError("a graph made by from_csr is immutable")
         self.graph[u].append(v)
 
     def dfs_recursive(self, start: int, visited: Optional[Set[int]] = None) -> List[int]:
         """
-        Perform Depth First Search starting from given vertex using recursion.
+        Perform Depth First Search starting from given vertex, in the order
+        of the recursive definition.
+        
+        The recursion is kept on an explicit stack of neighbor iterators,
+        one per vertex on the current path, so long paths do not hit
+        Python's recursion limit, and the result is built in one list
+        instead of being copied up through every level.
         
         Args:
             start (int): Starting vertex for DFS
@@ -45,20 +78,26 @@ class Graph:
         if visited is None:
             visited = set()
             
-        result = []
-        
         # Mark current node as visited and add to result
         visited.add(start)
-        result.append(start)
+        result = [start]
+        stack = [iter(self.graph[start])]
         
-        # Recur for all adjacent vertices
-        for neighbour in self.graph[start]:
-            if neighbour not in visited:
-                result.extend(self.dfs_recursive(neighbour, visited))
+        while stack:
+            # Descend into the first unvisited neighbour of the deepest vertex
+            for neighbour in stack[-1]:
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    result.append(neighbour)
+                    stack.append(iter(self.graph[neighbour]))
+                    break
+            else:
+                # All neighbours done: return to the parent
+                stack.pop()
                 
         return result
 
-def dfs_iterative(self, start: int) -> List[int]:
+    def dfs_iterative(self, start: int) -> List[int]:
         """
         Perform Depth First Search starting from given vertex using iteration.
         
@@ -87,38 +126,40 @@ def dfs_iterative(self, start: int) -> List[int]:
         
         return result
 
-def dfs_find_path(self, start: int, end: int) -> Optional[List[int]]:
-    """
-    Find a path between start and end vertices using DFS.
-    
-    Args:
-        start (int): Starting vertex
-        end (int): Target vertex
-    
-    Returns:
-        Optional[List[int]]: Path from start to end if exists, None otherwise
-    """
-    visited = set()
-    path = []
-    
-    def dfs_path_helper(current: int) -> bool:
-        visited.add(current)
-        path.append(current)
+    def dfs_find_path(self, start: int, end: int) -> Optional[List[int]]:
+        """
+        Find a path between start and end vertices using DFS.
         
-        if current == end:
-            return True
-            
-        for neighbor in self.graph[current]:
-            if neighbor not in visited:
-                if dfs_path_helper(neighbor):
-                    return True
+        The path is the explicit stack: it holds the vertices from start
+        to the current vertex, next to an iterator over the neighbors
+        each of them has left to try.
         
-        path.pop()
-        return False
-    
-    if dfs_path_helper(start):
-        return path
-    return None
+        Args:
+            start (int): Starting vertex
+            end (int): Target vertex
+        
+        Returns:
+            Optional[List[int]]: Path from start to end if exists, None otherwise
+        """
+        visited = {start}
+        path = [start]
+        neighbors = [iter(self.graph[start])]
+        
+        while path:
+            if path[-1] == end:
+                return path
+            for neighbor in neighbors[-1]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    path.append(neighbor)
+                    neighbors.append(iter(self.graph[neighbor]))
+                    break
+            else:
+                # Dead end: backtrack
+                path.pop()
+                neighbors.pop()
+        
+        return None
 
 def test_dfs():
     """
@@ -153,6 +194,15 @@ def test_dfs():
     # Test path finding
     print("Path from 0 to 5:", g.dfs_find_path(0, 5))
     print("Path from 3 to 5:", g.dfs_find_path(3, 5))  # No path exists
+    
+    # A path far longer than the recursion limit
+    n = 100_000
+    long_path = Graph(n)
+    for v in range(n - 1):
+        long_path.add_edge(v, v + 1)
+    assert long_path.dfs_recursive(0) == list(range(n))
+    assert long_path.dfs_find_path(0, n - 1) == list(range(n))
+    print(f"DFS on a path of {n} vertices: ok")
 
 # Run the test
 if __name__ == "__main__":
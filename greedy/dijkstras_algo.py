@@ -6,14 +6,21 @@
 #   - Guarantees optimal path calculation
     
 import heapq # represents a priority queue
-from typing import Dict, List, Tuple
+import os
+import sys
+from typing import Dict, List, Tuple, Union
 
-def dijkstra(graph: Dict[str, Dict[str, int]], start: str) -> Tuple[Dict[str, int], Dict[str, str]]:
+# CSRGraph lives in the sibling graph-algorithm directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "graph-algorithm"))
+from csr_graph import CSRGraph  # noqa: E402
+
+def dijkstra(graph: Union[Dict[str, Dict[str, int]], CSRGraph], start: str) -> Tuple[Dict[str, int], Dict[str, str]]:
     """
     Implements Djikstra's shortest path algorithm
 
     Parameters:
-    graph (Dict): Adjacency list representing the graph
+    graph (Dict or CSRGraph): Adjacency list representing the graph, or a
+        weighted CSRGraph whose vertex labels stand in for the node names
     start (str): Starting node
 
     Returns:
@@ -22,6 +29,9 @@ def dijkstra(graph: Dict[str, Dict[str, int]], start: str) -> Tuple[Dict[str, in
     Time Complexity: O((V +E ) log V)
     Space Complexity: O(V)
     """
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, start)
+
     # Initialize distances and previous nodes
     distances = {node: float('inf') for node in graph}
     distances[start] = 0
@@ -42,12 +52,43 @@ def dijkstra(graph: Dict[str, Dict[str, int]], start: str) -> Tuple[Dict[str, in
             distance = current_distance + weight
 
             # Update if a shorter path is found
-            if distance < distance[neighbor]:
-                distance[neighbor] = distance
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current_node
+                heapq.heappush(pq, (distance, neighbor))
+
+    return distances, previous
+
+def _dijkstra_csr(graph: CSRGraph, start: str) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """
+    dijkstra over a CSRGraph, on vertex ids, returning dicts keyed by label
+    """
+    if graph.weights is None:
+        raise ValueError("dijkstra needs a weighted graph")
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = graph.num_vertices
+    source = graph.vertex(start)
+    distances = [float('inf')] * n
+    distances[source] = 0
+    previous = [-1] * n
+
+    pq = [(0, source)]
+    while pq:
+        current_distance, current_node = heapq.heappop(pq)
+        if current_distance > distances[current_node]:
+            continue
+
+        for arc in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[arc]
+            distance = current_distance + weights[arc]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
                 previous[neighbor] = current_node
                 heapq.heappush(pq, (distance, neighbor))
 
-    return distance, previous
+    label = graph.label
+    return ({label(v): distances[v] for v in range(n)},
+            {label(v): None if previous[v] < 0 else label(previous[v]) for v in range(n)})
 
 def reconstruct_path(previous: Dict[str, str], start: str, end: str) -> List[str]:
     """
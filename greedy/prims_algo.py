@@ -5,14 +5,21 @@
 #       - Contains no cycles
 
 import heapq
-from typing import Dict, List, Tuple
+import os
+import sys
+from typing import Dict, List, Tuple, Union
 
-def prims_algorithm(graph: Dict[str, Dict[str, int]]) -> List[Tuple[str, str, int]]:
+# CSRGraph lives in the sibling graph-algorithm directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "graph-algorithm"))
+from csr_graph import CSRGraph  # noqa: E402
+
+def prims_algorithm(graph: Union[Dict[str, Dict[str, int]], CSRGraph]) -> List[Tuple[str, str, int]]:
     """
     Implements Prim's algorithm to find the Minimum Spanning Tree (MST).
     
     Parameters:
-    graph (Dict): Adjacency list representing the weighted, undirected graph
+    graph (Dict or CSRGraph): Adjacency list representing the weighted,
+        undirected graph, or a weighted CSRGraph storing both directions
     
     Returns:
     List of tuples representing edges in the Minimum Spanning Tree
@@ -20,6 +27,9 @@ def prims_algorithm(graph: Dict[str, Dict[str, int]]) -> List[Tuple[str, str, in
     Time Complexity: O(E log V)
     Space Complexity: O(V + E)
     """
+    if isinstance(graph, CSRGraph):
+        return _prims_algorithm_csr(graph)
+
     # If graph is empty, return empty MST
     if not graph:
         return []
@@ -55,6 +65,37 @@ def prims_algorithm(graph: Dict[str, Dict[str, int]]) -> List[Tuple[str, str, in
     
     return mst
 
+def _prims_algorithm_csr(graph: CSRGraph) -> List[Tuple[str, str, int]]:
+    """
+    prims_algorithm over a CSRGraph, starting from vertex id 0 (the first
+    key of the dict it was built from), returning edges by label
+    """
+    if graph.num_vertices == 0:
+        return []
+    if graph.weights is None:
+        raise ValueError("prims_algorithm needs a weighted graph")
+    offsets, targets, weights, label = graph.offsets, graph.targets, graph.weights, graph.label
+
+    visited = bytearray(graph.num_vertices)
+    visited[0] = 1
+    mst = []
+    edges = [(weights[arc], 0, targets[arc]) for arc in range(offsets[0], offsets[1])]
+    heapq.heapify(edges)
+
+    while edges:
+        weight, from_node, to_node = heapq.heappop(edges)
+        if visited[to_node]:
+            continue
+
+        mst.append((label(from_node), label(to_node), weight))
+        visited[to_node] = 1
+
+        for arc in range(offsets[to_node], offsets[to_node + 1]):
+            if not visited[targets[arc]]:
+                heapq.heappush(edges, (weights[arc], to_node, targets[arc]))
+
+    return mst
+
 def total_mst_weight(mst: List[Tuple[str, str, int]]) -> int:
     """
     Calculate the total weight of the Minimum Spanning Tree.
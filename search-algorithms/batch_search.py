@@ -0,0 +1,128 @@
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+
+from binary_search import binary_search
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# NumPy batches at least this large are searched in sorted order
+SORT_QUERIES_MIN = 1 << 14
+
+def search_many(sorted_arr, targets, missing=-1):
+    """
+    Binary search for many targets at once.
+
+    For every target this finds its lower bound (the first index whose
+    element is not less than the target) and upper bound (the first index
+    whose element is greater), and, like binary_search, an index that is
+    `missing` when the target is absent. Found targets report their first
+    occurrence.
+
+    NumPy arrays are searched with np.searchsorted. Large unsorted batches
+    are argsorted first, so consecutive searches walk the table in order
+    and NumPy can narrow each search with the previous result; the results
+    are scattered back to the query order. Other sequences (lists,
+    array.array) are searched with the C bisect functions, one call per
+    target, and a second call only for targets that are present.
+
+    Args:
+        sorted_arr: A sorted list, array.array or 1-D NumPy array
+        targets: The values to look up, in any order
+        missing: Index reported for absent targets, -1 like binary_search
+
+    Returns:
+        tuple: (indices, lower, upper), NumPy arrays if either input is an
+        ndarray, lists otherwise
+
+    Time Complexity:
+        - O(m log n) for m targets in a table of n elements
+        - Plus O(m log m) to sort large NumPy batches
+
+    Space Complexity:
+        - O(m) for the results
+
+    Example:
+        >>> search_many([1, 3, 3, 5], [3, 4, 9])
+        ([1, -1, -1], [1, 3, 4], [3, 3, 4])
+    """
+    if np is not None and (isinstance(sorted_arr, np.ndarray) or isinstance(targets, np.ndarray)):
+        table, queries = np.asarray(sorted_arr), np.asarray(targets)
+        if len(queries) >= SORT_QUERIES_MIN and np.any(queries[1:] < queries[:-1]):
+            order = np.argsort(queries, kind="stable")
+            ordered = queries[order]
+            lower, upper = np.empty_like(order), np.empty_like(order)
+            lower[order] = np.searchsorted(table, ordered, side="left")
+            upper[order] = np.searchsorted(table, ordered, side="right")
+        else:
+            lower = np.searchsorted(table, queries, side="left")
+            upper = np.searchsorted(table, queries, side="right")
+        return np.where(lower < upper, lower, missing), lower, upper
+
+    n = len(sorted_arr)
+    lower = [bisect_left(sorted_arr, t) for t in targets]
+    upper = [bisect_right(sorted_arr, t, lo) if lo < n and sorted_arr[lo] == t else lo
+             for t, lo in zip(targets, lower)]
+    indices = [lo if lo < hi else missing for lo, hi in zip(lower, upper)]
+    return indices, lower, upper
+
+def test_search_many():
+    """
+    Checks search_many against a linear scan, with duplicates and misses.
+    """
+    table = sorted(random.randint(0, 200) for _ in range(300))
+    targets = [random.randint(-10, 210) for _ in range(1000)]
+    indices, lower, upper = search_many(table, targets)
+    for t, i, lo, hi in zip(targets, indices, lower, upper):
+        assert lo == sum(x < t for x in table)
+        assert hi == sum(x <= t for x in table)
+        assert i == (table.index(t) if t in table else -1)
+
+    assert search_many([], [1, 2]) == ([-1, -1], [0, 0], [0, 0])
+    assert search_many(table, [table[0]], missing=None)[0] == [0]
+    assert search_many(table, [-100], missing=None)[0] == [None]
+
+    if np is not None:
+        big_targets = np.random.randint(-10, 210, size=SORT_QUERIES_MIN * 2)
+        result = search_many(np.array(table), big_targets)
+        expected = search_many(table, big_targets.tolist())
+        assert all(r.tolist() == e for r, e in zip(result, expected))
+    print("All search_many tests passed")
+
+def benchmark_search_many(n=1_000_000, m=100_000):
+    """
+    Reports lookups per second of search_many against calling
+    binary_search once per target.
+    """
+    table = sorted(random.sample(range(10 * n), n))
+    targets = [random.randrange(10 * n) for _ in range(m)]
+    print(f"{m} lookups in a table of {n} integers, NumPy "
+          f"{'available' if np is not None else 'not installed'}:")
+
+    start = time.perf_counter()
+    expected = [binary_search(table, t) for t in targets]
+    elapsed = time.perf_counter() - start
+    print(f"  binary_search loop      {m / elapsed / 1e6:6.2f}M lookups/s")
+
+    start = time.perf_counter()
+    indices, _, _ = search_many(table, targets)
+    elapsed = time.perf_counter() - start
+    assert indices == expected
+    print(f"  search_many on lists    {m / elapsed / 1e6:6.2f}M lookups/s")
+
+    if np is not None:
+        np_table, np_targets = np.array(table), np.array(targets)
+        start = time.perf_counter()
+        indices, _, _ = search_many(np_table, np_targets)
+        elapsed = time.perf_counter() - start
+        assert indices.tolist() == expected
+        print(f"  search_many on ndarray  {m / elapsed / 1e6:6.2f}M lookups/s")
+
+if __name__ == "__main__":
+    test_search_many()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_search_many(n)
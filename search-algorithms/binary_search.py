@@ -5,21 +5,21 @@ def binary_search(arr, target):
     Binary search finds the position of a target value within a sorted array.
     It compares the target value to the middle element of the array. If they are not equal,
     the half in which the target cannot lie is eliminated and the search continues
-    on the remaining half, again taking the middle element to compare to the target value,
-    and repeating until the target value is found. If the search ends with the remaining half
-    being empty, the target is not in the array.
+    on the remaining half, again taking the middle element to compare to the target value.
+    When they are equal, the search goes on in the left half to find the first of any
+    duplicates. The search ends when the remaining half is empty.
     
     Args:
         arr (list): A sorted list of elements
         target: The element to find in the array
         
     Returns:
-        int: The index of the target element if found, -1 otherwise
+        int: The index of the first occurrence of the target, -1 if absent
         
     Time Complexity:
-        - Best Case: O(1) when the middle element is the target
+        - Best Case: O(log n), the search always narrows to an empty half
         - Average Case: O(log n)
-        - Worst Case: O(log n) when the target is not in the array or at the ends
+        - Worst Case: O(log n)
         
     Space Complexity:
         - O(1) for iterative implementation
@@ -32,6 +32,7 @@ def binary_search(arr, target):
     """
     # Set initial boundaries for the search
     left, right = 0, len(arr) - 1
+    result = -1
     
     # Continue searching while there are elements to search
     while left <= right:
@@ -40,9 +41,10 @@ def binary_search(arr, target):
         # but Python handles large integers well
         mid = (left + right) // 2
         
-        # Check if the middle element is the target
+        # Found the target; an earlier copy can only be in the left half
         if arr[mid] == target:
-            return mid  # Found the target, return its index
+            result = mid
+            right = mid - 1
         
         # If target is greater, ignore left half
         elif arr[mid] < target:
@@ -52,14 +54,15 @@ def binary_search(arr, target):
         else:
             right = mid - 1
             
-    # If we reach here, the element was not present
-    return -1
+    # Index of the first match, or -1 if the element was not present
+    return result
 
 def binary_search_recursive(arr, target, left=None, right=None):
     """
     Recursive implementation of the binary search algorithm.
     
     This version uses recursion instead of iteration to perform the search.
+    Like binary_search, it returns the first of any duplicates.
     
     Args:
         arr (list): A sorted list of elements
@@ -68,10 +71,10 @@ def binary_search_recursive(arr, target, left=None, right=None):
         right (int, optional): The right boundary of the search. Defaults to len(arr) - 1.
 
     Returns:
-        int: The index of the target element if found, -1 otherwise
+        int: The index of the first occurrence of the target, -1 if absent
         
     Time Complexity:
-        - Best Case: O(1) when the middle element is the target
+        - Best Case: O(log n)
         - Average Case: O(log n)
         - Worst Case: O(log n)
         
@@ -97,9 +100,10 @@ def binary_search_recursive(arr, target, left=None, right=None):
     # Find middle index
     mid = (left + right) // 2
 
-    # Check if the middle element is the target
+    # Found the target; return an earlier copy from the left half if any
     if arr[mid] == target:
-        return mid
+        first = binary_search_recursive(arr, target, left, mid - 1)
+        return mid if first == -1 else first
     
     # If target is greater, search right half
     elif arr[mid] < target:
@@ -109,6 +113,44 @@ def binary_search_recursive(arr, target, left=None, right=None):
     else:
         return binary_search_recursive(arr, target, left, mid - 1)
 
+def binary_search_with_steps(arr, target):
+    """
+    Implementation of binary search with step-by-step visualization.
+    
+    Prints the search boundaries and the middle element at every step.
+    
+    Args:
+        arr (list): A sorted list of elements
+        target: The element to find in the array
+        
+    Returns:
+        int: The index of the first occurrence of the target, -1 if absent
+    """
+    left, right = 0, len(arr) - 1
+    result = -1
+    step = 1
+    
+    while left <= right:
+        mid = (left + right) // 2
+        print(f"Step {step}: left={left}, right={right}, mid={mid}, arr[mid]={arr[mid]}")
+        
+        if arr[mid] == target:
+            # Like binary_search, look for an earlier copy in the left half
+            print(f"Found {target} at index {mid}, checking the left half for an earlier one")
+            result = mid
+            right = mid - 1
+        elif arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+        step += 1
+        
+    if result == -1:
+        print(f"{target} is not in the array")
+    else:
+        print(f"First {target} is at index {result}")
+    return result
+
 def test_binary_search():
     test_cases = [
         # (array, target, expected_index)
@@ -138,15 +180,18 @@ def test_binary_search():
         print("  Test passed!")
         print("-" * 40)
 
-print("Demonstration of Binary Search with step-by-step visualization:")
-example_arr = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-print(f"Original array: {example_arr}")
-print("Searching for 7:")
-binary_search_with_steps(example_arr, 7)
-print("\nSearching for 11:")
-binary_search_with_steps(example_arr, 11)
-print("\n")
+if __name__ == "__main__":
+    print("Demonstration of Binary Search with step-by-step visualization:")
+    example_arr = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    print(f"Original array: {example_arr}")
+    print("Searching for 7:")
+    binary_search_with_steps(example_arr, 7)
+    print("\nSearching for 2 among duplicates:")
+    assert binary_search_with_steps([1, 2, 2, 2, 3], 2) == 1
+    print("\nSearching for 11:")
+    binary_search_with_steps(example_arr, 11)
+    print("\n")
 
-# Run all tests
-print("Running tests for binary search:")
-test_binary_search()
\ No newline at end of file
+    # Run all tests
+    print("Running tests for binary search:")
+    test_binary_search()
\ No newline at end of file
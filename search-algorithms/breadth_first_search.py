@@ -1,3 +1,7 @@
+import os
+import random
+import sys
+import time
 from collections import deque
 """
 Breadth-First Search (BFS) Algorithm Implementation
@@ -34,11 +38,15 @@ class Graph:
         """Initialize an empty graph."""
         self.graph = {}
         self.directed = directed
+        # Incoming edges of every vertex, kept for directed graphs only
+        self.reverse_graph = {} if directed else None
     
     def add_vertex(self, vertex):
         """Add a vertex to the graph."""
         if vertex not in self.graph:
             self.graph[vertex] = []
+            if self.directed:
+                self.reverse_graph[vertex] = []
 
     def add_edge(self, from_vertex, to_vertex):
         """Add an edge between two vertices."""
@@ -52,10 +60,18 @@ class Graph:
         # If undirected, add reverse edge
         if not self.directed:
             self.graph[to_vertex].append(from_vertex)
+        else:
+            self.reverse_graph[to_vertex].append(from_vertex)
 
     def get_neighbors(self, vertex):
         """Get all neighbors of a vertex."""
         return self.graph.get(vertex, [])
+
+    def get_predecessors(self, vertex):
+        """Get all vertices with an edge into vertex."""
+        if not self.directed:
+            return self.get_neighbors(vertex)
+        return self.reverse_graph.get(vertex, [])
     
 def bfs_tree_search(root, target_value):
     if root is None:
@@ -121,7 +137,7 @@ def bfs_graph_search(graph, start_vertex, target_value):
     # Target value not found
     return None
 
-def bfs_shortest_path(graph, start_vertex, target_vertex):
+def bfs_shortest_path(graph, start_vertex, target_vertex, stats=None):
     """
     Find the shortest path between two vertices using BFS.
     
@@ -129,6 +145,8 @@ def bfs_shortest_path(graph, start_vertex, target_vertex):
         graph: Graph object to search in
         start_vertex: The starting vertex
         target_vertex: The target vertex
+        stats (dict, optional): If given, stats["vertices_touched"] is set
+            to the number of vertices the search visited
         
     Returns:
         list: The shortest path as a list of vertices, or None if no path exists
@@ -137,9 +155,13 @@ def bfs_shortest_path(graph, start_vertex, target_vertex):
     Space Complexity: O(V) for the visited set, queue, and parent tracking
     """
     if start_vertex not in graph.graph or target_vertex not in graph.graph:
+        if stats is not None:
+            stats["vertices_touched"] = 0
         return None
     
     if start_vertex == target_vertex:
+        if stats is not None:
+            stats["vertices_touched"] = 1
         return [start_vertex]
     
     # Keep track of visited vertices and their parents
@@ -161,6 +183,8 @@ def bfs_shortest_path(graph, start_vertex, target_vertex):
                 
                 # If we found the target, reconstruct the path
                 if neighbor == target_vertex:
+                    if stats is not None:
+                        stats["vertices_touched"] = len(visited)
                     path = []
                     node = target_vertex
                     while node is not None:
@@ -168,8 +192,124 @@ def bfs_shortest_path(graph, start_vertex, target_vertex):
                         node = parent[node]
                     return path[::-1]  # Reverse to get path from start to target    
     # No path found
+    if stats is not None:
+        stats["vertices_touched"] = len(visited)
     return None
 
+def bfs_shortest_path_bidirectional(graph, start_vertex, target_vertex, stats=None):
+    """
+    Find the shortest path between two vertices using BFS from both ends.
+
+    One search expands forward from the start and another backward from
+    the target, always advancing whichever frontier holds fewer vertices
+    by one full level. The searches stop at the level where they first
+    meet. With branching factor b and a path of length d, each side
+    explores about b^(d/2) vertices instead of b^d for bfs_shortest_path.
+    Graphs are searched backward along incoming edges: get_predecessors
+    where the graph has it, otherwise the reversed graph of a CSRGraph,
+    built once per call. Only graphs known to be undirected (directed is
+    False, or CSRGraph.undirected) are searched backward along their
+    outgoing edges.
+
+    Args:
+        graph: Graph object to search in
+        start_vertex: The starting vertex
+        target_vertex: The target vertex
+        stats (dict, optional): If given, stats["vertices_touched"] is set
+            to the number of vertices both searches visited
+
+    Returns:
+        list: A shortest path as a list of vertices, or None if no path exists
+
+    Raises:
+        TypeError: If the graph may be directed and has no way to list
+            incoming edges
+
+    Time Complexity: O(V + E) worst case, O(b^(d/2)) for branching factor b
+    Space Complexity: O(V) for the parents and frontiers of both searches
+    """
+    if start_vertex not in graph.graph or target_vertex not in graph.graph:
+        if stats is not None:
+            stats["vertices_touched"] = 0
+        return None
+
+    if start_vertex == target_vertex:
+        if stats is not None:
+            stats["vertices_touched"] = 1
+        return [start_vertex]
+
+    predecessors = _predecessor_lookup(graph)
+
+    # Parent (towards the start or target) and depth of every visited vertex
+    forward = {start_vertex: (None, 0)}
+    backward = {target_vertex: (None, 0)}
+    forward_frontier, backward_frontier = [start_vertex], [target_vertex]
+    meeting = None
+
+    while forward_frontier and backward_frontier and meeting is None:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = _expand_level(forward_frontier, forward, backward, graph.get_neighbors)
+        else:
+            backward_frontier, meeting = _expand_level(backward_frontier, backward, forward, predecessors)
+
+    if stats is not None:
+        stats["vertices_touched"] = len(forward) + len(backward)
+    if meeting is None:
+        return None
+
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = forward[node][0]
+    path.reverse()
+    node = backward[meeting][0]
+    while node is not None:
+        path.append(node)
+        node = backward[node][0]
+    return path
+
+def _predecessor_lookup(graph):
+    """
+    Returns a function listing the vertices with an edge into a vertex.
+
+    A graph counts as directed unless it says otherwise, since following
+    outgoing edges backward on a directed graph finds paths that do not
+    exist.
+    """
+    if hasattr(graph, "get_predecessors"):
+        return graph.get_predecessors
+    if getattr(graph, "directed", None) is False or getattr(graph, "undirected", False):
+        return graph.get_neighbors
+    if hasattr(graph, "reverse"):
+        # A CSRGraph: its reverse keeps the labels, so it answers in them too
+        return graph.reverse().get_neighbors
+    raise TypeError(f"cannot find incoming edges of a {type(graph).__name__}; "
+                    "give it get_predecessors or directed = False")
+
+def _expand_level(frontier, parents, other_parents, neighbors):
+    """
+    Expands one full BFS level of a bidirectional search.
+
+    Returns the next frontier and the vertex where the two searches meet
+    on the shortest combined path found in this level, or None. The whole
+    level is expanded because a later vertex of the level can meet the
+    other search closer to its root than the first one did.
+    """
+    next_frontier = []
+    meeting, best = None, None
+    for current in frontier:
+        depth = parents[current][1] + 1
+        for neighbor in neighbors(current):
+            if neighbor not in parents:
+                parents[neighbor] = (current, depth)
+                next_frontier.append(neighbor)
+                if neighbor in other_parents:
+                    length = depth + other_parents[neighbor][1]
+                    if best is None or length < best:
+                        meeting, best = neighbor, length
+    return next_frontier, meeting
+
 def bfs_level_order_with_levels(root):
     """
     Perform BFS traversal and return nodes grouped by levels.
@@ -200,6 +340,98 @@ def bfs_level_order_with_levels(root):
     
     return result
 
+def random_graph(n, degree, directed=False, seed=0):
+    """
+    Builds a random graph on vertices 0..n-1 where every vertex has
+    `degree` out-edges to random vertices.
+    """
+    rng = random.Random(seed)
+    graph = Graph(directed)
+    for u in range(n):
+        graph.add_vertex(u)
+    for u in range(n):
+        for v in rng.sample(range(n), degree):
+            if v != u:
+                graph.add_edge(u, v)
+    return graph
+
+def test_bfs_shortest_path_bidirectional():
+    """
+    Checks that the bidirectional search finds valid paths of the same
+    length as bfs_shortest_path on directed and undirected graphs.
+    """
+    for directed in (False, True):
+        graph = random_graph(300, 2, directed, seed=4)
+        rng = random.Random(4)
+        for _ in range(200):
+            start, target = rng.randrange(300), rng.randrange(300)
+            expected = bfs_shortest_path(graph, start, target)
+            path = bfs_shortest_path_bidirectional(graph, start, target)
+            if expected is None:
+                assert path is None
+                continue
+            assert len(path) == len(expected)
+            assert path[0] == start and path[-1] == target
+            assert all(v in graph.get_neighbors(u) for u, v in zip(path, path[1:]))
+
+    graph = Graph(directed=True)
+    graph.add_edge('A', 'B')
+    graph.add_edge('B', 'C')
+    assert bfs_shortest_path_bidirectional(graph, 'A', 'C') == ['A', 'B', 'C']
+    assert bfs_shortest_path_bidirectional(graph, 'C', 'A') is None
+
+    # A CSRGraph has no directed attribute; it must not count as undirected
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "graph-algorithm"))
+    from csr_graph import CSRGraph
+    csr = CSRGraph.from_edges([(0, 1), (0, 2), (0, 4), (3, 1)])
+    assert bfs_shortest_path(csr, 0, 3) is None
+    assert bfs_shortest_path_bidirectional(csr, 0, 3) is None
+    assert bfs_shortest_path_bidirectional(csr, 3, 1) == [3, 1]
+    undirected = CSRGraph.from_edges([(0, 1), (0, 2), (0, 4), (3, 1)], undirected=True)
+    assert bfs_shortest_path_bidirectional(undirected, 0, 3) == [0, 1, 3]
+
+    class Adjacency:
+        """Outgoing edges only, direction unknown."""
+        graph = {1: [2], 2: []}
+
+        def get_neighbors(self, vertex):
+            return self.graph[vertex]
+
+    try:
+        bfs_shortest_path_bidirectional(Adjacency(), 1, 2)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("a graph without incoming edges was searched backward")
+
+    # Every return path reports the vertices it touched
+    for search in (bfs_shortest_path, bfs_shortest_path_bidirectional):
+        for start, target, touched in (('A', 'A', 1), ('A', 'Z', 0), ('Z', 'A', 0)):
+            stats = {}
+            search(graph, start, target, stats)
+            assert stats == {"vertices_touched": touched}, search.__name__
+    print("All bidirectional BFS tests passed")
+
+def benchmark_bfs_shortest_path(n=200_000, degree=10, queries=100):
+    """
+    Compares time and vertices touched per query of the forward and
+    bidirectional searches on a random graph with a large branching factor.
+    """
+    graph = random_graph(n, degree)
+    rng = random.Random(1)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(queries)]
+    print(f"{queries} shortest-path queries on a random graph with {n} vertices of degree ~{2 * degree}:")
+    for search in (bfs_shortest_path, bfs_shortest_path_bidirectional):
+        touched = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            # A fresh dict per query, so a missing stat fails loudly
+            stats = {}
+            search(graph, source, target, stats)
+            touched += stats["vertices_touched"]
+        elapsed = time.perf_counter() - start
+        print(f"  {search.__name__:<33} {elapsed / queries * 1e3:8.2f}ms  {touched / queries:10.0f} vertices touched")
+
 if __name__ == "__main__":
     print("=== BFS Tree Search Examples ===")
 
@@ -256,5 +488,12 @@ if __name__ == "__main__":
     graph.add_vertex('G')  # Isolated vertex
     no_path = bfs_shortest_path(graph, 'A', 'G')
     print(f"Path from 'A' to isolated 'G': {no_path}")  # None
+
+    path = bfs_shortest_path_bidirectional(graph, 'A', 'F')
+    print(f"Bidirectional shortest path from 'A' to 'F': {path}")
+
+    test_bfs_shortest_path_bidirectional()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    benchmark_bfs_shortest_path(n)
     
     
\ No newline at end of file
@@ -22,10 +22,18 @@ def dfs(graph, start, visited=None):
     # Mark the current node as visited
     visited.add(start)
 
-    # Recursively visit all unvisited neighbors
-    for neighbor in graph.get(start, []):
-        if neighbor not in visited:
-            dfs(graph, neighbor, visited)
+    # Visit unvisited neighbors depth first, keeping one neighbor iterator
+    # per node on the current path instead of one recursive call, so long
+    # paths do not hit the recursion limit
+    stack = [iter(graph.get(start, []))]
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                stack.append(iter(graph.get(neighbor, [])))
+                break
+        else:
+            stack.pop()
 
     return visited
 
@@ -44,3 +52,7 @@ if __name__ == "__main__":
     # Start DFS from node 'A'
     visited_nodes = dfs(graph, 'A')
     print("DFS Traversal Order:", visited_nodes)
+
+    # A chain far longer than the recursion limit
+    chain = {v: [v + 1] for v in range(100_000)}
+    print("Nodes reached along a 100000-node chain:", len(dfs(chain, 0)))
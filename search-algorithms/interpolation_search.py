@@ -0,0 +1,345 @@
+import random
+import sys
+import time
+from bisect import bisect_left
+from numbers import Real
+
+from binary_search import binary_search
+
+# Number of keys choose_search samples to estimate the key distribution
+SAMPLE_SIZE = 64
+# Largest error, as a fraction of the array length, between a sampled key's
+# position and the position a straight line through the first and last keys
+# predicts for it, for the keys to count as uniform
+UNIFORM_MAX_ERROR = 0.05
+
+class ProbeCounter:
+    """
+    Read-only sequence wrapper that counts element accesses.
+
+    Every search in this module takes (arr, target) like binary_search, so
+    probe counts are measured by searching a ProbeCounter instead of the
+    list itself.
+
+    Example:
+        >>> keys = ProbeCounter([1, 3, 5, 7])
+        >>> exponential_search(keys, 5), keys.probes
+        (2, 3)
+    """
+
+    def __init__(self, arr):
+        self.arr = arr
+        self.probes = 0
+
+    def __len__(self):
+        return len(self.arr)
+
+    def __getitem__(self, i):
+        self.probes += 1
+        return self.arr[i]
+
+def _interpolation_lower_bound(arr, target, guarded):
+    """
+    Returns the first index whose element is not less than target, or
+    len(arr) if there is none, probing where a straight line through the
+    current bounds predicts the target.
+
+    If guarded, any probe that fails to halve the remaining range is
+    followed by a midpoint probe.
+    """
+    n = len(arr)
+    if n == 0:
+        return 0
+    hi, a_hi = n - 1, arr[n - 1]
+    if a_hi < target:
+        return n
+    lo, a_lo = 0, arr[0]
+    if not a_lo < target:
+        return 0
+
+    # a_lo < target <= a_hi: the answer lies in (lo, hi]
+    bisect_next = False
+    while hi - lo > 1:
+        width = hi - lo
+        if bisect_next:
+            pos = (lo + hi) // 2
+        else:
+            pos = lo + int((target - a_lo) * (hi - lo) // (a_hi - a_lo))
+            pos = min(max(pos, lo + 1), hi - 1)
+        value = arr[pos]
+        if value < target:
+            lo, a_lo = pos, value
+        else:
+            hi, a_hi = pos, value
+        bisect_next = guarded and not bisect_next and 2 * (hi - lo) > width
+    return hi
+
+def interpolation_search(arr, target):
+    """
+    Implementation of interpolation search.
+
+    Instead of probing the middle of the remaining range, interpolation
+    search probes where the target would be if the keys grew linearly
+    between the two ends of the range. On uniformly distributed keys this
+    needs O(log log n) probes, against log2(n) for binary search. On
+    skewed keys it can need up to n probes; guarded_interpolation_search
+    bounds that.
+
+    Args:
+        arr (list): A sorted list of numbers
+        target: The number to find in the array
+
+    Returns:
+        int: The index of the first occurrence of target if found, -1 otherwise
+
+    Time Complexity:
+        - Average Case: O(log log n) for uniformly distributed keys
+        - Worst Case: O(n)
+
+    Space Complexity:
+        - O(1)
+
+    Example:
+        >>> interpolation_search([10, 20, 30, 40, 50], 40)
+        3
+    """
+    i = _interpolation_lower_bound(arr, target, False)
+    return i if i < len(arr) and arr[i] == target else -1
+
+def guarded_interpolation_search(arr, target):
+    """
+    Interpolation search that falls back to a binary search step whenever
+    an interpolation probe fails to halve the remaining range.
+
+    Args:
+        arr (list): A sorted list of numbers
+        target: The number to find in the array
+
+    Returns:
+        int: The index of the first occurrence of target if found, -1 otherwise
+
+    Time Complexity:
+        - Average Case: O(log log n) for uniformly distributed keys
+        - Worst Case: O(log n), at most about twice the probes of binary search
+    """
+    i = _interpolation_lower_bound(arr, target, True)
+    return i if i < len(arr) and arr[i] == target else -1
+
+def exponential_search(arr, target):
+    """
+    Implementation of exponential (galloping) search.
+
+    Probes indices 1, 2, 4, 8, ... until it passes the target, then binary
+    searches the last doubling. The cost depends on the position i of the
+    target, not on the length of the array, and the length is never asked
+    for: an index past the end (IndexError) counts as larger than any
+    target, so arr can be an unbounded or lazily loaded sequence.
+
+    Args:
+        arr: A sorted sequence supporting arr[i]
+        target: The element to find
+
+    Returns:
+        int: The index of the first occurrence of target if found, -1 otherwise
+
+    Time Complexity:
+        - O(log i) where i is the index of the target
+
+    Space Complexity:
+        - O(1)
+
+    Example:
+        >>> exponential_search([1, 2, 4, 8, 16, 32], 8)
+        3
+    """
+    def probe(i):
+        try:
+            return arr[i]
+        except IndexError:
+            return None
+
+    first = probe(0)
+    if first is None:
+        return -1
+    if not first < target:
+        return 0 if first == target else -1
+
+    # arr[lo] < target, and arr[bound] is past the end or not less than target
+    lo, bound = 0, 1
+    while True:
+        value = probe(bound)
+        if value is None or not value < target:
+            break
+        lo, bound = bound, 2 * bound
+
+    left, right = lo + 1, bound
+    while left < right:
+        mid = (left + right) // 2
+        value = probe(mid)
+        if value is not None and value < target:
+            left = mid + 1
+        else:
+            right = mid
+    value = probe(left)
+    return left if value is not None and value == target else -1
+
+def _binary_search_first(arr, target):
+    """Binary search for the first occurrence of target, -1 if absent."""
+    i = bisect_left(arr, target)
+    return i if i < len(arr) and arr[i] == target else -1
+
+def choose_search(arr, sample_size=SAMPLE_SIZE):
+    """
+    Picks a search for arr from a sample of its keys.
+
+    Samples sample_size evenly spaced keys and compares the position of
+    each against the position linear interpolation between the first and
+    last keys predicts for it. If no prediction is off by more than
+    UNIFORM_MAX_ERROR of the length, the keys are near-uniform and
+    guarded_interpolation_search is returned; otherwise (skewed or
+    non-numeric keys) a binary search for the first occurrence.
+
+    Searching many targets in the same array, call this once and reuse
+    the function it returns, or use auto_searcher.
+
+    Args:
+        arr (list): A sorted list
+        sample_size (int): Number of keys to sample
+
+    Returns:
+        function: A search taking (arr, target)
+
+    Time Complexity: O(sample_size)
+    """
+    n = len(arr)
+    if n < 2 or not isinstance(arr[0], Real) or not arr[0] < arr[n - 1]:
+        return _binary_search_first
+
+    first, last = arr[0], arr[n - 1]
+    step = max(1, (n - 1) // max(1, sample_size - 1))
+    for i in range(0, n, step):
+        predicted = (arr[i] - first) / (last - first) * (n - 1)
+        if abs(predicted - i) > UNIFORM_MAX_ERROR * n:
+            return _binary_search_first
+    return guarded_interpolation_search
+
+def auto_search(arr, target):
+    """
+    Searches arr with the search choose_search picks for it.
+
+    Samples arr on every call, which costs O(SAMPLE_SIZE) per lookup; for
+    many lookups in one array use auto_searcher instead.
+
+    Args:
+        arr (list): A sorted list
+        target: The element to find in the array
+
+    Returns:
+        int: The index of the first occurrence of target if found, -1 otherwise
+    """
+    return choose_search(arr)(arr, target)
+
+def auto_searcher(arr):
+    """
+    Samples arr once and returns a search of it for one target at a time.
+
+    The choice holds for arr as it is now: if arr is changed afterwards,
+    call auto_searcher again.
+
+    Args:
+        arr (list): A sorted list
+
+    Returns:
+        function: Takes a target and returns the index of its first
+        occurrence in arr, -1 if absent
+
+    Example:
+        >>> find = auto_searcher(list(range(0, 100, 5)))
+        >>> find(35), find(36)
+        (7, -1)
+    """
+    search = choose_search(arr)
+    return lambda target: search(arr, target)
+
+def test_interpolation_search():
+    """
+    Checks every search against bisect on uniform, skewed, duplicate-heavy
+    and tiny inputs, and exponential_search on a sequence without len().
+    """
+    cases = [
+        sorted(random.randint(0, 1000) for _ in range(500)),
+        [i ** 3 for i in range(300)],
+        [random.random() for _ in range(200)],
+        [5] * 50,
+        [1],
+        [],
+    ]
+    cases[2].sort()
+    searches = [interpolation_search, guarded_interpolation_search, exponential_search, auto_search]
+    for arr in cases:
+        targets = arr[::7] + [-1, 2, 1001, 0.5, 27_000_000]
+        for target in targets:
+            i = bisect_left(arr, target)
+            expected = i if i < len(arr) and arr[i] == target else -1
+            for search in searches:
+                assert search(arr, target) == expected, f"{search.__name__} failed on {target}"
+
+    class Unbounded:
+        """The even numbers, with no length."""
+        def __getitem__(self, i):
+            return 2 * i
+
+    assert exponential_search(Unbounded(), 123456) == 61728
+    assert exponential_search(Unbounded(), 7) == -1
+
+    assert choose_search(list(range(0, 10_000, 3))) is guarded_interpolation_search
+    assert choose_search([2 ** i for i in range(100)]) is _binary_search_first
+    assert choose_search(["a", "b", "c"]) is _binary_search_first
+
+    # A list changed in place from ints to strings is sampled again
+    arr = list(range(100))
+    assert auto_search(arr, 10) == 10 and auto_searcher(arr)(10) == 10
+    arr[:] = [f"k{i:06d}" for i in range(100)]
+    assert auto_search(arr, "k000010") == 10 and auto_searcher(arr)("k000010") == 10
+    print("All interpolation and exponential search tests passed")
+
+def benchmark_interpolation_search(n=1_000_000, m=10_000):
+    """
+    Reports average probes and time per lookup for each search on
+    near-uniform timestamps, skewed keys and targets near the front.
+    """
+    start_time = 1_700_000_000_000
+    timestamps = sorted(start_time + 1000 * i + random.randint(0, 999) for i in range(n))
+    skewed = sorted(int(1.00002 ** i) + i for i in range(n))
+    scenarios = [
+        ("uniform timestamps", timestamps, random.sample(timestamps, m)),
+        ("skewed keys", skewed, random.sample(skewed, m)),
+        ("targets in the first 1000", timestamps, random.choices(timestamps[:1000], k=m)),
+    ]
+    searches = [binary_search, interpolation_search, guarded_interpolation_search, exponential_search,
+                auto_search]
+    # Each entry binds an array and returns a search taking only the target
+    binders = [(search.__name__, lambda a, search=search: lambda t: search(a, t)) for search in searches]
+    binders.append(("auto_searcher (sampled once)", auto_searcher))
+
+    print(f"{m} lookups in {n} keys, average probes / microseconds per lookup:")
+    for name, arr, targets in scenarios:
+        print(f"  {name} (auto_search picks {choose_search(arr).__name__}):")
+        for label, bind in binders:
+            counter = ProbeCounter(arr)
+            search = bind(counter)
+            for t in targets[:1000]:
+                search(t)
+            probes = counter.probes / min(m, 1000)
+
+            search = bind(arr)
+            start = time.perf_counter()
+            for t in targets:
+                search(t)
+            elapsed = time.perf_counter() - start
+            print(f"    {label:<30} {probes:7.1f} / {elapsed / m * 1e6:6.2f}us")
+
+if __name__ == "__main__":
+    test_interpolation_search()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_interpolation_search(n)
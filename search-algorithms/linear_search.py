@@ -1,3 +1,24 @@
+import array
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Elements (or bytes) scanned per chunk by iter_all_occurrences
+CHUNK_SIZE = 1 << 20
+# Element formats of array.array and memoryview that are scanned as packed integers
+INTEGER_FORMATS = frozenset("bBhHiIlLqQ")
+
 def linear_search(arr: list, target: int) -> int:
     """
     Performs linear search to find the index of a target value in an array.
@@ -35,14 +56,190 @@ def linear_search_all_occurrences(arr: list, target: int) -> list:
     Time Complexity: O(n)
     Space Complexity: O(k) where k is the number of occurrences
     """
-    indices = []
-    
-    # Iterate through the array
-    for i in range(len(arr)):
-        if arr[i] == target:
-            indices.append(i)
-            
-    return indices
+    return list(iter_all_occurrences(arr, target))
+
+def iter_all_occurrences(data, target, chunk_size: int = CHUNK_SIZE) -> Iterator[int]:
+    """
+    Yields the index of every element equal to target, in order, scanning
+    with native primitives instead of a Python loop per element.
+
+    Matches are exactly the indices i where data[i] == target, as in the
+    element-by-element loop; to find runs of bytes or substrings, use
+    iter_pattern_occurrences.
+
+    - bytes, bytearray and mmap objects, whose elements are byte values,
+      are scanned in place with their find method.
+    - Binary files opened for reading are read chunk_size bytes at a time
+      into one reused buffer, and each byte is an element.
+    - Strings are scanned with str.find; only a one-character target can
+      equal one of their elements.
+    - NumPy arrays, and array.array and memoryview when NumPy is
+      installed, are compared chunk_size elements at a time with
+      np.flatnonzero.
+    - Without NumPy, integer array.array and memoryview objects are copied
+      chunk_size elements at a time to bytes and searched for the packed
+      target with bytes.find, keeping only element-aligned matches.
+    - Lists and other sequences with an index method jump from match to
+      match with seq.index(target, start).
+
+    Parameters:
+    data: The buffer, sequence or binary file to scan
+    target: Value to search for
+    chunk_size (int): Elements (or bytes) per chunk
+
+    Returns:
+    Iterator[int]: Indices where target occurs
+
+    Time Complexity: O(n)
+    Space Complexity: O(chunk_size)
+    """
+    if np is not None and isinstance(data, np.ndarray):
+        yield from _iter_ndarray(data.ravel(), target, chunk_size)
+    elif isinstance(data, (bytes, bytearray, mmap.mmap)) or hasattr(data, "readinto"):
+        value = _byte_value(target)
+        if value is None:
+            return    # no byte equals target
+        if hasattr(data, "readinto"):
+            yield from _iter_stream(data.readinto, bytes([value]), chunk_size)
+        else:
+            yield from _iter_find(data, bytes([value]))
+    elif isinstance(data, str):
+        if isinstance(target, str) and len(target) == 1:
+            yield from _iter_find(data, target)
+    elif isinstance(data, (array.array, memoryview)):
+        yield from _iter_typed(memoryview(data), target, chunk_size)
+    else:
+        yield from _iter_index(data, target)
+
+def iter_pattern_occurrences(data, pattern, chunk_size: int = CHUNK_SIZE) -> Iterator[int]:
+    """
+    Yields the start of every (possibly overlapping) match of a pattern,
+    in order.
+
+    - bytes, bytearray and mmap objects are searched for a bytes pattern,
+      and strings for a str pattern, in place with their find method.
+    - Binary files opened for reading are read chunk_size bytes at a time
+      into one reused buffer. Each chunk is prefixed with the last
+      len(pattern) - 1 bytes of the one before it, so a match across a
+      chunk boundary is found exactly once.
+
+    Parameters:
+    data: The buffer, string or binary file to scan
+    pattern: The bytes (or, for a string, str) to look for
+    chunk_size (int): Bytes per chunk when reading a file
+
+    Returns:
+    Iterator[int]: Offsets where pattern starts
+
+    Raises:
+    ValueError: If pattern is empty
+    TypeError: If data is not a byte buffer, string or binary file
+
+    Time Complexity: O(n) on typical data, O(n * m) worst case for a
+    pattern of length m
+    Space Complexity: O(chunk_size + m)
+    """
+    if not pattern:
+        raise ValueError("pattern must not be empty")
+    if isinstance(data, (str, bytes, bytearray, mmap.mmap)):
+        return _iter_find(data, pattern if isinstance(data, str) else bytes(pattern))
+    if hasattr(data, "readinto"):
+        return _iter_stream(data.readinto, bytes(pattern), chunk_size)
+    raise TypeError(f"cannot search {type(data).__name__} for a pattern")
+
+def _byte_value(target):
+    """Returns the byte value equal to target, or None if no byte is."""
+    if isinstance(target, float) and target.is_integer():
+        target = int(target)
+    if isinstance(target, int) and 0 <= target < 256:
+        return int(target)
+    return None
+
+def _iter_find(buffer, pattern: bytes) -> Iterator[int]:
+    """Yields the start of every match of pattern in buffer, using buffer.find."""
+    find = buffer.find
+    position = find(pattern)
+    while position != -1:
+        yield position
+        position = find(pattern, position + 1)
+
+def _iter_index(sequence, target) -> Iterator[int]:
+    """Yields every index of target in sequence, using sequence.index."""
+    index = sequence.index
+    position = -1
+    try:
+        while True:
+            position = index(target, position + 1)
+            yield position
+    except ValueError:
+        return
+
+def _iter_ndarray(values, target, chunk_size: int) -> Iterator[int]:
+    """Yields every index of target in a 1-D ndarray, one chunk at a time."""
+    for start in range(0, len(values), chunk_size):
+        matches = np.flatnonzero(values[start:start + chunk_size] == target)
+        if len(matches):
+            yield from (matches + start).tolist()
+
+def _iter_stream(readinto, pattern: bytes, chunk_size: int, itemsize: int = 1) -> Iterator[int]:
+    """
+    Yields the index of every match of pattern in a stream of bytes that
+    readinto(buffer) fills chunk by chunk, like a file's readinto method.
+
+    Only matches starting at a multiple of itemsize are kept, and are
+    yielded as element indices.
+    """
+    overlap = len(pattern) - 1
+    chunk_size = max(chunk_size, overlap + 1)
+    buffer = bytearray(overlap + chunk_size)
+    view = memoryview(buffer)
+    carried = 0    # bytes kept from the previous chunk
+    offset = 0     # stream offset of buffer[0]
+    while True:
+        read = readinto(view[carried:])
+        if not read:
+            break
+        end = carried + read
+        position = buffer.find(pattern, 0, end)
+        while position != -1:
+            if (offset + position) % itemsize == 0:
+                yield (offset + position) // itemsize
+            position = buffer.find(pattern, position + 1, end)
+        # Keep the tail that could start a match completed by the next chunk
+        carried = min(overlap, end)
+        view[:carried] = view[end - carried:end]
+        offset += end - carried
+
+def _iter_typed(view: memoryview, target, chunk_size: int) -> Iterator[int]:
+    """Yields every index of target in an array.array or memoryview."""
+    if view.ndim == 1 and view.c_contiguous and view.format in INTEGER_FORMATS:
+        if np is not None:
+            yield from _iter_ndarray(np.frombuffer(view, dtype=view.format), target, chunk_size)
+            return
+        if isinstance(target, int):
+            try:
+                pattern = struct.pack(view.format, target)
+            except struct.error:
+                return    # out of range for the element type, so never equal
+        else:
+            pattern = None
+        if pattern is not None:
+            data = view.cast("B")
+            position = 0
+
+            def readinto(out):
+                nonlocal position
+                count = min(len(out), len(data) - position)
+                out[:count] = data[position:position + count]
+                position += count
+                return count
+
+            yield from _iter_stream(readinto, pattern, chunk_size * view.itemsize, view.itemsize)
+            return
+
+    for start in range(0, len(view), chunk_size):
+        chunk = view[start:start + chunk_size].tolist()
+        yield from (start + i for i in _iter_index(chunk, target))
 
 def demonstrate_linear_search():
     """
@@ -80,5 +277,114 @@ def demonstrate_linear_search():
     else:
         print("Not found")
 
+def test_iter_all_occurrences():
+    """
+    Checks iter_all_occurrences against the element-by-element loop on
+    every supported input, including matches across chunk boundaries.
+    """
+    def loop(arr, target):
+        return [i for i in range(len(arr)) if arr[i] == target]
+
+    raw = bytes(random.choice(b"abc") for _ in range(5000))
+    for data in (raw, bytearray(raw), memoryview(raw), list(raw), array.array("B", raw)):
+        for chunk_size in (1, 7, 64, CHUNK_SIZE):
+            assert list(iter_all_occurrences(data, ord("b"), chunk_size)) == loop(raw, ord("b"))
+
+    numbers = [random.randint(0, 9) for _ in range(5000)]
+    for data in (numbers, array.array("i", numbers), array.array("d", numbers), memoryview(array.array("q", numbers))):
+        assert list(iter_all_occurrences(data, 3, 100)) == loop(numbers, 3)
+    if np is not None:
+        assert list(iter_all_occurrences(np.array(numbers), 3, 100)) == loop(numbers, 3)
+    assert linear_search_all_occurrences([4, 2, 7, 1, 7], 7) == [2, 4]
+
+    # Strings and bytes match elements, never substrings
+    text = raw.decode()
+    for data, target in ((text, "ab"), (text, ""), (text, "b"), (raw, b"b"), (raw, b""), (raw, 98.0), (raw, 300)):
+        assert linear_search_all_occurrences(data, target) == loop(data, target)
+
+    # Overlapping patterns, within and across chunks
+    pattern = b"aba"
+    expected = [i for i in range(len(raw)) if raw.startswith(pattern, i)]
+    assert list(iter_pattern_occurrences(raw, pattern)) == expected
+    assert list(iter_pattern_occurrences(text, pattern.decode())) == expected
+    with tempfile.TemporaryFile() as f:
+        f.write(raw)
+        f.flush()
+        for chunk_size in (1, 2, 3, 10, 4096):
+            f.seek(0)
+            assert list(iter_pattern_occurrences(f, pattern, chunk_size)) == expected
+            f.seek(0)
+            assert list(iter_all_occurrences(f, ord("c"), chunk_size)) == loop(raw, ord("c"))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert list(iter_pattern_occurrences(mapped, pattern)) == expected
+
+    for data in (raw, text):
+        try:
+            iter_pattern_occurrences(data, data[:0])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("an empty pattern was accepted")
+    print("All iter_all_occurrences tests passed")
+
+def benchmark_iter_all_occurrences(n=1 << 24):
+    """
+    Compares the scan speed of iter_all_occurrences against the
+    element-by-element loop, and reports the peak memory of scanning a
+    file and a memory map.
+    """
+    def loop(arr, target):
+        indices = []
+        for i in range(len(arr)):
+            if arr[i] == target:
+                indices.append(i)
+        return indices
+
+    data = bytearray(os.urandom(n))
+    target = 0
+    start = time.perf_counter()
+    expected = loop(data, target)
+    baseline = time.perf_counter() - start
+    print(f"Scanning {n} random bytes for {target} ({len(expected)} matches), "
+          f"NumPy {'available' if np is not None else 'not installed'}:")
+    print(f"  element-by-element loop      {n / baseline / 1e6:7.1f}M elements/s")
+
+    values = list(data)
+    inputs = [("bytearray", data), ("list", values), ("array.array('B')", array.array("B", values)),
+              ("array.array('i')", array.array("i", values))]
+    if np is not None:
+        inputs.append(("ndarray", np.frombuffer(data, dtype=np.uint8)))
+    for name, values in inputs:
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_all_occurrences(values, target))
+        elapsed = time.perf_counter() - start
+        assert count == len(expected)
+        print(f"  {name:<28} {n / elapsed / 1e6:7.1f}M elements/s  {baseline / elapsed:6.1f}x")
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(data)
+        f.flush()
+        del data, values, inputs
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for name, source in (("file", f), ("mmap", mapped)):
+                f.seek(0)
+                start = time.perf_counter()
+                count = sum(1 for _ in iter_all_occurrences(source, target))
+                elapsed = time.perf_counter() - start
+                assert count == len(expected)
+
+                # Trace a separate run, tracemalloc would distort the timing
+                f.seek(0)
+                tracemalloc.start()
+                for _ in iter_all_occurrences(source, target):
+                    pass
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"  {name:<28} {n / elapsed / 1e6:7.1f}M elements/s  {baseline / elapsed:6.1f}x  "
+                      f"traced peak {peak / 2**20:.2f} MiB")
+
 if __name__ == "__main__":
-    demonstrate_linear_search()
\ No newline at end of file
+    demonstrate_linear_search()
+    test_iter_all_occurrences()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 24
+    benchmark_iter_all_occurrences(n)
\ No newline at end of file
@@ -0,0 +1,253 @@
+import array
+import mmap
+import os
+import random
+import resource
+import struct
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+
+from binary_search import binary_search
+
+# The fence index holds at most this many keys
+FENCE_MAX_KEYS = 1 << 12
+
+class RecordFile:
+    """
+    Binary search over a file of fixed-width records sorted by an integer key.
+
+    The file is memory-mapped read-only, and keys are decoded straight
+    from the mapping with struct.unpack_from, so opening the file reads
+    nothing but the fence index and a lookup only touches the pages it
+    probes. The mapping is advised for random access, so the kernel does
+    not read ahead around every probe.
+
+    The fence index holds the key of every k-th record in a list. A lookup
+    first bisects the fence in memory, then binary searches the k records
+    between two fence keys in the file: log2(k) probes instead of log2(n),
+    and the top levels of the search, which would otherwise fault in a
+    page each on a cold cache, are never read from the file.
+
+    Attributes:
+        record_size (int): Bytes per record
+        fence_every (int): Records between two fence keys
+    """
+
+    def __init__(self, path, record_size, key_offset=0, key_width=8, byteorder="little",
+                 signed=False, fence_every=None):
+        """
+        Opens and maps a record file.
+
+        Args:
+            path (str): The file to open
+            record_size (int): Bytes per record
+            key_offset (int): Offset of the key within a record
+            key_width (int): Bytes per key
+            byteorder (str): "little" or "big"
+            signed (bool): Whether keys are two's complement
+            fence_every (int, optional): Records between fence keys. Defaults
+                to one fence key per page, or fewer so the fence holds at
+                most FENCE_MAX_KEYS keys
+
+        Raises:
+            ValueError: If the key does not fit in a record, or the file
+                size is not a multiple of record_size
+        """
+        if key_offset < 0 or key_width < 1 or key_offset + key_width > record_size:
+            raise ValueError("the key must lie within the record")
+        self.record_size = record_size
+        self._key_offset = key_offset
+        if key_width in (1, 2, 4, 8):
+            code = {1: "b", 2: "h", 4: "i", 8: "q"}[key_width]
+            code = code if signed else code.upper()
+            self._unpack = struct.Struct(("<" if byteorder == "little" else ">") + code).unpack_from
+        else:
+            self._unpack = None
+        self._key_width, self._byteorder, self._signed = key_width, byteorder, signed
+
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % record_size:
+            self._file.close()
+            raise ValueError(f"file size {size} is not a multiple of the record size {record_size}")
+        self._n = size // record_size
+        if self._n:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self._mm, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+                self._mm.madvise(mmap.MADV_RANDOM)
+            self._view = memoryview(self._mm)
+        else:
+            self._mm = self._view = None
+
+        if fence_every is None:
+            fence_every = max(mmap.PAGESIZE // record_size, -(-self._n // FENCE_MAX_KEYS), 1)
+        self.fence_every = fence_every
+        self._fence = [self.key_at(i) for i in range(0, self._n, fence_every)]
+
+    def __len__(self):
+        return self._n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Releases the mapping and closes the file. Views returned by record()
+        must be released first.
+        """
+        if self._mm is not None:
+            self._view.release()
+            self._mm.close()
+            self._mm = self._view = None
+        self._file.close()
+
+    def key_at(self, i):
+        """
+        Returns the key of record i.
+        """
+        start = i * self.record_size + self._key_offset
+        if self._unpack is not None:
+            return self._unpack(self._mm, start)[0]
+        return int.from_bytes(self._view[start:start + self._key_width], self._byteorder, signed=self._signed)
+
+    def record(self, i):
+        """
+        Returns record i as a memoryview into the mapping, without copying.
+        """
+        if not 0 <= i < self._n:
+            raise IndexError("record index out of range")
+        return self._view[i * self.record_size:(i + 1) * self.record_size]
+
+    def lower_bound(self, target):
+        """
+        Returns the index of the first record whose key is not less than target.
+
+        Time Complexity: O(log n), with O(log k) probes into the file
+        """
+        # Fence key j - 1 is below target and fence key j is not, so the
+        # answer lies in (k * (j - 1), k * j]
+        j = bisect_left(self._fence, target)
+        k = self.fence_every
+        left = k * (j - 1) + 1 if j else 0
+        right = min(k * j, self._n)
+
+        mm, unpack, size, offset = self._mm, self._unpack, self.record_size, self._key_offset
+        key_at = self.key_at
+        while left < right:
+            mid = (left + right) // 2
+            key = unpack(mm, mid * size + offset)[0] if unpack is not None else key_at(mid)
+            if key < target:
+                left = mid + 1
+            else:
+                right = mid
+        return left
+
+    def find(self, target):
+        """
+        Returns the index of the first record with the target key, -1 if there
+        is none, like binary_search.
+
+        Time Complexity: O(log n)
+        """
+        i = self.lower_bound(target)
+        return i if i < self._n and self.key_at(i) == target else -1
+
+def _drop_page_cache(path):
+    """
+    Asks the kernel to evict the file from the page cache. Only clean,
+    unmapped pages are evicted, and tmpfs files cannot be evicted at all.
+    """
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+def test_record_file():
+    """
+    Checks RecordFile against bisect with several key layouts,
+    duplicates, misses and an empty file.
+    """
+    keys = sorted(random.randint(-500, 500) for _ in range(3000))
+    layouts = [
+        # (key_offset, key_width, byteorder, signed, record_size)
+        (0, 8, "little", True, 16),
+        (4, 4, "big", True, 12),
+        (2, 3, "big", True, 7),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for offset, width, byteorder, signed, size in layouts:
+            path = os.path.join(tmp, "records.bin")
+            with open(path, "wb") as f:
+                for key in keys:
+                    record = bytearray(random.randbytes(size))
+                    record[offset:offset + width] = key.to_bytes(width, byteorder, signed=signed)
+                    f.write(record)
+
+            for fence_every in (None, 1, 7, len(keys)):
+                with RecordFile(path, size, offset, width, byteorder, signed, fence_every) as records:
+                    assert len(records) == len(keys)
+                    for target in range(-505, 506, 3):
+                        i = records.find(target)
+                        expected = bisect_left(keys, target)
+                        assert i == (expected if target in keys else -1)
+                        assert records.lower_bound(target) == expected
+                    view = records.record(5)
+                    assert bytes(view[offset:offset + width]) == keys[5].to_bytes(width, byteorder, signed=signed)
+                    view.release()
+
+        empty = os.path.join(tmp, "empty.bin")
+        open(empty, "wb").close()
+        with RecordFile(empty, 16) as records:
+            assert records.find(1) == -1 and records.lower_bound(1) == 0
+    print("All RecordFile tests passed")
+
+def benchmark_record_file(n=2_000_000, m=2000):
+    """
+    Compares startup time against decoding the file into a list, and the
+    lookup time and major page faults of cold and warm lookups with and
+    without the fence index.
+
+    Records are 16 bytes: a little-endian uint64 key and a payload.
+    """
+    with tempfile.TemporaryDirectory(dir=os.path.expanduser("~")) as tmp:
+        path = os.path.join(tmp, "records.bin")
+        keys = sorted(random.sample(range(8 * n), n))
+        records = array.array("Q", bytes(16 * n))
+        records[0::2] = array.array("Q", keys)
+        with open(path, "wb") as f:
+            records.tofile(f)
+        del records
+        targets = [random.choice(keys) if random.random() < 0.5 else random.randrange(8 * n) for _ in range(m)]
+        print(f"{n} records of 16 bytes ({16 * n / 2**20:.0f} MiB), {m} lookups:")
+
+        _drop_page_cache(path)
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            loaded = [key for key, _ in struct.iter_unpack("<QQ", f.read())]
+        print(f"  load into a list         {time.perf_counter() - start:8.3f}s startup")
+        expected = [binary_search(loaded, t) for t in targets]
+        del loaded
+
+        for label, fence_every in (("RecordFile, no fence", n), ("RecordFile, fence index", None)):
+            _drop_page_cache(path)
+            start = time.perf_counter()
+            with RecordFile(path, 16, fence_every=fence_every) as index:
+                startup = time.perf_counter() - start
+                print(f"  {label:<24} {startup:8.3f}s startup, {len(index._fence)} fence keys")
+                for cache in ("cold", "warm"):
+                    faults = resource.getrusage(resource.RUSAGE_SELF).ru_majflt
+                    start = time.perf_counter()
+                    found = [index.find(t) for t in targets]
+                    elapsed = time.perf_counter() - start
+                    faults = resource.getrusage(resource.RUSAGE_SELF).ru_majflt - faults
+                    assert [i != -1 for i in found] == [i != -1 for i in expected]
+                    print(f"    {cache}: {elapsed / m * 1e6:8.1f}us per lookup, {faults / m:5.1f} major faults per lookup")
+
+if __name__ == "__main__":
+    test_record_file()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    benchmark_record_file(n)
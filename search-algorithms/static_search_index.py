@@ -0,0 +1,220 @@
+import array
+import random
+import sys
+import time
+from bisect import bisect_left
+
+from binary_search import binary_search
+
+class StaticSearchIndex:
+    """
+    Read-only search index over a sorted sequence, stored in Eytzinger order.
+
+    The sorted values are rearranged once into the breadth-first order of
+    an implicit complete binary search tree: the root at slot 1 and the
+    children of slot k at 2k and 2k + 1. A search walks down from the root
+    with k = 2k + (tree[k] < target), so the first few levels, visited by
+    every search, share a handful of cache lines, and each step is a
+    comparison and an add instead of a three-way branch.
+
+    Numeric values are kept in a compact array.array (8 bytes per value
+    for "q" or "d") instead of a list of boxed objects, next to a second
+    array mapping every slot back to its position in sorted order.
+
+    Attributes:
+        typecode (str): array typecode of the values, None if they are kept in a list
+    """
+
+    def __init__(self, sorted_values, typecode=None):
+        """
+        Builds the index.
+
+        Args:
+            sorted_values: Values in ascending order
+            typecode (str, optional): array typecode for the values. Defaults
+                to "q" (or "Q" above it) for ints within 64 bits and "d" for
+                floats; other values, including ints beyond 64 bits and
+                ints mixed with floats, are kept in a list
+        """
+        n = len(sorted_values)
+        if typecode is None and n:
+            typecode = _value_typecode(sorted_values)
+
+        self.typecode = typecode
+        self._n = n
+        # Slot 0 is unused, so the children of k are 2k and 2k + 1
+        if typecode is None:
+            self._tree = [None] * (n + 1)
+        else:
+            self._tree = array.array(typecode, bytes(array.array(typecode).itemsize * (n + 1)))
+        self._rank = array.array("q", bytes(8 * (n + 1)))
+        self._fill(sorted_values)
+
+    def _fill(self, sorted_values):
+        """
+        Writes the sorted values into the tree with an in-order walk.
+        """
+        tree, rank, n = self._tree, self._rank, self._n
+        stack = []
+        i, k = 0, 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            tree[k] = sorted_values[i]
+            rank[k] = i
+            i += 1
+            k = 2 * k + 1
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, target):
+        return self.find(target) != -1
+
+    def _descend(self, target, inclusive):
+        """
+        Returns the slot of the first value >= target (> target if
+        inclusive), or 0 if there is none.
+        """
+        tree, n = self._tree, self._n
+        k = 1
+        if inclusive:
+            while k <= n:
+                k = 2 * k + (tree[k] <= target)
+        else:
+            while k <= n:
+                k = 2 * k + (tree[k] < target)
+        # The answer is where the walk last went left: strip the trailing
+        # right turns (ones) and that left turn
+        return k >> ((~k & (k + 1)).bit_length())
+
+    def lower_bound(self, target):
+        """
+        Returns the index in sorted order of the first value not less than target.
+
+        Args:
+            target: The value to look for
+
+        Returns:
+            int: An index between 0 and len(self)
+
+        Time Complexity: O(log n)
+        """
+        k = self._descend(target, False)
+        return self._rank[k] if k else self._n
+
+    def upper_bound(self, target):
+        """
+        Returns the index in sorted order of the first value greater than target.
+
+        Time Complexity: O(log n)
+        """
+        k = self._descend(target, True)
+        return self._rank[k] if k else self._n
+
+    def find(self, target):
+        """
+        Returns the sorted index of the first occurrence of target, -1 if absent,
+        like binary_search.
+
+        Time Complexity: O(log n)
+
+        Example:
+            >>> StaticSearchIndex([1, 3, 3, 5]).find(3)
+            1
+        """
+        k = self._descend(target, False)
+        return self._rank[k] if k and self._tree[k] == target else -1
+
+    def count_range(self, low, high):
+        """
+        Returns how many values v satisfy low <= v <= high.
+
+        Time Complexity: O(log n)
+
+        Example:
+            >>> StaticSearchIndex([1, 3, 3, 5, 8]).count_range(2, 5)
+            3
+        """
+        if high < low:
+            return 0
+        return self.upper_bound(high) - self.lower_bound(low)
+
+def _value_typecode(sorted_values):
+    """
+    Returns the array typecode that holds every value exactly, or None.
+
+    Mixed ints and floats get None: "d" would round ints above 2^53, so
+    an int could no longer be found.
+    """
+    kinds = set(map(type, sorted_values))
+    if kinds == {float}:
+        return "d"
+    if kinds == {int}:
+        low, high = sorted_values[0], sorted_values[-1]
+        if -2**63 <= low and high < 2**63:
+            return "q"
+        if low >= 0 and high < 2**64:
+            return "Q"
+    return None
+
+def test_static_search_index():
+    """
+    Checks StaticSearchIndex against bisect on every size up to 70,
+    with duplicates, misses and non-numeric values.
+    """
+    for n in range(71):
+        values = sorted(random.randint(0, 40) for _ in range(n))
+        index = StaticSearchIndex(values)
+        for target in range(-1, 42):
+            lo = bisect_left(values, target)
+            assert index.lower_bound(target) == lo
+            assert index.upper_bound(target) == lo + values.count(target)
+            assert index.find(target) == (lo if target in values else -1)
+        assert index.count_range(5, 30) == sum(5 <= v <= 30 for v in values)
+
+    # Values no typed array holds exactly stay in a list
+    for values, typecode in (([1, 2**70], None), ([0.5, 2**60, 2**60 + 1], None),
+                             ([0, 2**64 - 1], "Q"), ([-2**63, 5], "q"), ([0.5, 1.5], "d")):
+        index = StaticSearchIndex(values)
+        assert index.typecode == typecode
+        assert [index.find(v) for v in values] == list(range(len(values)))
+
+    words = sorted(["pear", "apple", "fig", "kiwi", "plum"])
+    index = StaticSearchIndex(words)
+    assert index.typecode is None
+    assert index.find("kiwi") == words.index("kiwi") and "grape" not in index
+    print("All StaticSearchIndex tests passed")
+
+def benchmark_static_search_index(max_exponent=22, m=100_000):
+    """
+    Compares lookups per second of StaticSearchIndex.find, binary_search
+    and bisect from L1-sized tables (2^10 values, 8 KiB as int64) to
+    2^max_exponent values, by default 2^22 (32 MiB as int64), larger than
+    a typical L3 cache. The largest size is always included.
+    """
+    print(f"{m} lookups, lookups per second:")
+    print(f"  {'values':>9} {'array size':>10} {'binary_search':>14} {'Eytzinger find':>15} {'bisect (C)':>11}")
+    for exponent in list(range(10, max_exponent, 3)) + [max_exponent]:
+        n = 1 << exponent
+        values = sorted(random.sample(range(4 * n), n))
+        index = StaticSearchIndex(values)
+        targets = [random.randrange(4 * n) for _ in range(m)]
+
+        timings = []
+        for search in (lambda t: binary_search(values, t), index.find, lambda t: bisect_left(values, t)):
+            start = time.perf_counter()
+            for t in targets:
+                search(t)
+            timings.append(time.perf_counter() - start)
+
+        assert [index.find(t) for t in targets[:1000]] == [binary_search(values, t) for t in targets[:1000]]
+        rates = [f"{m / t / 1e6:.2f}M/s" for t in timings]
+        print(f"  {n:>9} {8 * n / 2**20:>8.2f}MB {rates[0]:>14} {rates[1]:>15} {rates[2]:>11}")
+
+if __name__ == "__main__":
+    test_static_search_index()
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    benchmark_static_search_index(max_exponent)
@@ -0,0 +1,398 @@
+"""
+Adaptive Sort Dispatcher
+
+A single sort() entry point that looks at a small sample of its input and
+picks the sort from this repository that suits it best:
+
+    insertion      tiny inputs
+    merge          nearly sorted or reversed inputs, and any input that
+                   must keep ties in order (merge_sort_adaptive, stable)
+    quicksort      unsorted inputs when stability is not required
+                   (quick_sort_in_place)
+    quicksort_3way the same with many duplicate keys (quick_sort_3way)
+    counting       integer keys from a range not much wider than n
+    radix_lsd      other int keys, and float keys when stability is required
+    partial_heap   only the first k elements are wanted (partial_sort, or
+                   top_k in reverse)
+
+Sampling reads SAMPLE_WINDOWS short contiguous windows, to count descents
+between neighbours, and SAMPLE_SIZE evenly spaced elements, to count
+inversions and duplicates and to find the key type and range. Its cost is
+independent of n. The counting and radix sorts only accept some key types,
+so before either is used the type of every key is checked in one pass; if
+the sample was misleading, the strategy is chosen again with the real type.
+Lists mixing ints and floats never go to radix_lsd, which would turn every
+int into a float and round those above 2^53.
+
+Every call leaves a SortDecision in decision_log, holding the profile, the
+chosen strategy, the reason for it and the time spent sampling and sorting.
+"""
+
+import os
+import random
+import sys
+import time
+from bisect import bisect_right, insort
+from collections import deque
+
+from heap_sort import partial_sort, top_k
+from insertion_sort import insertion_sort
+from radix_sort import counting_sort, radix_sort_lsd
+from sort_keys import sort_order
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "divide-and-conquer"))
+from merge_sort import merge_sort_adaptive  # noqa: E402
+from quick_sort import quick_sort_3way, quick_sort_in_place  # noqa: E402
+
+# Evenly spaced elements used for the inversion, duplicate and type estimates
+SAMPLE_SIZE = 256
+
+# Contiguous windows (and their length) used to count descents
+SAMPLE_WINDOWS = 16
+WINDOW_LENGTH = 16
+
+# Inputs up to this size go straight to insertion sort
+INSERTION_SORT_MAX = 32
+
+# Radix and counting sorts only pay off on inputs at least this large
+RADIX_MIN_SIZE = 256
+
+# Descent or inversion ratios below this (or inversions above 1 - this)
+# count as nearly sorted
+PRESORTED_RATIO = 0.05
+
+# Share of duplicate keys in the sample from which three-way partitioning
+# beats two-way (about 1000 distinct keys in 100k elements)
+DUPLICATE_RATIO = 0.1
+
+# Counting sort is used when the key range is at most this many times n
+COUNTING_RANGE_FACTOR = 4
+
+# The partial heap sort is used when k is at most n divided by this
+PARTIAL_SORT_DIVISOR = 8
+
+# Most recent decisions, oldest first
+decision_log = deque(maxlen=256)
+
+class InputProfile:
+    """
+    Estimates taken from a sample of the keys.
+
+    Attributes:
+        size (int): Number of elements
+        key_type (str): "int", "float", "number" (ints and floats mixed),
+            "str", "bytes" or "object"
+        descent_ratio (float): Share of neighbouring pairs that descend,
+            0 for sorted input, about 0.5 for random input
+        estimated_runs (int): Ascending runs the descents imply
+        inversion_ratio (float): Share of sampled pairs out of order,
+            0 sorted, about 0.5 random, 1 reversed
+        duplicate_ratio (float): Share of sampled keys equal to an earlier one
+        key_range (int): max - min of the sampled keys for int keys, else None
+        sample_size (int): Number of keys examined
+    """
+
+    def __init__(self, size, key_type, descent_ratio, inversion_ratio, duplicate_ratio,
+                 key_range, sample_size):
+        self.size = size
+        self.key_type = key_type
+        self.descent_ratio = descent_ratio
+        self.estimated_runs = 1 + round(descent_ratio * max(0, size - 1))
+        self.inversion_ratio = inversion_ratio
+        self.duplicate_ratio = duplicate_ratio
+        self.key_range = key_range
+        self.sample_size = sample_size
+
+    def __repr__(self):
+        return (f"InputProfile(size={self.size}, key_type={self.key_type!r}, "
+                f"runs~{self.estimated_runs}, inversions={self.inversion_ratio:.2f}, "
+                f"duplicates={self.duplicate_ratio:.2f}, key_range={self.key_range})")
+
+class SortDecision:
+    """
+    The strategy sort() chose for one input, and what it cost.
+
+    Attributes:
+        strategy (str): Name of the chosen strategy
+        reason (str): Why it was chosen
+        profile (InputProfile): What sampling found
+        sample_seconds (float): Time spent sampling and deciding
+        sort_seconds (float): Time spent sorting, None until the sort ran
+    """
+
+    def __init__(self, strategy, reason, profile, sample_seconds):
+        self.strategy = strategy
+        self.reason = reason
+        self.profile = profile
+        self.sample_seconds = sample_seconds
+        self.sort_seconds = None
+
+    def __repr__(self):
+        sort_time = "-" if self.sort_seconds is None else f"{self.sort_seconds * 1e3:.2f}ms"
+        return (f"SortDecision({self.strategy!r}, {self.reason!r}, "
+                f"sample {self.sample_seconds * 1e3:.3f}ms, sort {sort_time})")
+
+def _key_type(sample):
+    """Name the common type of the sampled keys."""
+    if all(type(k) is int for k in sample):
+        return "int"
+    if all(type(k) is float for k in sample):
+        return "float"
+    if all(type(k) in (int, float) for k in sample):
+        return "number"
+    for name, kind in (("str", str), ("bytes", bytes)):
+        if all(type(k) is kind for k in sample):
+            return name
+    return "object"
+
+def _count_inversions(sample):
+    """Count pairs i < j with sample[j] < sample[i]."""
+    seen = []
+    inversions = 0
+    for x in sample:
+        inversions += len(seen) - bisect_right(seen, x)
+        insort(seen, x)
+    return inversions
+
+def profile_input(keys):
+    """
+    Estimate presortedness, duplicates, key type and range from a sample.
+
+    Args:
+        keys (list): The keys to be sorted
+
+    Returns:
+        InputProfile: The estimates
+    """
+    n = len(keys)
+
+    # Descents between neighbours inside evenly spaced windows
+    pairs = descents = 0
+    window = min(WINDOW_LENGTH, n)
+    if window > 1:
+        starts = {(n - window) * w // max(1, SAMPLE_WINDOWS - 1) for w in range(SAMPLE_WINDOWS)}
+        for start in starts:
+            for i in range(start, start + window - 1):
+                descents += keys[i + 1] < keys[i]
+            pairs += window - 1
+    descent_ratio = descents / pairs if pairs else 0.0
+
+    m = min(SAMPLE_SIZE, n)
+    sample = [keys[i * n // m] for i in range(m)]
+    key_type = _key_type(sample)
+
+    total_pairs = m * (m - 1) // 2
+    inversion_ratio = _count_inversions(sample) / total_pairs if total_pairs else 0.0
+
+    try:
+        duplicate_ratio = 1 - len(set(sample)) / m if m else 0.0
+    except TypeError:
+        duplicate_ratio = 0.0
+
+    key_range = max(sample) - min(sample) if key_type == "int" and sample else None
+    return InputProfile(n, key_type, descent_ratio, inversion_ratio, duplicate_ratio, key_range, m)
+
+def choose_strategy(profile, k=None, reverse=False, stable=False):
+    """
+    Pick a strategy for a profiled input.
+
+    Args:
+        profile (InputProfile): Result of profile_input
+        k (int, optional): Only the first k elements are wanted
+        reverse (bool): Sort in descending order
+        stable (bool): Equal keys must keep their input order
+
+    Returns:
+        tuple: (strategy, reason)
+    """
+    n = profile.size
+    # top_k keeps ties in input order, partial_sort does not
+    if k is not None and (reverse or not stable) and k <= n // PARTIAL_SORT_DIVISOR:
+        return "partial_heap", f"k={k} is small next to n={n}"
+    if n <= INSERTION_SORT_MAX:
+        return "insertion", f"only {n} elements"
+    if (profile.descent_ratio <= PRESORTED_RATIO or profile.inversion_ratio <= PRESORTED_RATIO
+            or profile.inversion_ratio >= 1 - PRESORTED_RATIO):
+        return "merge", f"nearly sorted or reversed, about {profile.estimated_runs} runs"
+    if n >= RADIX_MIN_SIZE:
+        if profile.key_type == "int" and profile.key_range <= COUNTING_RANGE_FACTOR * n:
+            return "counting", f"int keys within a range of {profile.key_range}"
+        if profile.key_type == "int":
+            return "radix_lsd", "int keys"
+        if profile.key_type == "float" and stable:
+            return "radix_lsd", "float keys, stable order required"
+    if not stable and profile.duplicate_ratio >= DUPLICATE_RATIO:
+        return "quicksort_3way", f"{profile.duplicate_ratio:.0%} of sampled keys are duplicates"
+    if not stable:
+        return "quicksort", "unsorted, few duplicates"
+    return "merge", "stable order required"
+
+def _run_merge(arr, key, reverse):
+    arr = list(arr)
+    merge_sort_adaptive(arr, key=key, reverse=reverse)
+    return arr
+
+def _run_quicksort(arr, key, reverse):
+    return quick_sort_in_place(list(arr), key=key, reverse=reverse)
+
+# Each engine takes (arr, key, reverse) and returns a new sorted list
+_ENGINES = {
+    "insertion": lambda arr, key, reverse: insertion_sort(list(arr), key=key, reverse=reverse),
+    "merge": _run_merge,
+    "quicksort": _run_quicksort,
+    "quicksort_3way": lambda arr, key, reverse: quick_sort_3way(list(arr), key=key, reverse=reverse),
+    "counting": counting_sort,
+    "radix_lsd": radix_sort_lsd,
+}
+
+def _decide(keys, k, reverse, stable):
+    """
+    Profile the keys and choose a strategy for them.
+
+    Returns:
+        SortDecision: The decision, not yet timed for sorting
+    """
+    start = time.perf_counter()
+    profile = profile_input(keys)
+    strategy, reason = choose_strategy(profile, k, reverse, stable)
+    if strategy in ("counting", "radix_lsd"):
+        # The sample only guessed the type; these engines need every key to fit it
+        key_type = _key_type(keys)
+        if key_type != profile.key_type:
+            profile.key_type = key_type
+            profile.key_range = max(keys) - min(keys) if key_type == "int" else None
+            strategy, reason = choose_strategy(profile, k, reverse, stable)
+    return SortDecision(strategy, reason, profile, time.perf_counter() - start)
+
+def explain(data, key=None, k=None, reverse=False, stable=None):
+    """
+    Return the SortDecision sort() would make, without sorting.
+
+    Takes the same arguments as sort(). The key is applied to every element.
+    """
+    if stable is None:
+        stable = key is not None
+    keys = data if key is None else [key(x) for x in data]
+    return _decide(keys, k, reverse, stable)
+
+def sort(data, key=None, reverse=False, k=None, stable=None):
+    """
+    Sort data with the strategy that suits it best.
+
+    The key function, if any, is called exactly once per element: the keys
+    are computed up front, sampled, and the chosen engine sorts positions
+    by them.
+
+    Args:
+        data (Sequence): The elements to sort, left unchanged
+        key (callable, optional): Extracts the sort key
+        reverse (bool): Sort in descending order
+        k (int, optional): Return only the k first elements of the result
+        stable (bool, optional): Require equal keys to keep their input
+            order, which rules out quicksort and the ascending partial heap
+            sort. Defaults to True with a key and False without, since
+            equal elements are then usually interchangeable.
+
+    Returns:
+        list: A new sorted list (of length k when k is given)
+
+    Time Complexity: O(n log n) worst case, O(n) for presorted, counting
+    and radix inputs, O(n log k) for the partial heap sort
+    Space Complexity: O(n)
+
+    Example:
+        >>> sort([5, 3, 9, 1])
+        [1, 3, 5, 9]
+        >>> decision_log[-1].strategy
+        'insertion'
+    """
+    if stable is None:
+        stable = key is not None
+    keys = data if key is None else [key(x) for x in data]
+    decision = _decide(keys, k, reverse, stable)
+    strategy = decision.strategy
+
+    start = time.perf_counter()
+    if strategy == "partial_heap" and reverse:
+        if key is None:
+            result = top_k(data, k)
+        else:
+            result = [data[i] for i in top_k(range(len(data)), k, key=keys.__getitem__)]
+    elif strategy == "partial_heap":
+        if key is None:
+            result = partial_sort(list(data), k)[:k]
+        else:
+            order = sort_order(partial_sort, keys, k, returns="self")
+            result = [data[i] for i in order[:k]]
+    else:
+        engine = _ENGINES[strategy]
+        if key is None:
+            result = engine(data, None, reverse)
+        else:
+            result = [data[i] for i in engine(range(len(data)), keys.__getitem__, reverse)]
+        if k is not None:
+            result = result[:k]
+    decision.sort_seconds = time.perf_counter() - start
+
+    decision_log.append(decision)
+    return result
+
+def benchmark_adaptive_sort(n=100_000):
+    """
+    Runs sort() on inputs of different shapes and prints each decision next
+    to the time of every fixed strategy.
+    """
+    base = [random.randint(0, 10**9) for _ in range(n)]
+    nearly = sorted(base)
+    for _ in range(n // 100):
+        i, j = random.randrange(n), random.randrange(n)
+        nearly[i], nearly[j] = nearly[j], nearly[i]
+
+    inputs = {
+        "random ints": base,
+        "nearly sorted": nearly,
+        "reversed": sorted(base, reverse=True),
+        "status codes": [random.choice([200, 201, 301, 404, 500]) for _ in range(n)],
+        "floats": [random.random() for _ in range(n)],
+        "words": [f"user{random.randint(0, n)}" for _ in range(n)],
+        "tuples, few keys": [(random.randint(0, 3), "x") for _ in range(n)],
+    }
+
+    print(f"Adaptive sort on {n} elements:")
+    for name, data in inputs.items():
+        expected = sorted(data)
+        result = sort(data)
+        decision = decision_log[-1]
+        assert result == expected, f"sort failed on {name}"
+
+        timings = []
+        for strategy in ("merge", "quicksort", "quicksort_3way", "radix_lsd"):
+            try:
+                start = time.perf_counter()
+                _ENGINES[strategy](data, None, False)
+                timings.append(f"{strategy} {time.perf_counter() - start:6.3f}s")
+            except TypeError:
+                timings.append(f"{strategy}    n/a ")
+
+        print(f"  {name:<17} -> {decision.strategy:<14} sample {decision.sample_seconds * 1e3:6.2f}ms  "
+              f"sort {decision.sort_seconds:6.3f}s  | {'  '.join(timings)}")
+        print(f"    {decision.reason}; {decision.profile}")
+
+    # Sampling misses the odd key out: the full type check must catch it
+    wide = [random.randint(2**60, 2**61) for _ in range(n)]
+    wide[1] = 0.5
+    for stable in (False, True):
+        assert sort(wide, stable=stable) == sorted(wide)
+        assert decision_log[-1].strategy not in ("counting", "radix_lsd")
+    print(f"  ints above 2^53 with one float -> {decision_log[-1].strategy}")
+
+    data = inputs["random ints"]
+    for reverse in (False, True):
+        result = sort(data, k=10, reverse=reverse)
+        assert result == sorted(data, reverse=reverse)[:10]
+        print(f"  10 {'largest' if reverse else 'smallest'} random ints -> {decision_log[-1].strategy}, "
+              f"sort {decision_log[-1].sort_seconds:6.3f}s")
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    benchmark_adaptive_sort(n)
@@ -1,13 +1,23 @@
+from sort_keys import key_and_reverse
+from sort_trace import PRINT_LIMIT, traced_sort
+from typed_buffer import typed_buffer_sort
+
+@typed_buffer_sort(kind="stable", returns="self")
+@key_and_reverse(returns="self")
 def bubble_sort(arr: list) -> list:
     """
     Implements the bubble sort algorithm to sort a list in ascending order.
     
     Parameters:
     arr (list): The input list to be sorted
+    key (callable, optional): Extracts the sort key, called once per element
+    reverse (bool): Sort in descending order
     
     Returns:
     list: The sorted list
     
+    Stability: stable, only strictly greater neighbours are swapped
+    
     Time Complexity: O(n^2) in worst and average cases
     Space Complexity: O(1) as it sorts in place
     """
@@ -31,42 +41,30 @@ def bubble_sort(arr: list) -> list:
     
     return arr
 
-def bubble_sort_verbose(arr: list) -> list:
+def bubble_sort_verbose(arr: list, path: str = None, limit: int = PRINT_LIMIT) -> list:
     """
     Implements bubble sort with step-by-step visualization of the sorting process.
     
+    Runs bubble_sort on a TracedArray and prints one line per comparison or
+    swap, instead of a copy of the array after every swap, up to limit
+    lines, followed by the event counts.
+    
     Parameters:
-    arr (list): The input list to be sorted
+    arr (list): The input list, left unchanged
+    path (str, optional): Stream the trace to this file
+    limit (int, optional): Most steps to print, None for all of them
     
     Returns:
-    list: The sorted list
+    list: A new sorted list
     
     Time Complexity: O(n^2)
-    Space Complexity: O(1)
+    Space Complexity: O(n) for the traced copy, plus the trace itself
     """
-    n = len(arr)
-    steps = []
-    
-    for i in range(n):
-        swapped = False
-        
-        for j in range(0, n - i - 1):
-            if arr[j] > arr[j + 1]:
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                swapped = True
-                # Store the current state of array after swap
-                steps.append(f"Step {len(steps) + 1}: Swapped {arr[j+1]} and {arr[j]}")
-                steps.append(f"Current array: {arr}")
-        
-        if not swapped:
-            steps.append("Array is sorted!")
-            break
-    
-    # Print all steps
-    for step in steps:
-        print(step)
-    
-    return arr
+    result, trace = traced_sort(bubble_sort, arr, path)
+    trace.print_events(limit=limit)
+    print(trace.summary())
+    trace.close()
+    return result
 
 def demonstrate_bubble_sort():
     """
@@ -1,57 +1,90 @@
-def heapify(arr, n, i):
+import array
+import random
+import time
+import tracemalloc
+
+from sort_keys import key_and_reverse
+from sort_trace import PRINT_LIMIT, traced_sort
+from typed_buffer import copy_buffer, typed_buffer_sort
+
+def heapify(arr, n, i, d=2):
     """
     Heapify a subtree rooted at index i.
     
     This function maintains the max heap property for a subtree rooted at index i.
-    It assumes that the subtrees rooted at left and right children of node i
-    already satisfy the max heap property.
+    It assumes that the subtrees rooted at the children of node i already satisfy
+    the max heap property.
+    
+    The heap is d-ary: the children of node i are d*i + 1 through d*i + d. The root
+    value is lifted out once and larger children are moved up into the hole until
+    its place is found, so the sift-down is a loop with one write per level instead
+    of a recursive chain of swaps.
     
     Args:
         arr (list): The array/list to be heapified
         n (int): Size of the heap (typically the length of the array)
         i (int): Index of the root of the subtree to be heapified
+        d (int): Number of children per node
         
-    Time Complexity: O(log n)
+    Time Complexity: O(d log_d n)
     Space Complexity: O(1)
     """
-    # Initialize largest as root
-    largest = i
-    
-    # Calculate indices of left and right children
-    left = 2 * i + 1     # Left child index
-    right = 2 * i + 2    # Right child index
-    
-    # Check if left child exists and is greater than root
-    if left < n and arr[left] > arr[largest]:
-        largest = left
+    item = arr[i]
     
-    # Check if right child exists and is greater than current largest
-    if right < n and arr[right] > arr[largest]:
-        largest = right
-    
-    # If largest is not the root, swap and continue heapifying
-    if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]  # Swap
+    while True:
+        first = d * i + 1    # First child index
+        if first >= n:
+            break
+        
+        # Find the largest child; the binary case is unrolled as it is the hottest
+        if d == 2:
+            largest = first + 1 if first + 1 < n and arr[first + 1] > arr[first] else first
+        else:
+            largest = first
+            for child in range(first + 1, min(first + d, n)):
+                if arr[child] > arr[largest]:
+                    largest = child
         
-        # Recursively heapify the affected subtree
-        heapify(arr, n, largest)
+        # Stop once no child is greater than the sifted value
+        if not arr[largest] > item:
+            break
+        
+        # Move the child up into the hole and continue below it
+        arr[i] = arr[largest]
+        i = largest
+    
+    arr[i] = item
 
-def heap_sort(arr):
+@typed_buffer_sort(kind="heapsort", returns="copy")
+@key_and_reverse(returns="copy")
+def heap_sort(arr, d=2):
     """
     Implementation of heap sort algorithm.
     
     Heap sort is a comparison-based sorting algorithm that uses a binary heap data structure.
     It builds a max heap from the input data, then repeatedly extracts the maximum element
     and rebuilds the heap until the array is sorted.
+    
+    Args:
+        arr (list): The array/list to be sorted
+        d (int): Number of children per heap node
+        key (callable, optional): Extracts the sort key, called once per element
+        reverse (bool): Sort in descending order
+        
+    Returns:
+        list: A new sorted list
+        
+    Stability:
+        - Not stable: moving the root to the end reorders equal elements
     """
-    # Make a copy of the input array to avoid modifying the original
-    result = arr.copy()
+    # Make a copy of the input array (or buffer) to avoid modifying the original
+    result = copy_buffer(arr)
     n = len(result)
     
     # Build a max heap
     # We start from the last non-leaf node and heapify each node in reverse order
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(result, n, i)
+    for i in range((n - 2) // d, -1, -1):
+        heapify(result, n, i, d)
     
     # Extract elements one by one from the heap
     for i in range(n - 1, 0, -1):
@@ -59,45 +92,156 @@ def heap_sort(arr):
         result[i], result[0] = result[0], result[i]
         
         # Heapify the reduced heap (excluding the sorted elements)
-        heapify(result, i, 0)
+        heapify(result, i, 0, d)
     
     return result
 
-def heap_sort_with_steps(arr):
+def _sift_down_min(heap, n, i, d):
     """
-    Implementation of heap sort algorithm with step-by-step visualization.
+    Min-heap counterpart of heapify, used by top_k.
+    """
+    item = heap[i]
+    
+    while True:
+        first = d * i + 1
+        if first >= n:
+            break
+        
+        smallest = first
+        for child in range(first + 1, min(first + d, n)):
+            if heap[child] < heap[smallest]:
+                smallest = child
+        
+        if not heap[smallest] < item:
+            break
+        
+        heap[i] = heap[smallest]
+        i = smallest
     
-    This version prints the state of the array after each major operation,
-    making it useful for educational purposes.
+    heap[i] = item
+
+def top_k(iterable, k, key=None, d=2):
+    """
+    Returns the k largest elements of an iterable, largest first.
+    
+    Keeps a k-element min-heap whose root is the weakest element kept so far.
+    Each new element is compared with the root only, and replaces it when it
+    is larger. The input is consumed one element at a time, so it can be a
+    generator of any length.
     
     Args:
-        arr (list): The array/list to be sorted
+        iterable: The elements to choose from
+        k (int): Number of elements to return
+        key (callable, optional): Extracts the comparison key, called once per element
+        d (int): Number of children per heap node
         
     Returns:
-        list: The sorted array
+        list: The k largest elements (fewer if the input is shorter), in the
+        same order as sorted(iterable, key=key, reverse=True)[:k]
+        
+    Time Complexity: O(n log k)
+    Space Complexity: O(k)
+    
+    Example:
+        >>> top_k(iter([5, 1, 9, 3, 7]), 3)
+        [9, 7, 5]
     """
-    result = arr.copy()
-    n = len(result)
+    if k <= 0:
+        return []
     
-    print("Initial array:", result)
+    # Entries are (key, -position, element): among equal keys the earlier
+    # element ranks higher, and elements themselves are never compared
+    heap = []
+    iterator = iter(iterable)
+    for position, element in enumerate(iterator):
+        heap.append((element if key is None else key(element), -position, element))
+        if len(heap) == k:
+            break
     
-    # Build a max heap
-    print("\nBuilding max heap:")
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(result, n, i)
-        print(f"After heapifying at index {i}: {result}")
-    
-    print("\nMax heap built:", result)
-   # Extract elements one by one
-    print("\nExtracting elements:")
+    n = len(heap)
+    for i in range((n - 2) // d, -1, -1):
+        _sift_down_min(heap, n, i, d)
+    
+    if n == k:
+        weakest = heap[0][0]
+        for position, element in enumerate(iterator, k):
+            value = element if key is None else key(element)
+            # A later element needs a strictly larger key to displace the root
+            if value > weakest:
+                heap[0] = (value, -position, element)
+                _sift_down_min(heap, k, 0, d)
+                weakest = heap[0][0]
+    
+    # Pop the weakest entry to the back repeatedly, leaving the strongest first
     for i in range(n - 1, 0, -1):
-        # Move current root to the end
-        result[i], result[0] = result[0], result[i]
-        print(f"Moved max element {result[i]} to position {i}: {result}")
+        heap[i], heap[0] = heap[0], heap[i]
+        _sift_down_min(heap, i, 0, d)
+    
+    return [entry[2] for entry in heap]
+
+def partial_sort(arr, k, d=2):
+    """
+    Rearranges arr in place so that arr[:k] holds its k smallest elements in order.
+    
+    A max heap of the first k elements is kept at the front of the array. Every
+    later element smaller than the heap's root swaps places with it, and finally
+    the heap is sorted in place. The order of arr[k:] is unspecified.
+    
+    Args:
+        arr (list): The array/list to be partially sorted
+        k (int): Number of smallest elements to place at the front
+        d (int): Number of children per heap node
+        
+    Returns:
+        list: The same list
         
-        # Heapify the reduced heap
-        heapify(result, i, 0)
-        print(f"After heapifying reduced heap: {result}")
+    Time Complexity: O(n log k)
+    Space Complexity: O(1)
+    
+    Example:
+        >>> partial_sort([5, 1, 9, 3, 7], 2)[:2]
+        [1, 3]
+    """
+    n = len(arr)
+    k = max(0, min(k, n))
+    
+    for i in range((k - 2) // d, -1, -1):
+        heapify(arr, k, i, d)
+    
+    for i in range(k, n):
+        if arr[i] < arr[0]:
+            arr[i], arr[0] = arr[0], arr[i]
+            heapify(arr, k, 0, d)
+    
+    for i in range(k - 1, 0, -1):
+        arr[i], arr[0] = arr[0], arr[i]
+        heapify(arr, i, 0, d)
+    
+    return arr
+
+def heap_sort_with_steps(arr, path=None, limit=PRINT_LIMIT):
+    """
+    Implementation of heap sort algorithm with step-by-step visualization.
+    
+    Runs heap_sort on a TracedArray and prints one line per compare, move
+    or swap instead of the whole array after every operation, up to limit
+    lines, followed by the event counts.
+    
+    Args:
+        arr (list): The array/list to be sorted
+        path (str, optional): Stream the trace to this file
+        limit (int, optional): Most steps to print, None for all of them
+        
+    Returns:
+        list: The sorted array
+    """
+    result, trace = traced_sort(heap_sort, arr, path)
+    print("Initial array:", trace.initial)
+    trace.print_events(limit=limit)
+    print(trace.summary())
+    print("Sorted array:", result)
+    trace.close()
+    return result
 
 def test_heap_sort():
     test_cases = [
@@ -120,9 +264,72 @@ def test_heap_sort():
         print("Test passed!")
         print("-" * 40)
 
+def test_top_k():
+    """
+    Checks top_k and partial_sort against sorted() for several heap arities.
+    """
+    for d in (2, 3, 4, 8):
+        for n in (0, 1, 5, 100, 1000):
+            data = [random.randint(0, n // 3 + 1) for _ in range(n)]
+            for k in (0, 1, 3, 100, n + 5):
+                expected = sorted(data, reverse=True)[:k]
+                assert top_k(iter(data), k, d=d) == expected, f"top_k failed (d={d}, n={n}, k={k})"
+                
+                pairs = list(enumerate(data))
+                by_value = sorted(pairs, key=lambda p: p[1], reverse=True)[:k]
+                assert top_k(pairs, k, key=lambda p: p[1], d=d) == by_value
+                
+                arr = data.copy()
+                partial_sort(arr, k, d)
+                assert arr[:k] == sorted(data)[:k], f"partial_sort failed (d={d}, n={n}, k={k})"
+                assert sorted(arr) == sorted(data)
+            
+            assert heap_sort(data, d) == sorted(data), f"heap_sort failed (d={d}, n={n})"
+            # Passing d sends a buffer to the Python implementation
+            buf = array.array("i", data)
+            result = heap_sort(buf, d)
+            assert result == array.array("i", sorted(data)) and buf == array.array("i", data)
+    print("top_k, partial_sort and d-ary heap_sort tests passed!")
+
+def benchmark_heap(n=1_000_000, k=100):
+    """
+    Times d-ary heap sort, and top_k on a generator against a full sort.
+    """
+    data = [random.random() for _ in range(n // 10)]
+    print(f"\nheap_sort on {len(data)} floats:")
+    for d in (2, 3, 4, 8):
+        start = time.perf_counter()
+        heap_sort(data, d)
+        print(f"  {d}-ary: {time.perf_counter() - start:7.3f}s")
+    
+    scores = [random.random() for _ in range(n)]
+    expected = sorted(scores, reverse=True)[:k]
+    
+    print(f"\nTop {k} of {n} scores:")
+    start = time.perf_counter()
+    assert heap_sort(scores)[::-1][:k] == expected
+    print(f"  heap_sort then slice:    {time.perf_counter() - start:7.3f}s")
+    
+    for d in (2, 4):
+        start = time.perf_counter()
+        result = top_k((score for score in scores), k, d=d)
+        elapsed = time.perf_counter() - start
+        assert result == expected
+        
+        # Trace a separate run, tracemalloc would distort the timing
+        tracemalloc.start()
+        top_k((score for score in scores), k, d=d)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  top_k on a generator, {d}-ary: {elapsed:7.3f}s  peak {peak / 1024:7.1f} KiB")
+
 if __name__ == "__main__":
     print("Demonstration of Heap Sort with step-by-step visualization:")
     example_arr = [12, 11, 13, 5, 6, 7]
     print(f"Original array: {example_arr}")
     heap_sort_with_steps(example_arr)
-    print("\n")
\ No newline at end of file
+    print("\n")
+    
+    test_heap_sort()
+    test_top_k()
+    benchmark_heap()
\ No newline at end of file
@@ -1,3 +1,9 @@
+from sort_keys import key_and_reverse
+from sort_trace import PRINT_LIMIT, traced_sort
+from typed_buffer import copy_buffer, typed_buffer_sort
+
+@typed_buffer_sort(kind="stable", returns="copy")
+@key_and_reverse(returns="copy")
 def insertion_sort(arr):
     """
     Implementation of insertion sort algorithm.
@@ -9,10 +15,15 @@ def insertion_sort(arr):
     
     Args:
         arr (list): The array/list to be sorted
+        key (callable, optional): Extracts the sort key, called once per element
+        reverse (bool): Sort in descending order
         
     Returns:
         list: The sorted array
         
+    Stability:
+        - Stable: elements only move past strictly greater ones
+        
     Time Complexity:
         - Best Case: O(n) when the array is already sorted
         - Average Case: O(n²)
@@ -25,8 +36,8 @@ def insertion_sort(arr):
         >>> insertion_sort([5, 2, 4, 6, 1, 3])
         [1, 2, 3, 4, 5, 6]
     """
-    # Make a copy of the input array to avoid modifying the original
-    arr = arr.copy()
+    # Make a copy of the input array (or buffer) to avoid modifying the original
+    arr = copy_buffer(arr)
     
     # Iterate through the array starting from the second element
     for i in range(1, len(arr)):
@@ -47,48 +58,38 @@ def insertion_sort(arr):
         
     return arr
 
-def insertion_sort_with_steps(arr):
+def insertion_sort_with_steps(arr, path=None, limit=PRINT_LIMIT):
     """
     Implementation of insertion sort algorithm with step-by-step visualization.
     
-    This version prints the state of the array after each insertion operation,
-    making it useful for educational purposes.
+    Runs insertion_sort on a TracedArray and prints one line per compare or
+    move, up to limit lines, followed by the event counts. The state after
+    any step can be rebuilt with the trace's state_at().
     
     Args:
         arr (list): The array/list to be sorted
+        path (str, optional): Stream the trace to this file
+        limit (int, optional): Most steps to print, None for all of them
         
     Returns:
         list: The sorted array
         
     Example:
-        >>> insertion_sort_with_steps([5, 2, 4, 6, 1, 3])
-        Step 1: [2, 5, 4, 6, 1, 3]
-        Step 2: [2, 4, 5, 6, 1, 3]
-        Step 3: [2, 4, 5, 6, 1, 3]
-        Step 4: [1, 2, 4, 5, 6, 3]
-        Step 5: [1, 2, 3, 4, 5, 6]
-        [1, 2, 3, 4, 5, 6]
+        >>> insertion_sort_with_steps([5, 2, 4])
+        Step 1: compare [0] with [1]
+        Step 2: swap [1] and [0]
+        Step 3: compare [1] with [2]
+        Step 4: move 5 from [1] to [2]
+        Step 5: compare [0] with [2]
+        Step 6: move 4 from [2] to [1]
+        6 events: 3 compares, 2 moves, 1 swaps
+        [2, 4, 5]
     """
-    # Make a copy of the input array
-    arr = arr.copy()
-    
-    # Iterate through the array starting from the second element
-    for i in range(1, len(arr)):
-        current_element = arr[i]
-        j = i - 1
-        
-        # Move elements greater than current_element one position ahead
-        while j >= 0 and arr[j] > current_element:
-            arr[j + 1] = arr[j]
-            j -= 1
-            
-        # Place current element at its correct position
-        arr[j + 1] = current_element
-        
-        # Print the current state of the array
-        print(f"Step {i}: {arr}")
-        
-    return arr
+    result, trace = traced_sort(insertion_sort, arr, path)
+    trace.print_events(limit=limit)
+    print(trace.summary())
+    trace.close()
+    return result
 
 def test_insertion_sort():
     """
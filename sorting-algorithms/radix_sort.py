@@ -0,0 +1,353 @@
+"""
+Radix and Counting Sorts
+
+Non-comparison sorts for integer, float, string and bytes keys.
+
+- radix_sort_lsd: byte-wise least-significant-digit radix sort for ints and
+  floats. Signed ints have their sign bit flipped and floats are mapped to
+  order-preserving unsigned 64-bit keys, so every pass is a plain byte sort.
+- radix_sort_msd: most-significant-digit radix sort for strings and bytes,
+  which hands small buckets to insertion_sort.
+- counting_sort: counts each key of a small integer range.
+
+All three take a list and return a new sorted list, like insertion_sort,
+and accept key= and reverse= like sorted(). With a key they sort an index
+permutation, so the key function runs once per element and the elements
+themselves are never compared.
+"""
+
+import array
+import random
+import time
+
+from insertion_sort import insertion_sort
+from sort_keys import sort_order
+
+# Buckets at or below this size are finished with insertion sort
+MSD_INSERTION_SORT_CUTOFF = 32
+
+# Widest key range counting_sort allocates counters for
+COUNTING_SORT_MAX_RANGE = 1 << 20
+
+_SIGN_BIT_64 = 1 << 63
+_MASK_64 = (1 << 64) - 1
+
+def _float_keys(arr):
+    """
+    Map floats to unsigned 64-bit keys that sort in the same order.
+
+    Positive floats get their sign bit set, negative floats have all bits
+    flipped, so larger magnitudes of negative numbers come first.
+    """
+    bits = array.array("Q")
+    bits.frombytes(array.array("d", arr).tobytes())
+    return [k ^ _MASK_64 if k & _SIGN_BIT_64 else k | _SIGN_BIT_64 for k in bits]
+
+def _keys_to_floats(keys):
+    """Invert _float_keys."""
+    bits = array.array("Q", [k ^ _SIGN_BIT_64 if k & _SIGN_BIT_64 else k ^ _MASK_64 for k in keys])
+    values = array.array("d")
+    values.frombytes(bits.tobytes())
+    return values.tolist()
+
+def _lsd_sort_keys(keys, key_bytes):
+    """
+    Sort non-negative integer keys with one stable bucket pass per byte.
+
+    Passes in which every key has the same byte are skipped.
+    """
+    n = len(keys)
+    for shift in range(0, 8 * key_bytes, 8):
+        buckets = [[] for _ in range(256)]
+        for k in keys:
+            buckets[(k >> shift) & 0xFF].append(k)
+
+        # Nothing moves if all keys landed in one bucket
+        if any(len(bucket) == n for bucket in buckets):
+            continue
+        keys = [k for bucket in buckets for k in bucket]
+    return keys
+
+def _unsigned_keys(values):
+    """
+    Map ints or floats to non-negative ints that sort in the same order.
+
+    Returns:
+        tuple: (keys, key_bytes, decode) where decode turns sorted keys
+        back into values
+    """
+    if all(isinstance(x, int) for x in values):
+        low, high = min(values), max(values)
+        if low >= 0:
+            return list(values), (high.bit_length() + 7) // 8, lambda keys: keys
+
+        # Smallest of 32, 64, ... bits that holds the signed range
+        bits = 32
+        while not -(1 << (bits - 1)) <= low <= high < (1 << (bits - 1)):
+            bits *= 2
+        offset = 1 << (bits - 1)
+        return [x + offset for x in values], bits // 8, lambda keys: [k - offset for k in keys]
+
+    if all(isinstance(x, (int, float)) for x in values):
+        return _float_keys(values), 8, _keys_to_floats
+
+    raise TypeError("radix_sort_lsd requires int or float keys")
+
+def radix_sort_lsd(arr, key=None, reverse=False):
+    """
+    Implementation of least-significant-digit radix sort.
+
+    Sorts one byte of the key per pass, starting from the lowest byte, with
+    a stable bucket distribution. Integers are sorted directly; signed data
+    is shifted by 2^(bits - 1), which flips the two's complement sign bit.
+    Floats (and lists mixing ints and floats, which come back as floats)
+    are sorted through their IEEE 754 bit patterns, so -0.0 is placed
+    before 0.0. NaN is not supported.
+
+    With key or reverse, each element's key is packed together with its
+    index into one integer, key in the high bits, and those integers are
+    radix sorted. The index in the low bits then gives the permutation
+    and breaks ties in input order.
+
+    Args:
+        arr (list): The list to be sorted
+        key (callable, optional): Returns an int or float key per element,
+            called once per element
+        reverse (bool): Sort in descending order
+
+    Returns:
+        list: A new sorted list
+
+    Raises:
+        TypeError: If the keys are anything other than ints and floats
+
+    Stability: stable
+
+    Time Complexity: O(w * n) for w-byte keys
+    Space Complexity: O(n)
+
+    Example:
+        >>> radix_sort_lsd([170, -45, 75, -90, 802, 24, 2, 66])
+        [-90, -45, 2, 24, 66, 75, 170, 802]
+    """
+    if not arr:
+        return []
+
+    if key is None and not reverse:
+        keys, key_bytes, decode = _unsigned_keys(arr)
+        return decode(_lsd_sort_keys(keys, key_bytes))
+
+    keys, key_bytes, _ = _unsigned_keys(arr if key is None else [key(x) for x in arr])
+    if reverse:
+        top = (1 << (8 * key_bytes)) - 1
+        keys = [top - k for k in keys]
+
+    index_bits = max(1, (len(arr) - 1).bit_length())
+    packed = [(k << index_bits) | i for i, k in enumerate(keys)]
+    packed = _lsd_sort_keys(packed, (8 * key_bytes + index_bits + 7) // 8)
+
+    index_mask = (1 << index_bits) - 1
+    return [arr[p & index_mask] for p in packed]
+
+def radix_sort_msd(arr, key=None, reverse=False):
+    """
+    Implementation of most-significant-digit radix sort for strings and bytes.
+
+    Distributes elements into buckets by their character (or byte) at the
+    current depth, with elements that end at this depth placed first, then
+    refines each bucket at the next depth. Buckets are kept on an explicit
+    stack, so very long common prefixes cannot hit the recursion limit.
+    Buckets of MSD_INSERTION_SORT_CUTOFF elements or fewer are finished
+    with insertion_sort. The buckets hold indices, so elements are only
+    moved once, when the final permutation is applied.
+
+    Args:
+        arr (list): The list to be sorted
+        key (callable, optional): Returns a str or bytes key per element,
+            called once per element
+        reverse (bool): Sort in descending order
+
+    Returns:
+        list: A new sorted list, in the same order as sorted() gives
+
+    Stability: stable
+
+    Time Complexity: O(n + total length of distinguishing prefixes)
+    Space Complexity: O(n)
+
+    Example:
+        >>> radix_sort_msd(["banana", "apple", "band", "ban"])
+        ['apple', 'ban', 'banana', 'band']
+    """
+    keys = arr if key is None else [key(x) for x in arr]
+    order = list(range(len(arr)))
+    stack = [(0, len(order), 0)]
+
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low <= MSD_INSERTION_SORT_CUTOFF:
+            positions = sort_order(insertion_sort, [keys[i] for i in order[low:high]], reverse=reverse)
+            order[low:high] = [order[low + p] for p in positions]
+            continue
+
+        finished = []
+        buckets = {}
+        for i in order[low:high]:
+            k = keys[i]
+            if len(k) == depth:
+                finished.append(i)
+            else:
+                buckets.setdefault(k[depth], []).append(i)
+
+        # Elements that end here come before any longer element, or after
+        # all of them when sorting in reverse
+        pos = low
+        if not reverse:
+            order[pos:pos + len(finished)] = finished
+            pos += len(finished)
+        for symbol in sorted(buckets, reverse=reverse):
+            bucket = buckets[symbol]
+            order[pos:pos + len(bucket)] = bucket
+            if len(bucket) > 1:
+                stack.append((pos, pos + len(bucket), depth + 1))
+            pos += len(bucket)
+        if reverse:
+            order[pos:high] = finished
+
+    return [arr[i] for i in order]
+
+def counting_sort(arr, key=None, reverse=False):
+    """
+    Implementation of counting sort for integers.
+
+    Counts the occurrences of every key between the minimum and maximum,
+    then writes each key out as many times as it was seen. With key or
+    reverse, the counts are turned into starting offsets and every element
+    is placed at the next free slot of its key, which keeps ties in input
+    order. Ranges wider than COUNTING_SORT_MAX_RANGE are handed to
+    radix_sort_lsd instead of allocating a huge counter array.
+
+    Args:
+        arr (list): The list to be sorted
+        key (callable, optional): Returns an int key per element, called
+            once per element
+        reverse (bool): Sort in descending order
+
+    Returns:
+        list: A new sorted list
+
+    Raises:
+        TypeError: If the keys are not all integers
+
+    Stability: stable
+
+    Time Complexity: O(n + k) where k is the key range
+    Space Complexity: O(n + k)
+
+    Example:
+        >>> counting_sort([4, 2, 2, 8, 3, 3, 1])
+        [1, 2, 2, 3, 3, 4, 8]
+    """
+    if not arr:
+        return []
+
+    keys = arr if key is None else [key(x) for x in arr]
+    if not all(isinstance(k, int) for k in keys):
+        raise TypeError("counting_sort requires int keys")
+
+    low, high = min(keys), max(keys)
+    if high - low + 1 > COUNTING_SORT_MAX_RANGE:
+        if key is None:
+            return radix_sort_lsd(arr, reverse=reverse)
+        # Sort indices by the keys already computed
+        order = radix_sort_lsd(list(range(len(arr))), key=keys.__getitem__, reverse=reverse)
+        return [arr[i] for i in order]
+
+    counts = [0] * (high - low + 1)
+    for k in keys:
+        counts[k - low] += 1
+
+    if key is None and not reverse:
+        result = []
+        for offset, count in enumerate(counts):
+            if count:
+                result.extend([low + offset] * count)
+        return result
+
+    # Starting offset of every key, walking the keys in output order
+    starts = [0] * len(counts)
+    pos = 0
+    for offset in (range(len(counts) - 1, -1, -1) if reverse else range(len(counts))):
+        starts[offset] = pos
+        pos += counts[offset]
+
+    result = [None] * len(arr)
+    for x, k in zip(arr, keys):
+        slot = k - low
+        result[starts[slot]] = x
+        starts[slot] += 1
+    return result
+
+def test_radix_sort():
+    """
+    Test function for the radix and counting sorts.
+    """
+    numeric_cases = [
+        [170, 45, 75, 90, 802, 24, 2, 66],
+        [170, -45, 75, -90, 802, 24, 2, 66],
+        [-2**63, 2**63 - 1, 0, -1, 1],
+        [-2**80, 2**70, 3],
+        [3.5, -0.0, 0.0, -2.25, float("inf"), float("-inf"), 1e-300],
+        [1, 2.5, -3],
+        [5, 5, 5],
+        [],
+        [1],
+    ]
+    for i, test_case in enumerate(numeric_cases):
+        expected = sorted(test_case)
+        assert radix_sort_lsd(test_case) == expected, f"LSD failed on {test_case}"
+        if all(isinstance(x, int) for x in test_case):
+            assert counting_sort(test_case) == expected, f"Counting sort failed on {test_case}"
+        print(f"Numeric test case {i + 1} passed")
+
+    words = [f"{random.choice(['', 'pre', 'prefix'])}{random.randint(0, 500)}" for _ in range(500)]
+    string_cases = [
+        words,
+        [w.encode() for w in words],
+        ["banana", "apple", "band", "ban", "", "apple"],
+        ["a" * 5000 + "b", "a" * 5000],
+    ]
+    for i, test_case in enumerate(string_cases):
+        assert radix_sort_msd(test_case) == sorted(test_case), "MSD failed"
+        print(f"String test case {i + 1} passed")
+
+def benchmark_radix_sort(n=200_000):
+    """
+    Compares the radix and counting sorts against heap_sort and sorted().
+    """
+    from heap_sort import heap_sort
+
+    inputs = {
+        "int32 IDs": ([random.randint(-2**31, 2**31 - 1) for _ in range(n)], radix_sort_lsd),
+        "int64 IDs": ([random.randint(-2**63, 2**63 - 1) for _ in range(n)], radix_sort_lsd),
+        "floats": ([random.uniform(-1e6, 1e6) for _ in range(n)], radix_sort_lsd),
+        "8-byte keys": ([random.randbytes(8) for _ in range(n)], radix_sort_msd),
+        "status codes": ([random.choice([200, 201, 301, 404, 500]) for _ in range(n)], counting_sort),
+    }
+
+    print(f"\nSorting {n} elements:")
+    for name, (data, radix) in inputs.items():
+        expected = sorted(data)
+        timings = []
+        for sort in (radix, heap_sort, sorted):
+            start = time.perf_counter()
+            result = sort(data)
+            timings.append(time.perf_counter() - start)
+            assert result == expected, f"{sort.__name__} failed on {name}"
+
+        print(f"  {name:<13} {radix.__name__:<15} {timings[0]:6.3f}s  "
+              f"heap_sort {timings[1]:6.3f}s  sorted {timings[2]:6.3f}s")
+
+if __name__ == "__main__":
+    test_radix_sort()
+    benchmark_radix_sort()
@@ -1,3 +1,9 @@
+from sort_keys import key_and_reverse
+from sort_trace import PRINT_LIMIT, traced_sort
+from typed_buffer import typed_buffer_sort
+
+@typed_buffer_sort(kind="heapsort", returns="self")
+@key_and_reverse(returns="self")
 def selection_sort(arr):
     """
     Implements the selection sort algorithm to sort a list in ascending order.
@@ -7,10 +13,15 @@ def selection_sort(arr):
     
     Args:
         arr (list): The input list to be sorted
+        key (callable, optional): Extracts the sort key, called once per element
+        reverse (bool): Sort in descending order
         
     Returns:
         list: The sorted list in ascending order
         
+    Stability:
+        - Not stable: the swap can move an element past equal ones
+        
     Time Complexity:
         - Best Case: O(n^2)
         - Average Case: O(n^2)
@@ -40,27 +51,28 @@ def selection_sort(arr):
     return arr
 
 # Example usage with step-by-step visualization
-def visualize_selection_sort(arr):
+def visualize_selection_sort(arr, path=None, limit=PRINT_LIMIT):
     """
     Demonstrates selection sort with step-by-step visualization.
     
+    Runs selection_sort on a TracedArray and prints one line per comparison
+    or swap, up to limit lines, followed by the event counts. arr itself is
+    left unchanged.
+    
     Args:
-        arr (list): The input list to be sorted
+        arr (list): The input list
+        path (str, optional): Stream the trace to this file
+        limit (int, optional): Most steps to print, None for all of them
         
     Returns:
         None: Prints the sorting steps
     """
     print("Original array:", arr)
-    n = len(arr)
-    
-    for i in range(n):
-        min_idx = i
-        for j in range(i + 1, n):
-            if arr[j] < arr[min_idx]:
-                min_idx = j
-        
-        arr[i], arr[min_idx] = arr[min_idx], arr[i]
-        print(f"Step {i + 1}: {arr} (Swapped {arr[i]} to position {i})")
+    result, trace = traced_sort(selection_sort, arr, path)
+    trace.print_events(limit=limit)
+    print(trace.summary())
+    trace.close()
+    print("Sorted array:", result)
 
 # Test the implementation
 if __name__ == "__main__":
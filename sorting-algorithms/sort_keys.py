@@ -0,0 +1,234 @@
+"""
+key= and reverse= Support
+
+Adds the key and reverse arguments of sorted() to the comparison sorts of
+this repository without touching their inner loops.
+
+The key function is called exactly once per element and the results are
+kept in a parallel list. The wrapped algorithm sorts a copy of that list
+of keys, so it compares the keys themselves: no wrapper object is made
+per element, and comparisons of built-in keys run in C. The index
+permutation the sort applied is then recovered by identity (each sorted
+key object is traced back to the position it came from) and applied to
+the input at the end.
+
+With reverse=True the keys are sorted back to front and the permutation
+read back to front, so a stable algorithm keeps equal elements in their
+original order, exactly as sorted(..., reverse=True) does.
+
+Stability of each algorithm (equal keys keep their input order):
+
+    bubble_sort            stable
+    insertion_sort         stable
+    selection_sort         not stable
+    heap_sort              not stable
+    radix_sort_lsd         stable
+    radix_sort_msd         stable
+    counting_sort          stable
+    quick_sort             stable (out-of-place, last-element pivot)
+    quick_sort_in_place    not stable
+    quick_sort_3way        not stable
+    merge_sort             stable
+    merge_sort_bottom_up   stable
+    merge_sort_adaptive    stable
+"""
+
+import array
+import os
+import random
+import sys
+import time
+from functools import wraps
+
+def sort_order(sort, keys, *args, reverse=False, returns="copy", **kwargs):
+    """
+    Sorts a copy of keys with sort and returns the permutation it applied.
+
+    Before sorting, the positions of every key object are chained: first
+    maps the object's id to its first position, following links each
+    position to the next one holding the same object. Afterwards every
+    sorted key claims the first unclaimed position of its object. A key
+    can only be the same object as another if the two are equal (small
+    ints, interned strings), and such keys are handed out in input order,
+    which is where any stable sort leaves them.
+
+    Args:
+        sort (Callable): The sort to run
+        keys (Sequence): The precomputed keys
+        *args: Extra positional arguments for sort
+        reverse (bool): Order larger keys first
+        returns (str): Contract of sort, as for key_and_reverse
+        **kwargs: Extra keyword arguments for sort
+
+    Returns:
+        list: Positions in keys, in sorted order
+
+    Example:
+        >>> from insertion_sort import insertion_sort
+        >>> sort_order(insertion_sort, ["pear", "fig", "apple"])
+        [2, 1, 0]
+    """
+    work = list(keys)
+    if reverse:
+        work.reverse()
+    n = len(work)
+
+    first = {}
+    following = array.array("q", bytes(8 * n))
+    for i in range(n - 1, -1, -1):
+        identity = id(work[i])
+        following[i] = first.get(identity, -1)
+        first[identity] = i
+
+    result = sort(work, *args, **kwargs)
+    if returns == "copy":
+        work = result
+
+    order = [0] * n
+    for position, k in enumerate(work):
+        identity = id(k)
+        i = first[identity]
+        first[identity] = following[i]
+        order[position] = i
+
+    if reverse:
+        order = [n - 1 - i for i in reversed(order)]
+    return order
+
+def key_and_reverse(returns="copy", bounds=False):
+    """
+    Decorator adding key= and reverse= keyword arguments to a sort.
+
+    Calls without key and with reverse=False go straight to the wrapped
+    function. Otherwise the wrapped function sorts the precomputed keys
+    through sort_order, and any extra arguments are passed through.
+
+    Args:
+        returns (str): Contract of the wrapped sort, one of
+            "copy" (returns a sorted copy), "self" (sorts in place and
+            returns the input) or "none" (sorts in place, returns None)
+        bounds (bool): The wrapped sort takes optional inclusive low and
+            high index bounds after the input, like quick_sort_in_place.
+            With a key or reverse only arr[low..high] is keyed and sorted
+
+    Returns:
+        Callable: The decorator
+    """
+    if returns not in ("copy", "self", "none"):
+        raise ValueError(f"returns must be 'copy', 'self' or 'none', got {returns!r}")
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(arr, *args, key=None, reverse=False, **kwargs):
+            if key is None and not reverse:
+                return func(arr, *args, **kwargs)
+
+            low = 0
+            segment = arr
+            if bounds:
+                limits = dict(zip(("low", "high"), args))
+                limits.update((name, kwargs.pop(name)) for name in ("low", "high") if name in kwargs)
+                args = args[2:]
+                low = limits.get("low", 0)
+                high = limits.get("high")
+                if high is None:
+                    high = len(arr) - 1
+                segment = arr[low:high + 1]
+
+            keys = segment if key is None else [key(x) for x in segment]
+            order = sort_order(func, keys, *args, reverse=reverse, returns=returns, **kwargs)
+            values = [segment[i] for i in order]
+            if returns == "copy":
+                return values
+
+            if isinstance(arr, list):
+                arr[low:low + len(values)] = values
+            else:
+                # Buffers such as array.array only accept their own type
+                for i, value in enumerate(values, low):
+                    arr[i] = value
+            return arr if returns == "self" else None
+
+        return wrapper
+
+    return decorator
+
+def benchmark_key_calls(n=20_000):
+    """
+    Shows that each sort calls the key function exactly n times.
+
+    Also checks the order (and, for stable sorts, the order of ties) against
+    sorted(), and times merge_sort on records wrapped in tuples by hand.
+    """
+    from bubble_sort import bubble_sort
+    from heap_sort import heap_sort
+    from insertion_sort import insertion_sort
+    from radix_sort import counting_sort, radix_sort_lsd, radix_sort_msd
+    from selection_sort import selection_sort
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "divide-and-conquer"))
+    from merge_sort import merge_sort, merge_sort_adaptive, merge_sort_bottom_up
+    from quick_sort import quick_sort, quick_sort_3way, quick_sort_in_place
+
+    records = [{"id": i, "score": random.randint(0, 1000), "name": f"user{random.randint(0, n)}"}
+               for i in range(n)]
+    calls = 0
+
+    def counted(field):
+        def key(record):
+            nonlocal calls
+            calls += 1
+            return record[field]
+        return key
+
+    # (sort, field, stable, quadratic)
+    sorts = [
+        (bubble_sort, "score", True, True),
+        (insertion_sort, "score", True, True),
+        (selection_sort, "score", False, True),
+        (heap_sort, "score", False, False),
+        (radix_sort_lsd, "score", True, False),
+        (radix_sort_msd, "name", True, False),
+        (counting_sort, "score", True, False),
+        (quick_sort, "score", True, False),
+        (quick_sort_in_place, "score", False, False),
+        (quick_sort_3way, "score", False, False),
+        (merge_sort, "score", True, False),
+        (merge_sort_bottom_up, "score", True, False),
+        (merge_sort_adaptive, "score", True, False),
+    ]
+
+    print(f"Sorting records by key (n = {n}, quadratic sorts n = {n // 10}):")
+    for sort, field, stable, quadratic in sorts:
+        data = records[:n // 10] if quadratic else records
+        for reverse in (False, True):
+            arr = data.copy()
+            calls = 0
+            start = time.perf_counter()
+            result = sort(arr, key=counted(field), reverse=reverse)
+            elapsed = time.perf_counter() - start
+            result = arr if result is None else result
+
+            expected = sorted(data, key=lambda r: r[field], reverse=reverse)
+            assert calls == len(data), f"{sort.__name__} called key {calls} times"
+            assert [r[field] for r in result] == [r[field] for r in expected]
+            if stable:
+                assert [r["id"] for r in result] == [r["id"] for r in expected]
+
+            print(f"  {sort.__name__:<22} reverse={reverse!s:<5} key calls {calls:>6}  {elapsed:7.3f}s")
+
+    # Index bounds: only arr[low..high] is keyed and sorted
+    arr = records[:200]
+    calls = 0
+    quick_sort_in_place(arr, 50, 149, key=counted("score"), reverse=True)
+    assert calls == 100 and arr[:50] == records[:50] and arr[150:] == records[150:200]
+    assert [r["score"] for r in arr[50:150]] == sorted((r["score"] for r in records[50:150]), reverse=True)
+
+    # Wrapping by hand needs the id as a tie-breaker to avoid comparing dicts
+    wrapped = [(record["score"], record["id"], record) for record in records]
+    start = time.perf_counter()
+    merge_sort(wrapped)
+    print(f"  merge_sort on hand-wrapped (score, id, record) tuples: {time.perf_counter() - start:7.3f}s")
+
+if __name__ == "__main__":
+    benchmark_key_calls()
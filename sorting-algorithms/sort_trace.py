@@ -0,0 +1,382 @@
+"""
+Sort Trace Recorder
+
+Records what a sort does to an array as a compact stream of events, instead
+of printing the whole array after every step.
+
+Wrap the input in a TracedArray and pass it to any sort in this repository.
+Every element read from it comes back as a lightweight proxy, so the array
+sees each comparison between elements and each write of an element into a
+position. Tracing needs no changes to the sorts themselves: a sort called
+with a plain list runs exactly the code it always did.
+
+Events are stored as four 64-bit integers each (kind, a, b, token) in an
+array.array, and can be spilled to a binary file as they are recorded:
+
+    COMPARE a b   elements read from positions a and b were compared
+                  (b is -1 for a value that does not come from the array)
+    MOVE    a b   the element read from position a was written to position b
+                  (a is -1 for a value that does not come from the array)
+    SWAP    a b   positions a and b exchanged their elements
+
+The token identifies which original element a MOVE writes, so the state of
+the array after any step can be replayed from the initial contents.
+"""
+
+import array
+import os
+import random
+import tempfile
+
+COMPARE, MOVE, SWAP = 0, 1, 2
+
+# Events the step-by-step helpers print before summarizing the rest
+PRINT_LIMIT = 50
+
+# Integers stored per event: kind, a, b, token
+_FIELDS = 4
+_ITEM_SIZE = array.array("q").itemsize
+
+class SortTrace:
+    """
+    An array-backed log of compare, move and swap events.
+
+    Attributes:
+        initial (list): Array contents before the first event
+        path (str): File the events are streamed to, or None to keep them in memory
+    """
+
+    def __init__(self, initial, path=None, buffer_events=1 << 16, checkpoint_interval=4096):
+        """
+        Start an empty trace.
+
+        Args:
+            initial (list): Array contents before the first event
+            path (str, optional): Stream events to this file in chunks of
+                buffer_events, keeping memory bounded
+            buffer_events (int): Events held in memory before spilling to path
+            checkpoint_interval (int): Steps between cached replay states
+        """
+        self.initial = list(initial)
+        self.path = path
+        self._values = list(self.initial)
+        self._buffer = array.array("q")
+        self._buffer_events = buffer_events
+        self._flushed = 0
+        self._file = open(path, "wb") if path is not None else None
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoints = {0: list(range(len(self.initial)))}
+        self._last_overwritten = None
+        self._counts = [0, 0, 0]
+
+    def __len__(self):
+        """Number of events recorded."""
+        return self._flushed + len(self._buffer) // _FIELDS
+
+    def add_value(self, value):
+        """Register a value that did not come from the array; returns its token."""
+        self._values.append(value)
+        return len(self._values) - 1
+
+    def compare(self, a, b):
+        """Record a comparison between elements read from positions a and b."""
+        self._record(COMPARE, a, b, -1)
+
+    def move(self, src, dst, token, overwritten):
+        """
+        Record that the element `token` read from src was written to dst.
+
+        A move that undoes the previous move's overwrite (b -> a, then the
+        element that was at a -> b) is stored as a single SWAP.
+        """
+        buffer = self._buffer
+        if (buffer and buffer[-4] == MOVE and buffer[-3] == dst and buffer[-2] == src
+                and token == self._last_overwritten and src >= 0):
+            buffer[-4], buffer[-3], buffer[-2], buffer[-1] = SWAP, src, dst, -1
+            self._counts[MOVE] -= 1
+            self._counts[SWAP] += 1
+            self._last_overwritten = None
+            return
+        self._last_overwritten = overwritten
+        self._record(MOVE, src, dst, token)
+
+    def _record(self, kind, a, b, token):
+        self._buffer.extend((kind, a, b, token))
+        self._counts[kind] += 1
+        if self._file is not None and len(self._buffer) >= _FIELDS * self._buffer_events:
+            self.flush()
+
+    def flush(self):
+        """Write buffered events to the trace file, if there is one."""
+        if self._file is None or not self._buffer:
+            return
+        self._buffer.tofile(self._file)
+        self._file.flush()
+        self._flushed += len(self._buffer) // _FIELDS
+        self._buffer = array.array("q")
+
+    def close(self):
+        """Flush and close the trace file; the trace stays readable."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def events(self, start=0):
+        """
+        Iterate over events from step `start` on.
+
+        Yields:
+            tuple: (kind, a, b, token) for each event
+        """
+        if start < self._flushed:
+            if self._file is not None:
+                self._file.flush()
+            chunk_events = self._buffer_events
+            with open(self.path, "rb") as f:
+                f.seek(start * _FIELDS * _ITEM_SIZE)
+                remaining = self._flushed - start
+                while remaining > 0:
+                    chunk = array.array("q")
+                    chunk.fromfile(f, _FIELDS * min(chunk_events, remaining))
+                    remaining -= len(chunk) // _FIELDS
+                    for k in range(0, len(chunk), _FIELDS):
+                        yield tuple(chunk[k:k + _FIELDS])
+
+        buffer = self._buffer
+        for k in range(_FIELDS * max(0, start - self._flushed), len(buffer), _FIELDS):
+            yield tuple(buffer[k:k + _FIELDS])
+
+    def state_at(self, step):
+        """
+        Replay the array contents after the first `step` events.
+
+        Replay starts from the closest cached checkpoint at or before step,
+        and caches new checkpoints every checkpoint_interval steps on the way.
+
+        Args:
+            step (int): Number of events to apply, 0 gives the initial contents
+
+        Returns:
+            list: The array contents at that step
+        """
+        if not 0 <= step <= len(self):
+            raise IndexError(f"step {step} outside 0..{len(self)}")
+
+        interval = self._checkpoint_interval
+        base = max(s for s in self._checkpoints if s <= step)
+        tokens = list(self._checkpoints[base])
+
+        current = base
+        for kind, a, b, token in self.events(base):
+            if current == step:
+                break
+            if kind == MOVE:
+                tokens[b] = token
+            elif kind == SWAP:
+                tokens[a], tokens[b] = tokens[b], tokens[a]
+            current += 1
+            if current % interval == 0 and current not in self._checkpoints:
+                self._checkpoints[current] = list(tokens)
+
+        return [self._values[t] for t in tokens]
+
+    def describe(self, event):
+        """Return a one-line description of an event tuple."""
+        kind, a, b, token = event
+        if kind == COMPARE:
+            return f"compare [{a}] with {'a held value' if b < 0 else f'[{b}]'}"
+        if kind == SWAP:
+            return f"swap [{a}] and [{b}]"
+        source = "a held value" if a < 0 else f"[{a}]"
+        return f"move {self._values[token]!r} from {source} to [{b}]"
+
+    def print_events(self, start=0, limit=None):
+        """Print one line per event, at most `limit` lines."""
+        for step, event in enumerate(self.events(start), start):
+            if limit is not None and step - start >= limit:
+                print(f"... {len(self) - step} more events")
+                break
+            print(f"Step {step + 1}: {self.describe(event)}")
+
+    def summary(self):
+        """Return a one-line count of the events by kind."""
+        compares, moves, swaps = self._counts
+        return f"{len(self)} events: {compares} compares, {moves} moves, {swaps} swaps"
+
+class _TracedElement:
+    """
+    An element read from a TracedArray, remembering where it came from.
+    """
+    __slots__ = ("value", "token", "position", "trace")
+
+    def __init__(self, value, token, position, trace):
+        self.value = value
+        self.token = token
+        self.position = position
+        self.trace = trace
+
+    def _other(self, other):
+        """Record the comparison and return the raw value to compare against."""
+        if isinstance(other, _TracedElement):
+            self.trace.compare(self.position, other.position)
+            return other.value
+        self.trace.compare(self.position, -1)
+        return other
+
+    def __lt__(self, other):
+        return self.value < self._other(other)
+
+    def __le__(self, other):
+        return self.value <= self._other(other)
+
+    def __gt__(self, other):
+        return self.value > self._other(other)
+
+    def __ge__(self, other):
+        return self.value >= self._other(other)
+
+    def __eq__(self, other):
+        return self.value == self._other(other)
+
+    def __ne__(self, other):
+        return self.value != self._other(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return repr(self.value)
+
+def _unwrap(value):
+    """Return the raw value behind a traced element."""
+    return value.value if isinstance(value, _TracedElement) else value
+
+class TracedArray:
+    """
+    A fixed-length array that records reads, comparisons and writes to a SortTrace.
+
+    copy() returns another TracedArray recording into the same trace, which
+    lets sorts that copy their input first (insertion_sort, heap_sort) be
+    traced too; the copy must be taken before the original is modified.
+
+    Attributes:
+        trace (SortTrace): The trace receiving this array's events
+    """
+
+    def __init__(self, values, path=None, **trace_options):
+        """
+        Args:
+            values (Iterable): Initial contents
+            path (str, optional): Stream the events to this file
+            **trace_options: Further SortTrace options
+        """
+        self._values = list(values)
+        self._tokens = list(range(len(self._values)))
+        self.trace = SortTrace(self._values, path, **trace_options)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._values)))]
+        if index < 0:
+            index += len(self._values)
+        return _TracedElement(self._values[index], self._tokens[index], index, self.trace)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self._values)))
+            values = list(value)
+            if len(values) != len(positions):
+                raise ValueError("TracedArray cannot change length")
+            for i, item in zip(positions, values):
+                self[i] = item
+            return
+
+        if index < 0:
+            index += len(self._values)
+        if isinstance(value, _TracedElement):
+            src, token = value.position, value.token
+        else:
+            src, token = -1, self.trace.add_value(value)
+
+        overwritten = self._tokens[index]
+        self._tokens[index] = token
+        self._values[index] = _unwrap(value)
+        self.trace.move(src, index, token, overwritten)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._values)))
+
+    def __repr__(self):
+        return f"TracedArray({self._values!r})"
+
+    def copy(self):
+        """Return a TracedArray with the same contents, recording into the same trace."""
+        duplicate = TracedArray.__new__(TracedArray)
+        duplicate._values = list(self._values)
+        duplicate._tokens = list(self._tokens)
+        duplicate.trace = self.trace
+        return duplicate
+
+    def tolist(self):
+        """Return the current contents as a plain list."""
+        return list(self._values)
+
+def traced_sort(sort, arr, path=None, **trace_options):
+    """
+    Run any sort on a traced copy of arr.
+
+    Sorts that build a new list instead of writing to their input, such as
+    the out-of-place quick_sort, only leave comparisons in the trace.
+
+    Args:
+        sort (callable): A sort taking the array as its first argument
+        arr (list): The elements to sort
+        path (str, optional): Stream the events to this file
+
+    Returns:
+        tuple: (sorted list, SortTrace)
+    """
+    traced = TracedArray(arr, path, **trace_options)
+    result = sort(traced)
+    if result is None:
+        result = traced
+    result = result.tolist() if isinstance(result, TracedArray) else [_unwrap(x) for x in result]
+    traced.trace.flush()
+    return result, traced.trace
+
+def test_sort_trace():
+    """
+    Replays traces of the repository's sorts and checks them against the results.
+    """
+    from bubble_sort import bubble_sort
+    from heap_sort import heap_sort
+    from insertion_sort import insertion_sort
+    from selection_sort import selection_sort
+
+    for sort in (bubble_sort, insertion_sort, selection_sort, heap_sort):
+        data = [random.randint(0, 20) for _ in range(60)]
+        result, trace = traced_sort(sort, data, checkpoint_interval=50)
+        assert result == sorted(data)
+        assert trace.state_at(0) == data
+        assert trace.state_at(len(trace)) == result, f"{sort.__name__} replay mismatch"
+        print(f"{sort.__name__}: {len(trace)} events, replay matches")
+
+    # Streaming to a file keeps only buffer_events in memory
+    path = os.path.join(tempfile.mkdtemp(), "trace.bin")
+    data = [random.random() for _ in range(300)]
+    result, trace = traced_sort(insertion_sort, data, path=path, buffer_events=1000)
+    _, in_memory = traced_sort(insertion_sort, data)
+    assert len(trace) == len(in_memory)
+    for step in (0, 999, 1000, len(trace) // 2, len(trace)):
+        assert trace.state_at(step) == in_memory.state_at(step)
+    assert trace.state_at(len(trace)) == result
+    trace.close()
+    print(f"Streamed {len(trace)} events to {os.path.getsize(path)} bytes on disk")
+    os.remove(path)
+
+if __name__ == "__main__":
+    test_sort_trace()
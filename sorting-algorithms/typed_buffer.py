@@ -0,0 +1,209 @@
+"""
+Typed Buffer Dispatch
+
+The sorting functions in this repository are written for Python lists. This
+module lets them also accept contiguous numeric buffers (NumPy arrays,
+array.array, writable memoryviews, bytearray) without falling back to
+per-element Python loops.
+
+Decorating a sort with @typed_buffer_sort(...) leaves list inputs on the
+original implementation. Buffer inputs are sorted natively:
+
+- With NumPy installed, the buffer is wrapped with np.frombuffer (no copy)
+  and sorted in place with ndarray.sort using the closest NumPy algorithm.
+- Without NumPy, one-byte formats are counting-sorted, and wider formats
+  are sorted with the C implementation of sorted() and written back
+  through the memoryview.
+
+reverse=True is handled by sorting natively and reversing the buffer in
+place.
+
+Limits:
+
+- Only NumPy sorts without boxing. Without it, sorted() creates a Python
+  number for every element of a multi-byte buffer, and the sort needs
+  O(n) temporary objects. It is still a C sort, much faster than the
+  Python loops, but not allocation-free. One-byte values are all cached
+  small ints, so counting them boxes nothing.
+- Calls with any other argument (key=, index bounds such as
+  quick_sort_in_place(buf, low, high), heap_sort's d, a merge buffer)
+  go to the wrapped Python implementation, which loops over the buffer
+  element by element. Sorts that return a copy make it with copy_buffer,
+  so they return the same kind of buffer.
+- Only the whole-array entry points are decorated: bubble_sort,
+  selection_sort, insertion_sort, heap_sort, quick_sort,
+  quick_sort_in_place, quick_sort_3way and merge_sort.
+"""
+
+import array
+import os
+import random
+import sys
+import time
+from collections import Counter
+from functools import wraps
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# memoryview formats of native-order numbers that can be sorted natively
+NUMERIC_FORMATS = set("bBhHiIlLqQfd")
+
+def typed_view(arr):
+    """
+    Returns a writable, 1-D, C-contiguous numeric memoryview of arr.
+
+    Args:
+        arr: Any object
+
+    Returns:
+        memoryview: A view sharing arr's memory, or None if arr is not
+        such a buffer
+    """
+    if isinstance(arr, (list, tuple, str, bytes)):
+        return None
+
+    try:
+        view = memoryview(arr)
+    except TypeError:
+        return None
+
+    if view.readonly or view.ndim != 1 or not view.c_contiguous or view.format not in NUMERIC_FORMATS:
+        view.release()
+        return None
+    return view
+
+def sort_typed_view(view, kind="stable"):
+    """
+    Sorts a numeric memoryview in place.
+
+    Args:
+        view (memoryview): View returned by typed_view
+        kind (str): NumPy sorting algorithm ("quicksort", "heapsort" or "stable")
+
+    Time Complexity: O(n log n), O(n + k) for one-byte formats without NumPy
+    Space Complexity: O(1) with NumPy, O(n) otherwise
+    """
+    if np is not None:
+        np.frombuffer(view, dtype=view.format).sort(kind=kind)
+    elif view.itemsize == 1:
+        # Every one-byte value is a cached small int, so counting boxes nothing
+        counts = Counter(view)
+        pos = 0
+        for value in sorted(counts):
+            count = counts[value]
+            view[pos:pos + count] = array.array(view.format, [value]) * count
+            pos += count
+    else:
+        view[:] = array.array(view.format, sorted(view))
+
+def copy_buffer(arr):
+    """
+    Returns a copy of arr of the same kind: a list for a list, a buffer
+    of the same element type for array.array, ndarray or bytearray, an
+    array.array for a memoryview, and a list for any other sequence.
+    """
+    if isinstance(arr, array.array):
+        return array.array(arr.typecode, arr)
+    if hasattr(arr, "copy"):
+        return arr.copy()
+    try:
+        view = memoryview(arr)
+    except TypeError:
+        return list(arr)
+    with view:
+        return array.array(view.format, view)
+
+def typed_buffer_sort(kind="stable", returns="copy"):
+    """
+    Decorator routing numeric buffers to a native in-place sort.
+
+    Only calls with the input as the sole argument, optionally with
+    reverse=, are dispatched; lists, other objects and calls with any
+    other argument go to the wrapped function.
+
+    Args:
+        kind (str): NumPy sorting algorithm closest to the wrapped sort
+        returns (str): Contract of the wrapped sort, one of
+            "copy" (returns a sorted copy), "self" (sorts in place and
+            returns the input) or "none" (sorts in place, returns None)
+
+    Returns:
+        Callable: The decorator
+    """
+    if returns not in ("copy", "self", "none"):
+        raise ValueError(f"returns must be 'copy', 'self' or 'none', got {returns!r}")
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(arr, *args, **kwargs):
+            # Lists take the original path with a single type check
+            if type(arr) is list or args or kwargs.keys() - {"reverse"}:
+                return func(arr, *args, **kwargs)
+            reverse = kwargs.get("reverse", False)
+
+            is_ndarray = np is not None and isinstance(arr, np.ndarray)
+            if is_ndarray and (arr.ndim != 1 or arr.dtype.kind not in "biuf"):
+                return func(arr, **kwargs)
+            if not is_ndarray:
+                view = typed_view(arr)
+                if view is None:
+                    return func(arr, **kwargs)
+                view.release()
+
+            target = copy_buffer(arr) if returns == "copy" else arr
+            if is_ndarray:
+                target.sort(kind=kind)
+                if reverse:
+                    target[:] = target[::-1]
+            else:
+                with typed_view(target) as view:
+                    sort_typed_view(view, kind)
+                    if reverse:
+                        view[:] = view[::-1]
+
+            return None if returns == "none" else target
+
+        return wrapper
+
+    return decorator
+
+def benchmark_typed_buffer_sort(n=50_000):
+    """
+    Compares list and typed-buffer throughput for each array typecode.
+    """
+    from heap_sort import heap_sort
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "divide-and-conquer"))
+    from merge_sort import merge_sort
+
+    ranges = {"b": 2**7, "B": 2**8, "h": 2**15, "i": 2**31, "q": 2**63}
+    print(f"Throughput on {n} elements, NumPy {'available' if np is not None else 'not installed'}:")
+    print(f"  {'type':<5} {'sort':<10} {'list':>12} {'buffer':>12}")
+
+    for typecode in "bBhiqfd":
+        if typecode in "fd":
+            values = [random.random() for _ in range(n)]
+        else:
+            limit = ranges[typecode]
+            low = 0 if typecode.isupper() else -limit
+            values = [random.randrange(low, limit) for _ in range(n)]
+
+        expected = sorted(array.array(typecode, values))
+        descending = array.array(typecode, values)
+        assert list(heap_sort(descending, reverse=True)) == expected[::-1]
+        for name, sort in [("heap_sort", heap_sort), ("merge_sort", merge_sort)]:
+            timings = []
+            for data in (array.array(typecode, values).tolist(), array.array(typecode, values)):
+                start = time.perf_counter()
+                result = sort(data)
+                timings.append(time.perf_counter() - start)
+                assert list(data if result is None else result) == expected
+
+            rates = [f"{n / t / 1e6:8.2f} M/s" for t in timings]
+            print(f"  {typecode:<5} {name:<10} {rates[0]:>12} {rates[1]:>12}")
+
+if __name__ == "__main__":
+    benchmark_typed_buffer_sort()